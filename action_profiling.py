@@ -0,0 +1,116 @@
+"""Opt-in per-action profiling for the grapher, for sending real profiles
+from real files instead of guesses about what's slow.
+
+With profiling on (View > Profile Actions, or RADON_PLOT_PROFILE_DIR set
+to a directory before starting — see MainWindow._begin_user_action),
+each user-level action — loading a file, changing the unit, risk
+standard or resampling, a pan, a zoom step, a Shift-drag selection, an
+export — runs under cProfile with tracemalloc tracing, and writes two
+files named for when it started and what it was:
+
+    20250731-160012-123456_pan.prof   cProfile stats, for pstats/snakeviz
+    20250731-160012-123456_pan.txt    the wall time, tracemalloc peak and
+                                      the top functions by cumulative time
+
+An action's profile runs until the event loop is next idle, so it
+includes the redraw the action scheduled (draw_idle), which is usually
+where the time goes. Both cProfile and tracemalloc slow everything
+down noticeably — tracemalloc especially, on allocation-heavy code — so
+the wall times in these files are only comparable with each other, not
+with an unprofiled session.
+"""
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+
+PROFILE_DIR_ENV = 'RADON_PLOT_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = os.path.join(os.path.expanduser('~'), 'radon_plot_profiles')
+# Functions listed in each action's .txt summary
+SUMMARY_TOP_FUNCTIONS = 30
+
+
+def profile_dir_from_environment():
+    """The directory RADON_PLOT_PROFILE_DIR names, or None if it's unset."""
+    return os.environ.get(PROFILE_DIR_ENV) or None
+
+
+class ActionProfiler:
+    """Profiles one user action at a time into `directory`: begin(action)
+    starts cProfile and tracemalloc, end() stops them and writes the
+    action's files. An action that starts while another is still being
+    profiled (a scroll during a pan, say) just runs as part of the
+    first one."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or DEFAULT_PROFILE_DIR
+        self._profile = None
+        self._action = None
+        self._started = None
+        self._started_at = None
+        self._own_tracemalloc = False
+
+    @property
+    def active(self):
+        return self._profile is not None
+
+    def begin(self, action):
+        """Start profiling `action`. Returns False (and does nothing) if
+        another action is already being profiled."""
+        if self.active:
+            return False
+        # Tracing someone else started is left running, traces and all,
+        # with just its peak reset to the current level, so the peak
+        # reported is reached during this action (reset_peak is 3.9+;
+        # before that, it's the peak since they started tracing)
+        self._own_tracemalloc = not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._action = action
+        self._started_at = datetime.datetime.now()
+        self._started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def rename(self, action):
+        """Relabel the action being profiled, for a handler that only
+        finds out partway through what the action was (a press that
+        turns out to be a click-zoom rather than a pan)."""
+        if self.active:
+            self._action = action
+
+    def end(self):
+        """Stop profiling and write the action's .prof and .txt files.
+        Returns the .prof path, or None if nothing was being profiled."""
+        if not self.active:
+            return None
+        self._profile.disable()
+        seconds = time.perf_counter() - self._started
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+        profile, self._profile = self._profile, None
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Action names are fixed strings today, but keep them file-name safe
+        safe_action = re.sub(r'[^A-Za-z0-9_-]+', '-', self._action)
+        stem = os.path.join(self.directory, f"{self._started_at:%Y%m%d-%H%M%S-%f}_{safe_action}")
+        profile.dump_stats(stem + '.prof')
+
+        listing = io.StringIO()
+        stats = pstats.Stats(profile, stream=listing)
+        stats.sort_stats('cumulative').print_stats(SUMMARY_TOP_FUNCTIONS)
+        with open(stem + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f"action: {self._action}\n")
+            f.write(f"started: {self._started_at:%Y-%m-%d %H:%M:%S.%f}\n")
+            f.write(f"wall time: {seconds * 1000:.1f} ms (profiled)\n")
+            f.write(f"tracemalloc peak: {peak:,} bytes ({peak / 2**20:.1f} MiB)\n\n")
+            f.write(listing.getvalue())
+        return stem + '.prof'
@@ -0,0 +1,117 @@
+"""Always-on, lightweight performance log of user actions, for seeing how
+the grapher performs in the field across many workstations without
+attaching a profiler to any of them.
+
+Each user-level action (the same ones action_profiling profiles — see
+MainWindow._begin_user_action) appends one JSON line:
+
+    {"ts": "2025-07-31T16:00:12.345+00:00", "host": "lab-pc-3",
+     "action": "pan", "duration_ms": 41.2, "readings": 9600,
+     "visible": 2210, "draws": 1}
+
+`ts` is when the action started (UTC), `duration_ms` runs until the
+event loop was next idle (so it includes the redraw the action
+scheduled), `readings` is the dataset size, `visible` the readings
+inside the graph's x-range once the action was over, and `draws` how
+many times the canvas redrew in between. Actions run while profiling
+are marked "profiled": true, since their durations are inflated.
+
+The GUI thread only puts the record on a queue (logging's QueueHandler);
+a background thread (QueueListener) serializes it and writes it to a
+RotatingFileHandler, so a slow or network-mounted disk never stalls the
+interface. The file is RADON_PLOT_TELEMETRY_FILE if that's set — or
+nowhere, if it's set to "off" — else DEFAULT_TELEMETRY_FILE, rotated
+every TELEMETRY_MAX_BYTES with TELEMETRY_BACKUPS older files kept.
+"""
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import socket
+
+TELEMETRY_FILE_ENV = 'RADON_PLOT_TELEMETRY_FILE'
+DEFAULT_TELEMETRY_FILE = os.path.join(os.path.expanduser('~'), 'radon_plot_telemetry.jsonl')
+TELEMETRY_MAX_BYTES = 5 * 2**20
+TELEMETRY_BACKUPS = 3
+_HOST = socket.gethostname()
+
+_logger = None
+_listener = None
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that queues the record untouched: the default one
+    formats the message on the calling (GUI) thread first, and the JSON
+    encoding is exactly the work to keep off that thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class _JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.msg, separators=(', ', ': '))
+
+
+def telemetry_file():
+    """Where telemetry goes, or None if RADON_PLOT_TELEMETRY_FILE=off."""
+    path = os.environ.get(TELEMETRY_FILE_ENV) or DEFAULT_TELEMETRY_FILE
+    return None if path.lower() == 'off' else path
+
+
+def _telemetry_logger():
+    """The logger feeding the background writer, started on first use
+    (one per process, shared by every window) — or None if telemetry is
+    off or its file can't be opened."""
+    global _logger, _listener
+    if _logger is not None:
+        return _logger or None
+    path = telemetry_file()
+    if path is None:
+        _logger = False
+        return None
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=TELEMETRY_MAX_BYTES, backupCount=TELEMETRY_BACKUPS, encoding='utf-8', delay=True)
+    except OSError:
+        # Never let the log get in the way of the app itself
+        _logger = False
+        return None
+    file_handler.setFormatter(_JsonLineFormatter())
+    records = queue.Queue()
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    # Stopping the listener flushes whatever is still queued
+    atexit.register(_listener.stop)
+
+    _logger = logging.getLogger('radon_plot.telemetry')
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+    _logger.addHandler(_RecordQueueHandler(records))
+    return _logger
+
+
+def log_action(action, started_at, seconds, readings, visible, draws, profiled=False):
+    """Queue one action's line for the background writer. `started_at`
+    is a time.time() value."""
+    logger = _telemetry_logger()
+    if logger is None:
+        return
+    record = {
+        'ts': datetime.datetime.fromtimestamp(started_at, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+        'host': _HOST,
+        'action': action,
+        'duration_ms': round(seconds * 1000, 1),
+        'readings': readings,
+        'visible': visible,
+        'draws': draws,
+    }
+    if profiled:
+        record['profiled'] = True
+    logger.info(record)
@@ -0,0 +1,114 @@
+"""Benchmarks for radon_core: parsing, resampling, the zone segmentation
+and point coloring behind every render, the stats-panel averages, the
+fixed-epoch month locator and report rendering in each export format."""
+import datetime
+
+import pytest
+
+from radon_core import (
+    _FixedEpochMonthLocator, average_summary, end_datetime_from_filename, get_authority_zones,
+    parse_rd200_file, render_report_bytes, resample_readings, RESAMPLE_AGGREGATIONS, segment_by_zones,
+    summary_cards, zone_point_colors,
+)
+from synthetic_rd200 import FORMATS
+
+# Reports draw every reading handed to them (a vector page writes each
+# line segment as its own path), so past this size a single export runs
+# into minutes — the sizes above it are covered by the other benchmarks
+EXPORT_MAX_ROWS = 100_000
+EXPORT_FORMATS = ('png', 'jpg', 'pdf', 'svg')
+
+
+@pytest.mark.benchmark(group='parse')
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_parse(run_benchmark, synthetic_export, n_rows, fmt):
+    path = synthetic_export(n_rows, fmt)
+    result = run_benchmark(parse_rd200_file, path, end_datetime_from_filename(path), True, False)
+    assert len(result['radon_levels']) == n_rows
+
+
+@pytest.mark.benchmark(group='parse-numbers-only')
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_parse_without_datetimes(run_benchmark, synthetic_export, n_rows, fmt):
+    path = synthetic_export(n_rows, fmt)
+    result = run_benchmark(parse_rd200_file, path, end_datetime_from_filename(path), False, False)
+    assert len(result['timestamp_nums']) == n_rows
+
+
+@pytest.mark.benchmark(group='resample')
+@pytest.mark.parametrize('how', RESAMPLE_AGGREGATIONS)
+@pytest.mark.parametrize('hours', (1, 24))
+def test_resample(run_benchmark, parsed_export, n_rows, hours, how):
+    data = parsed_export(n_rows)
+    result = run_benchmark(resample_readings, data['timeline'], data['radon_levels'],
+                           datetime.timedelta(hours=hours), how)
+    assert result['counts'].sum() == n_rows
+
+
+@pytest.mark.benchmark(group='segment-by-zones')
+def test_segment_by_zones(run_benchmark, parsed_export, n_rows):
+    data = parsed_export(n_rows)
+    thresholds, color_map = get_authority_zones('who', data['unit'])[:2]
+    segments, colors = run_benchmark(segment_by_zones, data['timestamp_nums'], data['radon_levels'], thresholds, color_map)
+    assert len(segments) == len(colors) >= n_rows - 1
+
+
+@pytest.mark.benchmark(group='point-colors')
+def test_zone_point_colors(run_benchmark, parsed_export, n_rows):
+    data = parsed_export(n_rows)
+    color_map = get_authority_zones('who', data['unit'])[1]
+    assert len(run_benchmark(zone_point_colors, data['radon_levels'], color_map)) == n_rows
+
+
+@pytest.mark.benchmark(group='averages')
+def test_average_summary(run_benchmark, parsed_export, n_rows):
+    data = parsed_export(n_rows)
+    # A selection over the middle half, as when a range is shift-dragged
+    selection = (n_rows // 4, 3 * n_rows // 4)
+    summary = run_benchmark(average_summary, data['timestamp_nums'], data['radon_levels'], selection)
+    assert summary['selection']['readings'] == selection[1] - selection[0]
+
+
+@pytest.mark.benchmark(group='month-locator')
+def test_month_locator_tick_values(run_benchmark, parsed_export, n_rows):
+    nums = parsed_export(n_rows)['timestamp_nums']
+    locator = _FixedEpochMonthLocator(1)
+    ticks = run_benchmark(locator.tick_values, nums[0], nums[-1])
+    assert len(ticks) >= 2
+
+
+def _report_snapshot(data, authority_key='who'):
+    """A MainWindow._report_snapshot equivalent for the whole dataset."""
+    nums, levels = data['timestamp_nums'], data['radon_levels']
+    thresholds, color_map = get_authority_zones(authority_key, data['unit'])[:2]
+    segments, colors = segment_by_zones(nums, levels, thresholds, color_map)
+    summary = average_summary(nums, levels)
+    return {
+        'plot': {
+            'timestamp_nums': nums,
+            'levels': levels,
+            'unit': data['unit'],
+            'authority_key': authority_key,
+            'serial_number': data['serial_number'],
+            'zone_data': (segments, colors, zone_point_colors(levels, color_map)),
+            'flagged': None,
+        },
+        'xlim': (nums[0], nums[-1]),
+        'ylim': (0, float(levels.max()) * 1.05),
+        'selection': None,
+        'cards': summary_cards(summary, data['unit']),
+        'size_inches': (12.0, 6.0),
+        'page_size': None,
+        'dpi': 120,
+    }
+
+
+@pytest.mark.benchmark(group='export-report')
+@pytest.mark.parametrize('fmt', EXPORT_FORMATS)
+def test_export_report(run_benchmark, parsed_export, n_rows, fmt):
+    if n_rows > EXPORT_MAX_ROWS:
+        pytest.skip(f"exports are only benchmarked up to {EXPORT_MAX_ROWS:,} rows")
+    snapshot = _report_snapshot(parsed_export(n_rows))
+    data, result = run_benchmark(render_report_bytes, snapshot, fmt)
+    assert len(data) == result['bytes'] > 0
+
@@ -0,0 +1,75 @@
+"""Benchmarks for the parts of MainWindow that only exist with Qt: the
+hover lookup run on every mouse move, and a full render_zones rebuild
+(what switching the risk standard or display unit costs). Runs on Qt's
+offscreen platform unless QT_QPA_PLATFORM says otherwise, and is skipped
+entirely where PyQt5 isn't installed."""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+# A window keeps a datetime object per reading and redraws every one,
+# so past this size just building one takes minutes
+WINDOW_MAX_ROWS = 1_000_000
+HOVER_EVENTS = 500
+
+
+@pytest.fixture(scope='module')
+def window_for(synthetic_export):
+    """window_for(n_rows) -> a shown MainWindow on the synthetic export
+    of that size (one per size, kept for the module)."""
+    import radon_window
+
+    app = QApplication.instance() or QApplication([])
+    windows = {}
+
+    def get(n_rows):
+        if n_rows > WINDOW_MAX_ROWS:
+            pytest.skip(f"windows are only benchmarked up to {WINDOW_MAX_ROWS:,} rows")
+        if n_rows not in windows:
+            window = radon_window.MainWindow(synthetic_export(n_rows))
+            window.resize(1400, 900)
+            window.show()
+            app.processEvents()
+            window.canvas.draw()
+            windows[n_rows] = window
+        return windows[n_rows]
+    yield get
+    for window in windows.values():
+        window.close()
+
+
+def _hover_events(window, count=HOVER_EVENTS, seed=0):
+    """Mouse-move events over `count` readings spread across the current
+    view, each a couple of pixels off the point, so every one goes
+    through the full nearest-point search and tooltip update."""
+    rng = np.random.default_rng(seed)
+    lo, hi = np.searchsorted(window.timestamp_nums, window.ax.get_xlim())
+    indices = rng.integers(lo, max(lo + 1, hi), count)
+    points = window.ax.transData.transform(
+        np.column_stack((window.timestamp_nums[indices], window.radon_levels[indices])))
+    return [MouseEvent('motion_notify_event', window.canvas, x + 2, y + 2) for x, y in points]
+
+
+@pytest.mark.benchmark(group='on-hover')
+def test_on_hover(run_benchmark, window_for, n_rows):
+    window = window_for(n_rows)
+    events = _hover_events(window)
+
+    def hover_all():
+        for event in events:
+            window.on_hover(event)
+    run_benchmark(hover_all)
+    assert window.annot.get_visible()
+
+
+@pytest.mark.benchmark(group='render-zones')
+def test_render_zones(run_benchmark, window_for, n_rows):
+    window = window_for(n_rows)
+    run_benchmark(window.render_zones)
@@ -0,0 +1,92 @@
+"""Shared setup for the benchmark suite (see README.md, "Benchmarks").
+
+Every benchmark takes an `n_rows` parameter, generated from
+--rd200-rows, and the synthetic exports (see synthetic_rd200.py) are
+written once per session and reused. Results are saved automatically
+under benchmarks/results/, wherever pytest is run from, so each run can
+be compared against earlier ones with --benchmark-compare.
+"""
+import os
+
+import pytest
+
+from synthetic_rd200 import FORMATS, write_synthetic_export
+
+DEFAULT_ROW_COUNTS = '1000,100000,1000000'
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+# pytest-benchmark's own default storage (relative to the working
+# directory), replaced with RESULTS_DIR unless one was given explicitly
+_PLUGIN_DEFAULT_STORAGE = 'file://./.benchmarks'
+
+
+def pytest_addoption(parser):
+    parser.addoption('--rd200-rows', default=DEFAULT_ROW_COUNTS,
+                     help="comma-separated synthetic export sizes to benchmark "
+                          f"(default: {DEFAULT_ROW_COUNTS}; add 10000000 for the full range)")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Runs before pytest-benchmark's own pytest_configure, which is
+    # where it opens the storage
+    if getattr(config.option, 'benchmark_storage', None) == _PLUGIN_DEFAULT_STORAGE:
+        config.option.benchmark_storage = 'file://' + RESULTS_DIR
+
+
+def pytest_generate_tests(metafunc):
+    if 'n_rows' in metafunc.fixturenames:
+        counts = [int(value) for value in metafunc.config.getoption('rd200_rows').split(',') if value.strip()]
+        metafunc.parametrize('n_rows', counts, ids=[f'{n:,}rows' for n in counts])
+
+
+@pytest.fixture(scope='session')
+def synthetic_export(tmp_path_factory):
+    """synthetic_export(n_rows, fmt) -> path of a synthetic RD200 export,
+    written on first use and shared by every benchmark in the session."""
+    directory = str(tmp_path_factory.mktemp('rd200'))
+    paths = {}
+
+    def get(n_rows, fmt='csv'):
+        if (n_rows, fmt) not in paths:
+            paths[n_rows, fmt] = write_synthetic_export(directory, n_rows, fmt)
+        return paths[n_rows, fmt]
+    return get
+
+
+@pytest.fixture(scope='session')
+def _parsed_exports(synthetic_export):
+    """parse_rd200_file's dict per (n_rows, fmt), parsed once per session."""
+    from radon_core import end_datetime_from_filename, parse_rd200_file
+
+    parsed = {}
+
+    def get(n_rows, fmt):
+        if (n_rows, fmt) not in parsed:
+            path = synthetic_export(n_rows, fmt)
+            parsed[n_rows, fmt] = parse_rd200_file(path, end_datetime_from_filename(path), with_datetimes=False,
+                                                   verbose=False)
+        return parsed[n_rows, fmt]
+    return get
+
+
+@pytest.fixture(params=FORMATS)
+def parsed_export(request, _parsed_exports):
+    """parsed_export(n_rows) -> parse_rd200_file's dict for the export of
+    that size, for the benchmarks that start from loaded data. Every such
+    benchmark runs once per export format — the legacy exports are in
+    pCi/L, so that also covers the other unit's thresholds."""
+    return lambda n_rows: _parsed_exports(n_rows, request.param)
+
+
+@pytest.fixture
+def run_benchmark(benchmark, n_rows):
+    """run_benchmark(fn, *args) -> benchmark fn(*args), with fewer
+    rounds the bigger the dataset, so the largest sizes still finish in
+    reasonable time (pytest-benchmark's default calibration would run a
+    multi-second call dozens of times)."""
+    rounds = 10 if n_rows <= 100_000 else (3 if n_rows <= 1_000_000 else 1)
+
+    def run(fn, *args):
+        return benchmark.pedantic(fn, args=args, rounds=rounds, iterations=1, warmup_rounds=0)
+    return run
+
@@ -0,0 +1,99 @@
+"""Synthetic RadonEye RD200 exports, for benchmarking at sizes no real
+device produces (a real export tops out around a year of hourly
+readings; these go up to tens of millions of rows).
+
+The readings look like real radon data rather than noise, since the
+code being measured cares about their shape — how often the trace
+crosses a zone threshold drives the segmentation and coloring cost: a
+daily cycle (higher overnight, when a house is closed up), a slow
+seasonal swing, multiplicative noise and the odd short spike, all
+around a level that sits near the WHO/EPA thresholds so crossings are
+frequent. Everything is seeded, so a given size always comes out
+byte-for-byte the same and runs compare like with like.
+
+Both export formats the parser reads are supported: the current CSV
+("index,value" rows under "Key:,Value" headers) and the legacy text
+format ("index) value" rows under "Key: Value" headers). File names
+follow the export convention SERIAL_YYYYMMDD HHMMSS, so the last
+reading's date/time comes from the name as it would for a real file.
+
+Usable from the command line too, e.g.
+
+    python3 benchmarks/synthetic_rd200.py /tmp/rd200 --rows 1000000 --format legacy
+"""
+import argparse
+import datetime
+import os
+
+import numpy as np
+
+FORMATS = ('csv', 'legacy')
+SYNTHETIC_END = datetime.datetime(2025, 7, 31, 16, 0, 0)
+SYNTHETIC_SERIAL_PREFIX = 'SYN'
+
+
+def synthetic_levels(n_rows, interval_minutes=60, seed=0, unit='Bq/m3'):
+    """`n_rows` plausible readings (float array) `interval_minutes` apart,
+    in `unit` — whole Bq/m3, as the device reports them, or pCi/L to
+    two decimals."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n_rows) * (interval_minutes / 60.0)
+    daily = 0.35 * np.cos(2 * np.pi * (hours % 24) / 24)
+    seasonal = 0.5 * np.cos(2 * np.pi * hours / (24 * 365.25))
+    levels = 90 * np.exp(daily + seasonal + rng.normal(0, 0.25, n_rows))
+    spikes = rng.random(n_rows) < 0.001
+    levels[spikes] *= rng.uniform(3, 8, int(spikes.sum()))
+    if unit == 'pCi/L':
+        return np.round(levels / 37.0, 2)
+    return np.round(levels)
+
+
+def synthetic_file_name(n_rows, fmt='csv', end=SYNTHETIC_END):
+    extension = 'csv' if fmt == 'csv' else 'txt'
+    return f"{SYNTHETIC_SERIAL_PREFIX}{n_rows}_{end:%Y%m%d %H%M%S}.{extension}"
+
+
+def write_synthetic_export(directory, n_rows, fmt='csv', interval_minutes=60, seed=0, end=SYNTHETIC_END):
+    """Write an RD200 export of `n_rows` synthetic readings in `fmt`
+    ('csv' or 'legacy') into `directory`, returning its path. The
+    current CSV format is in Bq/m3; the legacy one, like most real
+    legacy exports, in pCi/L."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {FORMATS}")
+    path = os.path.join(directory, synthetic_file_name(n_rows, fmt, end))
+    index = np.arange(1, n_rows + 1)
+    if fmt == 'csv':
+        levels = synthetic_levels(n_rows, interval_minutes, seed, 'Bq/m3')
+        header = (f"Model Name:,RD200\nS/N:,{SYNTHETIC_SERIAL_PREFIX}{n_rows}\nUnit:,Bq/m3\n"
+                  f"Interval:,{interval_minutes} min\nTotal # of Data:,{n_rows}")
+        row_format = '%d,%d'
+    else:
+        levels = synthetic_levels(n_rows, interval_minutes, seed, 'pCi/L')
+        # The legacy format has no interval header; the parser assumes
+        # hourly readings for it
+        header = f"Unit: pCi/L\nData No: {n_rows}"
+        row_format = '%d) %.2f'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header + '\n')
+        np.savetxt(f, np.column_stack((index, levels)), fmt=row_format)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic RD200 exports for benchmarking.")
+    parser.add_argument('directory', help="where to write the file(s)")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000], help="reading count(s) (default: 1000)")
+    parser.add_argument('--format', choices=FORMATS + ('both',), default='both', help="export format (default: both)")
+    parser.add_argument('--interval', type=int, default=60, help="minutes between readings, current format only (default: 60)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    for n_rows in args.rows:
+        for fmt in (FORMATS if args.format == 'both' else (args.format,)):
+            interval = args.interval if fmt == 'csv' else 60
+            print(write_synthetic_export(args.directory, n_rows, fmt, interval, args.seed))
+
+
+if __name__ == '__main__':
+    main()
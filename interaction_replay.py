@@ -0,0 +1,262 @@
+"""Record mouse interaction with the main graph, and replay it headlessly
+to measure how long each event takes to handle.
+
+Interaction lag is hard to pin down from a description ("panning feels
+sticky on my big file"), so this captures the real thing. Recording
+(`python3 radon_plot.py EXPORT.csv --record session.jsonl`, see
+InteractionRecorder) writes every mouse event the plot canvas sees —
+presses and releases (which start and end pans, click-zooms and
+Shift-drag selections in TrimmedNavigationToolbar.press_pan and
+release_pan), moves (pan drags, selection drags and on_hover), and
+scroll-wheel zooms (on_scroll) — as JSON lines, after a header with the
+canvas size and starting view.
+
+Replaying (`python3 interaction_replay.py session.jsonl EXPORT.csv`)
+opens the given file in a MainWindow on Qt's offscreen platform, sizes
+the canvas and restores the view as they were when recording started,
+then feeds the events back through the canvas's own callbacks, so they
+reach exactly the same handlers. Each event is timed from dispatch until
+the event queue is idle again — including any redraw it scheduled —
+and the report gives latency percentiles per kind of event, plus the
+number of redraws. The view is restored relative to the last reading,
+so the same recording can be replayed against a longer or denser file
+ending at the same time (e.g. the synthetic exports from
+benchmarks/synthetic_rd200.py) to see how latency scales, or against
+the same file on another version of the app.
+
+Events are replayed back to back rather than at recorded speed: a real
+session coalesces several mouse moves into one redraw whenever the
+app falls behind, which hides exactly the per-event cost being measured
+here.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+RECORDING_VERSION = 1
+# matplotlib canvas events recorded, and what each is replayed as
+RECORDED_EVENTS = ('button_press_event', 'button_release_event', 'motion_notify_event', 'scroll_event')
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class InteractionRecorder:
+    """Writes every mouse event on `window`'s canvas to `path` as JSON
+    lines until close() is called. The first line is a header with what
+    a replay needs to put the canvas back in the same state: its size in
+    pixels (event positions are recorded in pixels), the view limits —
+    x relative to the last reading — and the risk standard and unit."""
+
+    def __init__(self, window, path):
+        self.window = window
+        self._file = open(path, 'w', encoding='utf-8')
+        self._started = time.perf_counter()
+        x0, x1 = window.ax.get_xlim()
+        last = float(window.timestamp_nums[-1])
+        width_px, height_px = window.figure.bbox.size
+        self._write({
+            'recording': RECORDING_VERSION,
+            'canvas_px': [round(width_px), round(height_px)],
+            'xlim_from_last': [x0 - last, x1 - last],
+            'ylim': list(window.ax.get_ylim()),
+            'authority_key': window.authority_key,
+            'unit': window.display_unit,
+            'serial_number': window.serial_number,
+            'readings': len(window.timestamp_nums),
+        })
+        self._cids = [window.canvas.mpl_connect(name, self._record) for name in RECORDED_EVENTS]
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+
+    def _record(self, event):
+        record = {
+            't': round(time.perf_counter() - self._started, 4),
+            'event': event.name,
+            'x': event.x,
+            'y': event.y,
+        }
+        # (a scroll event's button is 'up'/'down', which the step covers)
+        if event.button is not None and event.name != 'scroll_event':
+            record['button'] = int(event.button)
+        held = getattr(event, 'buttons', None)
+        if held:
+            record['buttons'] = sorted(int(button) for button in held)
+        if event.modifiers:
+            record['modifiers'] = sorted(event.modifiers)
+        if event.name == 'scroll_event':
+            record['step'] = event.step
+        if event.dblclick:
+            record['dblclick'] = True
+        self._write(record)
+
+    def close(self):
+        if self._file.closed:
+            return
+        for cid in self._cids:
+            self.window.canvas.mpl_disconnect(cid)
+        self._file.close()
+
+
+def load_recording(path):
+    """(header, events) from a file written by InteractionRecorder."""
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get('recording') != RECORDING_VERSION:
+        raise ValueError(f"{path} isn't an interaction recording (version {RECORDING_VERSION})")
+    return lines[0], lines[1:]
+
+
+def event_kind(record, buttons_down):
+    """Which kind of interaction an event belongs to, for the report:
+    'scroll', 'press'/'release' (pan, click-zoom), 'select-press'/
+    'select-release' (Shift-drag), 'drag'/'select-drag' (moves with a
+    button held) or 'hover' (moves with none)."""
+    name = record['event']
+    shift = 'shift' in record.get('modifiers', ())
+    prefix = 'select-' if shift else ''
+    if name == 'scroll_event':
+        return 'scroll'
+    if name == 'button_press_event':
+        return prefix + 'press'
+    if name == 'button_release_event':
+        return prefix + 'release'
+    return prefix + 'drag' if buttons_down else 'hover'
+
+
+def _make_event(canvas, record, buttons_down):
+    from matplotlib.backend_bases import MouseButton, MouseEvent
+
+    button = record.get('button')
+    if record['event'] == 'scroll_event':
+        button = 'up' if record.get('step', 0) > 0 else 'down'
+    elif button is not None:
+        button = MouseButton(button)
+    extra = {}
+    if record['event'] == 'motion_notify_event':
+        # The buttons held during a move — the pan drag checks these to
+        # notice a release it missed
+        held = record.get('buttons', buttons_down)
+        extra['buttons'] = {MouseButton(b) for b in held if b is not None}
+    return MouseEvent(record['event'], canvas, record['x'], record['y'], button=button,
+                      step=record.get('step', 0), dblclick=record.get('dblclick', False),
+                      modifiers=frozenset(record.get('modifiers', ())), **extra)
+
+
+def _resize_canvas(window, app, width_px, height_px):
+    """Resize `window` so its figure is width_px x height_px, as when
+    the recording was made (positions are in pixels)."""
+    for _ in range(3):
+        current_w, current_h = window.figure.bbox.size
+        if round(current_w) == width_px and round(current_h) == height_px:
+            return
+        ratio = window.canvas.devicePixelRatioF() or 1.0
+        window.resize(window.width() + round((width_px - current_w) / ratio),
+                      window.height() + round((height_px - current_h) / ratio))
+        app.processEvents()
+
+
+def percentile_summary(latencies):
+    """{'count', 'p50', 'p90', 'p99', 'max', 'total'} in milliseconds."""
+    import numpy as np
+
+    values = np.asarray(latencies) * 1000.0
+    summary = {'count': len(values)}
+    for p in LATENCY_PERCENTILES:
+        summary[f'p{p}'] = float(np.percentile(values, p))
+    summary['max'] = float(values.max())
+    summary['total'] = float(values.sum())
+    return summary
+
+
+def replay(header, events, window, app):
+    """Feed the recorded `events` to `window` and time each one. Returns
+    {'events', 'draws', 'seconds', 'by_kind': {kind: percentile_summary}}."""
+    _resize_canvas(window, app, *header['canvas_px'])
+    last = float(window.timestamp_nums[-1])
+    x0, x1 = header['xlim_from_last']
+    window.ax.set_xlim(last + x0, last + x1)
+    window.ax.set_ylim(*header['ylim'])
+    window.canvas.draw()
+    app.processEvents()
+
+    draws = [0]
+    draw_cid = window.canvas.mpl_connect('draw_event', lambda event: draws.__setitem__(0, draws[0] + 1))
+    latencies = {}
+    buttons_down = set()
+    started = time.perf_counter()
+    for record in events:
+        kind = event_kind(record, buttons_down)
+        event = _make_event(window.canvas, record, buttons_down)
+        t0 = time.perf_counter()
+        window.canvas.callbacks.process(record['event'], event)
+        # Let whatever the handlers scheduled (draw_idle) run too
+        app.processEvents()
+        latencies.setdefault(kind, []).append(time.perf_counter() - t0)
+        if record['event'] == 'button_press_event':
+            buttons_down.add(record.get('button'))
+        elif record['event'] == 'button_release_event':
+            buttons_down.discard(record.get('button'))
+    seconds = time.perf_counter() - started
+    window.canvas.mpl_disconnect(draw_cid)
+    return {
+        'events': len(events),
+        'draws': draws[0],
+        'seconds': seconds,
+        'by_kind': {kind: percentile_summary(values) for kind, values in sorted(latencies.items())},
+    }
+
+
+def format_report(result, header, window):
+    lines = [
+        f"{result['events']} events replayed in {result['seconds']:.2f} s, {result['draws']} redraws "
+        f"({len(window.timestamp_nums):,} readings; recorded on {header['readings']:,})",
+        "",
+        f"{'event':<16}{'count':>7}" + "".join(f"{'p%d' % p:>10}" for p in LATENCY_PERCENTILES)
+        + f"{'max':>10}{'total':>11}   (ms)",
+    ]
+    for kind, summary in result['by_kind'].items():
+        lines.append(f"{kind:<16}{summary['count']:>7}"
+                     + "".join(f"{summary['p%d' % p]:>10.1f}" for p in LATENCY_PERCENTILES)
+                     + f"{summary['max']:>10.1f}{summary['total']:>11.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded interaction session headlessly and report per-event latency.")
+    parser.add_argument('recording', help="file written by radon_plot.py --record")
+    parser.add_argument('data_file', help="RD200 export to replay it against")
+    parser.add_argument('--end', help="date/time of the last reading, if the file name doesn't carry it (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON, for comparing runs")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+
+    import datetime
+    from radon_core import default_end_datetime, end_datetime_from_filename
+    from radon_window import MainWindow
+
+    header, events = load_recording(args.recording)
+    if args.end:
+        end_datetime = datetime.datetime.strptime(args.end, '%Y-%m-%d %H:%M:%S')
+    else:
+        end_datetime = end_datetime_from_filename(args.data_file) or default_end_datetime(args.data_file)
+    window = MainWindow(args.data_file, end_datetime=end_datetime, authority_key=header['authority_key'],
+                        display_unit=header['unit'])
+    window.show()
+    app.processEvents()
+
+    result = replay(header, events, window, app)
+    print(format_report(result, header, window))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(result, recording=os.path.basename(args.recording),
+                           data_file=os.path.basename(args.data_file), readings=len(window.timestamp_nums)), f, indent=2)
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
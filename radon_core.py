@@ -0,0 +1,3327 @@
+"""The rendering and analysis core of Radon Plot, with no Qt anywhere in
+it: the RD200 file parser and resampling, unit conversion and risk
+standards, zone segmentation, the date locators/formatters, stats and
+spike detection, the figure layout shared with the on-screen window,
+and every export renderer (report, monthly and fleet PDFs, thumbnails,
+data export).
+
+Everything draws onto plain matplotlib Figures with their own Agg
+canvas rather than through pyplot, so importing this never picks a GUI
+backend or needs a display — servers, batch jobs and the export worker
+processes use it directly, and savefig's format (PNG, PDF, SVG, ...)
+picks the output backend per file. radon_window.py is the Qt app built
+on top of it."""
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.colors as mcolors
+import matplotlib.dates as mdates
+import numpy as np
+import collections
+import concurrent.futures
+import csv
+import datetime
+import functools
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+from matplotlib.collections import LineCollection
+from dateutil.rrule import YEARLY, MONTHLY, DAILY
+import matplotlib.ticker as mticker
+from matplotlib.patches import Patch, Rectangle
+from matplotlib.lines import Line2D
+
+
+def parse_interval_to_timedelta(interval_str):
+    """Parse strings like '1 hour', '5 min', '30 minutes' into a timedelta."""
+    if not interval_str:
+        return datetime.timedelta(hours=1)
+    match = re.match(r'\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)', interval_str)
+    if not match:
+        return datetime.timedelta(hours=1)
+    amount = float(match.group(1))
+    unit = match.group(2).lower()
+    if unit.startswith('h'):
+        return datetime.timedelta(hours=amount)
+    if unit.startswith('m'):
+        return datetime.timedelta(minutes=amount)
+    if unit.startswith('s'):
+        return datetime.timedelta(seconds=amount)
+    if unit.startswith('d'):
+        return datetime.timedelta(days=amount)
+    return datetime.timedelta(hours=1)
+
+
+class NoReadingsError(ValueError):
+    """Raised by parse_rd200_file for a file with no data lines at all."""
+
+
+def serial_from_filename(filename):
+    """The device serial number, taken from the file name's first
+    underscore-separated token (the RadonEye export convention)."""
+    base_name = os.path.basename(filename)
+    return base_name.split('_')[0] if '_' in base_name else base_name
+
+
+def end_datetime_from_filename(filename):
+    """The last reading's date/time, from the classic RadonEye export
+    convention SERIAL_YYYYMMDD HHMMSS.txt — or None if the name doesn't
+    carry one (newer exports like "SERIAL_LogData_2.txt" don't)."""
+    date_match = re.search(r'(\d{8})[ _](\d{6})', os.path.basename(filename))
+    if not date_match:
+        return None
+    try:
+        date_str, time_str = date_match.group(1), date_match.group(2)
+        return datetime.datetime(
+            int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]),
+            int(time_str[0:2]), int(time_str[2:4]), int(time_str[4:6])
+        )
+    except ValueError:
+        return None
+
+
+def default_end_datetime(filename):
+    """Best guess at the last reading's date/time for a file whose name
+    doesn't carry one: its last-modified time, rounded to the nearest
+    hour. Readings only land on hour boundaries, so showing the file's
+    save time down to the exact second implies more precision than we
+    actually have."""
+    try:
+        raw_dt = datetime.datetime.fromtimestamp(os.path.getmtime(filename))
+    except OSError:
+        raw_dt = datetime.datetime.now()
+    if raw_dt.minute >= 30:
+        return raw_dt.replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)
+    return raw_dt.replace(minute=0, second=0, microsecond=0)
+
+
+class Timeline:
+    """The times of a series of readings, as matplotlib date numbers.
+
+    An RD200 export is evenly spaced at its "Interval:", so the usual
+    timeline is uniform: just a start, a step and a count. Every lookup
+    the app makes — the index of a time, the nearest reading to one, the
+    readings inside a range, the datetime of a reading — is then
+    arithmetic, O(1) whatever the file's size, and the per-reading
+    arrays (nums, datetimes) are only built if something asks for them,
+    once. Merged or irregular data (from_nums) keeps an explicit sorted
+    array instead and answers the same questions with binary searches,
+    so callers never need to know which kind they have.
+
+    A uniform timeline can have gaps — readings the device never logged
+    (a power cut, a reset) — kept as a run-length list of the unbroken
+    stretches, `runs`: (first_slot, count) pairs, slot k being the time
+    start + k * step. A lookup then costs one extra binary search over
+    the runs (a handful, not one per reading), and a timeline without
+    gaps is just the single run (0, count).
+
+    Index lookups follow numpy.searchsorted exactly, against the same
+    values `nums` materializes (start + step * slot), so the kinds give
+    identical answers for identical times."""
+
+    def __init__(self, count, start_num=None, step=None, start_datetime=None, interval=None, nums=None,
+                 runs=None):
+        # Use uniform() or from_nums() rather than this directly
+        self.count = count
+        self.start_num = start_num
+        self.step = step
+        self.start_datetime = start_datetime
+        self.interval = interval
+        self._nums = nums
+        self._datetimes = None
+        # Per run: first slot, first reading index, and length — or all
+        # None for a gap-free uniform timeline (slot == index)
+        self._run_slot = self._run_first = self._run_count = None
+        if runs is not None and len(runs) > 1:
+            run_slot, run_count = (np.array(column, dtype=np.int64) for column in zip(*runs))
+            self._run_slot = run_slot
+            self._run_count = run_count
+            self._run_first = np.concatenate(([0], np.cumsum(run_count)[:-1]))
+
+    @classmethod
+    def uniform(cls, start_datetime, interval, count, runs=None):
+        """`count` readings `interval` (a timedelta) apart, the first
+        at `start_datetime` — with gaps if `runs`, a list of
+        (first_slot, count) pairs covering all `count` readings in
+        order, says so."""
+        if runs is not None and sum(run_count for _, run_count in runs) != count:
+            raise ValueError("runs don't cover the readings")
+        step = interval.total_seconds() / 86400
+        if step <= 0:
+            # A zero interval ("0 min" in a damaged header) stacks every
+            # reading on one time — nothing to do arithmetic with
+            return cls.from_nums(np.full(count, mdates.date2num(start_datetime)))
+        return cls(count, float(mdates.date2num(start_datetime)), step, start_datetime, interval, runs=runs)
+
+    @classmethod
+    def from_nums(cls, nums):
+        """An explicit timeline of sorted date numbers."""
+        nums = np.asarray(nums, dtype=float)
+        nums.setflags(write=False)
+        return cls(len(nums), nums=nums)
+
+    @property
+    def is_uniform(self):
+        return self.step is not None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def runs(self):
+        """The unbroken stretches of readings, as (first_slot, count)
+        pairs — a single run for a timeline without gaps. None for an
+        explicit timeline."""
+        if not self.is_uniform:
+            return None
+        if self._run_slot is None:
+            return [(0, self.count)]
+        return [(int(slot), int(count)) for slot, count in zip(self._run_slot, self._run_count)]
+
+    @property
+    def gaps(self):
+        """(after_index, missing) for every gap: after reading
+        `after_index`, `missing` readings' worth of time has no data.
+        Empty for a timeline without gaps (or an explicit one)."""
+        if self._run_slot is None:
+            return []
+        run_end_slot = self._run_slot + self._run_count
+        return [(int(first) - 1, int(slot - end))
+                for first, slot, end in zip(self._run_first[1:], self._run_slot[1:], run_end_slot[:-1])]
+
+    @property
+    def missing(self):
+        """Total readings' worth of time inside gaps."""
+        return sum(missing for _, missing in self.gaps)
+
+    def _slot_of(self, index):
+        if self._run_slot is None:
+            return index
+        run = np.searchsorted(self._run_first, index, side='right') - 1
+        return self._run_slot[run] + (index - self._run_first[run])
+
+    def _index_of_slot(self, slot):
+        """Index of the first reading at or after `slot` (an int array)."""
+        if self._run_slot is None:
+            return np.minimum(slot, self.count)
+        run = np.searchsorted(self._run_slot, slot, side='right') - 1
+        within = slot - self._run_slot[run]
+        return np.where(within < self._run_count[run], self._run_first[run] + within,
+                        self._run_first[run] + self._run_count[run])
+
+    @property
+    def _slot_count(self):
+        if self._run_slot is None:
+            return self.count
+        return int(self._run_slot[-1] + self._run_count[-1])
+
+    @property
+    def nums(self):
+        """Every reading's date number, as a read-only array — built on
+        first use for a uniform timeline."""
+        if self._nums is None:
+            slots = np.arange(self.count)
+            if self._run_slot is not None:
+                slots += np.repeat(self._run_slot - self._run_first, self._run_count)
+            self._nums = self.start_num + self.step * slots
+            self._nums.setflags(write=False)
+        return self._nums
+
+    def _uniform_num(self, slot):
+        return self.start_num + self.step * slot
+
+    def num_at(self, index):
+        """Date number of reading `index` (negative counts from the end)."""
+        if not self.is_uniform:
+            return float(self._nums[index])
+        if index < 0:
+            index += self.count
+        return float(self._uniform_num(self._slot_of(index)))
+
+    def datetime_at(self, index):
+        """Datetime of reading `index` (negative counts from the end) —
+        exact for a uniform timeline, not rounded through a date number."""
+        if self._datetimes is not None:
+            return self._datetimes[index]
+        if index < 0:
+            index += self.count
+        if self.is_uniform:
+            return self.start_datetime + self.interval * int(self._slot_of(index))
+        return mdates.num2date(self._nums[index]).replace(tzinfo=None)
+
+    def datetimes(self):
+        """Every reading's datetime, as an object array built on first
+        use. Only for callers that really need them all; datetime_at
+        covers single readings without building any."""
+        if self._datetimes is None:
+            self._datetimes = np.array([self.datetime_at(i) for i in range(self.count)])
+        return self._datetimes
+
+    def searchsorted(self, x, side='left'):
+        """numpy.searchsorted(self.nums, x, side), for a scalar (returns
+        an int) or an array of times, without materializing nums."""
+        if not self.is_uniform:
+            found = np.searchsorted(self._nums, x, side=side)
+            return found if np.ndim(found) else int(found)
+        # First the slot, as if there were a reading at every one...
+        x = np.asarray(x, dtype=float)
+        n_slots = self._slot_count
+        position = (x - self.start_num) / self.step
+        slot = np.ceil(position) if side == 'left' else np.floor(position) + 1
+        slot = np.clip(slot, 0, n_slots).astype(np.int64)
+        # (the division can land one off either way from what comparing
+        # against the materialized values would give; one step fixes it)
+        if side == 'left':
+            slot -= (slot > 0) & (self._uniform_num(slot - 1) >= x)
+            slot += (slot < n_slots) & (self._uniform_num(slot) < x)
+        else:
+            slot -= (slot > 0) & (self._uniform_num(slot - 1) > x)
+            slot += (slot < n_slots) & (self._uniform_num(slot) <= x)
+        # ...then the first reading actually at or after it
+        index = self._index_of_slot(slot)
+        return index if index.ndim else int(index)
+
+    def gap_breaks(self):
+        """Boolean mask over consecutive pairs of readings, True where a
+        gap separates them — segment_by_zones's `breaks`."""
+        if not self.is_uniform:
+            return reading_gap_breaks(self._nums)
+        breaks = np.zeros(max(self.count - 1, 0), dtype=bool)
+        if self._run_slot is not None:
+            breaks[self._run_first[1:] - 1] = True
+        return breaks
+
+    def index_range(self, start, end):
+        """(first, stop): the readings with start <= time <= end, as a
+        half-open index range (first == stop if there are none)."""
+        return self.searchsorted(start, 'left'), self.searchsorted(end, 'right')
+
+    def nearest(self, x):
+        """Index of the reading closest in time to `x`."""
+        if self.count == 0:
+            raise ValueError("empty timeline")
+        if self.is_uniform and self._run_slot is None:
+            index = int(np.rint((x - self.start_num) / self.step))
+            return min(max(index, 0), self.count - 1)
+        index = self.searchsorted(x)
+        candidates = [i for i in (index - 1, index) if 0 <= i < self.count]
+        return min(candidates, key=lambda i: abs(self.num_at(i) - x))
+
+
+def reconstruct_runs(reading_numbers, total_points=None, log=print):
+    """Work out where a device's log has gaps, from each data line's
+    reading number and the header's reading count. Returns the Timeline
+    run list: (first_slot, count) pairs, slot k being the k-th logging
+    interval from the first reading.
+
+    Readings are numbered 1, 2, 3, ... as the device logs them, so a
+    jump in the numbers means readings are missing there (a jump from 7
+    to 10: two intervals without data). A number going backwards is the
+    device restarting its count after a reset or power cut, which says
+    nothing about how long it was off; if the header's "Total # of
+    Data:" is higher than the readings found, the shortfall the jumps
+    don't explain is put at that restart when there's only one, and
+    otherwise the readings either side are taken as back to back. A
+    shortfall with no jump or restart to put it at can't be placed at
+    all, and is only reported. One pass of whole-array operations; the
+    loop is over gaps, not readings."""
+    numbers = np.asarray(reading_numbers, dtype=np.int64)
+    count = len(numbers)
+    if count == 0:
+        return [(0, 0)]
+    steps = np.diff(numbers)
+    breaks = np.flatnonzero(steps != 1)
+    missing = np.where(steps[breaks] > 1, steps[breaks] - 1, 0)
+    restarts = np.flatnonzero(steps[breaks] < 1)
+
+    shortfall = 0 if total_points is None else total_points - count
+    unexplained = shortfall - int(missing.sum())
+    if unexplained > 0 and len(restarts) == 1:
+        missing[restarts[0]] += unexplained
+        log(f"Gap of {unexplained} readings assumed at the restart after reading {breaks[restarts[0]] + 1}")
+    elif unexplained > 0:
+        log(f"Warning: Expected {total_points} data points, found {count}, "
+            f"and can't tell where the other {unexplained} belong. Check file format.")
+    elif total_points is not None and total_points != count and not len(breaks):
+        log(f"Warning: Expected {total_points} data points, found {count}. Check file format.")
+    if len(restarts) > (1 if unexplained > 0 else 0):
+        log(f"Warning: reading numbers restart {len(restarts)} time(s); "
+            "readings either side of a restart are assumed back to back")
+
+    # Only real gaps split runs — a restart taken as back to back doesn't
+    gap_breaks = breaks[missing > 0]
+    gap_sizes = missing[missing > 0]
+    run_first = np.concatenate(([0], gap_breaks + 1))
+    run_count = np.diff(np.concatenate((run_first, [count])))
+    run_slot = run_first + np.concatenate(([0], np.cumsum(gap_sizes)))
+    if len(gap_sizes):
+        log(f"{len(gap_sizes)} gap(s) in the readings, {int(gap_sizes.sum())} readings missing in total")
+    return [(int(slot), int(n)) for slot, n in zip(run_slot, run_count)]
+
+
+def parse_rd200_file(filename, end_datetime, with_datetimes=True, verbose=True, interval=None):
+    """Parse a RadonEye RD200 export (current CSV or legacy text format)
+    whose last reading was taken at `end_datetime`, returning a dict of
+    {radon_levels, timeline, timestamps, timestamp_nums, unit,
+    serial_number, interval}. No Qt involved, so it's usable from worker
+    processes. `timeline` is the readings' uniform Timeline, and
+    timestamp_nums its materialized date numbers. Readings are counted
+    back from `end_datetime` at the interval, leaving room for any gaps
+    the reading numbers show (see reconstruct_runs) rather than assuming
+    every reading is there.
+
+    `interval` (a timedelta) overrides the file's own "Interval:" header
+    (or the one-hour default when it has none), e.g. for an export whose
+    header is missing or wrong.
+
+    with_datetimes=False skips building the per-reading datetime objects
+    ('timestamps' is then None) for callers that only need the date
+    numbers, or that look single readings' datetimes up from the
+    timeline. verbose=False
+    drops the progress prints. Raises NoReadingsError for a file with no
+    data lines, and lets any error reading the file propagate."""
+    log = print if verbose else (lambda *args: None)
+    serial_number = serial_from_filename(filename)
+    log(f"Serial number extracted: {serial_number}")
+
+    # Load data and detect unit/format
+    radon_levels = []
+    reading_numbers = []
+    data_count = 0
+    total_points = None
+    unit = "Bq/m3"
+    interval_delta = datetime.timedelta(hours=1)
+
+    with open(filename, 'r', encoding='utf-8-sig') as file:
+        log("Loading data from file...")
+        for line_number, raw_line in enumerate(file, 1):
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            # Header lines look like "Key:,Value" or legacy "Key: Value"
+            if line.startswith("Unit:"):
+                unit = normalize_unit(line.split(':', 1)[1].lstrip(',').strip())
+                log(f"Unit detected: {unit}")
+                continue
+            if line.startswith("Total # of Data:"):
+                total_points = int(line.split(':', 1)[1].lstrip(',').strip())
+                log(f"Total data points set to: {total_points}")
+                continue
+            if line.startswith("Data No:"):
+                # legacy exports put the count here instead
+                rest = line.split(':', 1)[1].lstrip(',').strip()
+                if rest.isdigit():
+                    total_points = int(rest)
+                    log(f"Total data points set to: {total_points}")
+                continue
+            if line.startswith(("Model Name:", "S/N:", "Alarm Threshold:", "Interval:")):
+                if line.startswith("Interval:"):
+                    interval_delta = parse_interval_to_timedelta(line.split(':', 1)[1].lstrip(',').strip())
+                    log(f"Interval detected: {interval_delta}")
+                continue
+
+            # Data lines: current export is "index,value"; legacy
+            # export was "index) value [unit]"
+            m = re.match(r'^(\d+)\s*[,)]\s*(-?\d+(?:\.\d+)?)', line)
+            if m:
+                try:
+                    value = float(m.group(2))
+                    radon_levels.append(value)
+                    reading_numbers.append(int(m.group(1)))
+                    data_count += 1
+                    if data_count % 1000 == 0:
+                        log(f"Parsed {data_count} values...")
+                except ValueError as e:
+                    log(f"Failed to parse line {line_number}: '{line}' - Error: {e}")
+                continue
+
+        log(f"Loaded {data_count} data points.")
+
+    if len(radon_levels) == 0:
+        raise NoReadingsError(f"No data points found in {os.path.basename(filename)}")
+
+    if interval is not None:
+        interval_delta = interval
+        log(f"Interval overridden: {interval_delta}")
+
+    radon_levels = np.array(radon_levels)
+    runs = reconstruct_runs(reading_numbers, total_points, log)
+    last_slot = runs[-1][0] + runs[-1][1] - 1
+    start_datetime = end_datetime - interval_delta * last_slot
+    timeline = Timeline.uniform(start_datetime, interval_delta, len(radon_levels), runs)
+    log(f"Start datetime: {start_datetime}, End datetime: {end_datetime}")
+
+    return {
+        'radon_levels': radon_levels,
+        'timeline': timeline,
+        'timestamps': timeline.datetimes() if with_datetimes else None,
+        'timestamp_nums': timeline.nums,
+        'unit': unit,
+        'serial_number': serial_number,
+        'interval': interval_delta,
+    }
+
+
+# How resample_readings can reduce each interval's readings to one value
+RESAMPLE_AGGREGATIONS = ('mean', 'max', 'last')
+
+
+def _runs_from_slots(slots):
+    """(first_slot, count) runs of a sorted array of distinct slots, as
+    Timeline.uniform takes them."""
+    breaks = np.flatnonzero(np.diff(slots) != 1) + 1
+    firsts = np.concatenate(([0], breaks))
+    counts = np.diff(np.concatenate((firsts, [len(slots)])))
+    return [(int(slots[first]), int(count)) for first, count in zip(firsts, counts)]
+
+
+def resample_readings(timeline, levels, interval, how='mean'):
+    """Bring a series of readings to a regular `interval` (a timedelta),
+    reducing each interval's readings to one value — their 'mean', their
+    'max' or the 'last' of them — and return {timeline, levels, counts,
+    interval, how}: the new series' uniform Timeline and values, and how
+    many of the original readings went into each.
+
+    Intervals are aligned to whole multiples of `interval` since
+    matplotlib's date epoch rather than to the first reading, so two
+    files resampled to the same interval (a 10-minute export and an
+    hourly one, say) land on the same times and compare reading for
+    reading. Each new reading is stamped with the start of its interval.
+    An interval with no readings at all — a gap in the original, or a
+    target finer than its own interval — is a gap in the result too
+    rather than a made-up value.
+
+    There's no loop over readings either way: a gap-free uniform series
+    whose step divides the interval is padded out to whole intervals and
+    reshaped into one row per interval; anything else (gaps, an explicit
+    timeline, a step that doesn't divide evenly) is binned by interval
+    number with np.bincount, and reduceat over the bins' runs."""
+    if how not in RESAMPLE_AGGREGATIONS:
+        raise ValueError(f"unknown aggregation {how!r} (expected one of {', '.join(RESAMPLE_AGGREGATIONS)})")
+    bin_seconds = int(round(interval.total_seconds()))
+    if bin_seconds <= 0:
+        raise ValueError("resampling interval must be at least a second")
+    levels = np.asarray(levels, dtype=float)
+    n = len(levels)
+    if n == 0:
+        raise ValueError("no readings to resample")
+
+    # Whole seconds since the epoch throughout, so interval boundaries
+    # are exact integer divisions rather than float ones landing a hair
+    # short of the hour
+    first_second = int(round(timeline.num_at(0) * 86400))
+    first_bin = first_second // bin_seconds
+    offset = first_second - first_bin * bin_seconds
+    step_seconds = int(round(timeline.interval.total_seconds())) if timeline.is_uniform else 0
+    if (step_seconds > 0 and not timeline.gaps and bin_seconds % step_seconds == 0
+            and offset % step_seconds == 0):
+        # Every interval holds per_bin reading slots; the first `lead`
+        # of them fall before the first reading, and the last interval
+        # may be cut short by the last one
+        per_bin = bin_seconds // step_seconds
+        lead = offset // step_seconds
+        n_bins = -(-(lead + n) // per_bin)
+        padding = (lead, n_bins * per_bin - lead - n)
+        counts = np.full(n_bins, per_bin, dtype=np.int64)
+        counts[0] -= padding[0]
+        counts[-1] -= padding[1]
+        if how == 'mean':
+            values = np.pad(levels, padding).reshape(n_bins, per_bin).sum(axis=1) / counts
+        elif how == 'max':
+            values = np.pad(levels, padding, constant_values=-np.inf).reshape(n_bins, per_bin).max(axis=1)
+        else:
+            values = levels[np.cumsum(counts) - 1]
+        slots = np.arange(n_bins)
+    else:
+        bins = np.round(np.asarray(timeline.nums) * 86400).astype(np.int64) // bin_seconds - first_bin
+        per_slot = np.bincount(bins)
+        slots = np.flatnonzero(per_slot)
+        counts = per_slot[slots]
+        if how == 'mean':
+            values = np.bincount(bins, weights=levels)[slots] / counts
+        else:
+            # Readings are in time order, so each interval's readings
+            # are one contiguous run of the array
+            ends = np.cumsum(counts)
+            values = np.maximum.reduceat(levels, ends - counts) if how == 'max' else levels[ends - 1]
+
+    start_datetime = (np.datetime64(mdates.get_epoch(), 's')
+                      + np.timedelta64(first_bin * bin_seconds, 's')).astype(datetime.datetime)
+    bin_interval = datetime.timedelta(seconds=bin_seconds)
+    return {
+        'timeline': Timeline.uniform(start_datetime, bin_interval, len(values), _runs_from_slots(slots)),
+        'levels': values,
+        'counts': counts,
+        'interval': bin_interval,
+        'how': how,
+    }
+
+
+_LEADING_HOUR_ZERO_RE = re.compile(r'(?:(?<=\s)|^)0(\d(?::\d{2})?\s?[APap][Mm])')
+
+# Used to classify x-axis tick labels for styling: month/year boundary
+# ticks ("Feb 2025", "2025") are bolded to stand out as the coarser
+# reference points; day-level ticks ("Feb 08") stay regular weight so
+# they read as finer detail underneath.
+
+
+class _FixedEpochDayLocator(mticker.Locator):
+    """Places ticks at fixed multiples of `interval_days` from a
+    constant reference point (day 0 of matplotlib's date numbering),
+    rather than relative to the current view's edges.
+
+    This is what SmartAutoDateLocator falls back to at the day/week
+    level instead of a plain RRuleLocator. A plain RRuleLocator (even
+    without the month-day-restricted anchoring) still computes ticks
+    starting from dtstart=dmin -- the current view's left edge -- so as
+    that edge shifts during a pan, which absolute days land on ticks
+    shifts too. Anchoring to a fixed constant instead of the view's own
+    edge gives ticks that never change position while panning, with no
+    month-boundary side effects since the stride is calendar-agnostic."""
+
+    def __init__(self, interval_days):
+        self.interval_days = interval_days
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        step = self.interval_days
+        start_k = np.floor(vmin / step)
+        end_k = np.ceil(vmax / step)
+        return np.arange(start_k, end_k + 1) * step
+
+
+class _FixedEpochMonthLocator(mticker.Locator):
+    """Month-level counterpart to _FixedEpochDayLocator. Places ticks on
+    the 1st of every Nth month, counted from a fixed reference point
+    (January of year 0) rather than from whichever month the view
+    happens to start in.
+
+    RRuleLocator's plain (non-"nice") mode still anchors its month
+    stepping to dtstart=dmin, so for any interval greater than 1 month,
+    panning past a month boundary can flip which alternating set of
+    months gets ticked -- e.g. Mar/May/Jul/Sep/Nov becoming
+    Apr/Jun/Aug/Oct/Dec after only a ~20-day drag. Calendar months have
+    irregular lengths, so this can't stride by interval*30 days the way
+    the day-level locator does -- it steps by integer month index
+    (year*12 + month) instead, which stays exact regardless of how many
+    days are in any particular month along the way."""
+
+    def __init__(self, interval_months):
+        self.interval_months = max(1, int(interval_months))
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        step = self.interval_months
+        dlo = mdates.num2date(vmin)
+        dhi = mdates.num2date(vmax)
+        lo_idx = dlo.year * 12 + (dlo.month - 1)
+        hi_idx = dhi.year * 12 + (dhi.month - 1)
+        start_idx = (lo_idx // step) * step
+        end_idx = ((hi_idx // step) + 1) * step
+        ticks = []
+        for idx in range(start_idx, end_idx + step, step):
+            year, month0 = divmod(idx, 12)
+            ticks.append(mdates.date2num(datetime.datetime(year, month0 + 1, 1)))
+        return np.array(ticks)
+
+
+class SmartAutoDateLocator(AutoDateLocator):
+    """AutoDateLocator that only anchors ticks to fixed calendar
+    boundaries (interval_multiples=True) at the hour level and finer.
+
+    Anchoring is what keeps hour-level tick labels (e.g. 2am/4am/6am)
+    from changing phase while dragging/panning -- without it, tick
+    positions are computed relative to the current view's exact edges,
+    so a small pan shifts which hours get labeled.
+
+    At the day level and coarser, matplotlib's own anchoring has a
+    hardcoded quirk: for a 7-day tick interval it forces ticks onto the
+    1st/8th/15th/22nd of each month (see AutoDateLocator.get_locator),
+    which produces an uneven gap whenever a month doesn't divide evenly
+    by 7, and a tick landing on the 1st gets its day number dropped by
+    the formatter's "zero tick" collapsing. But plain unanchored ticks
+    (interval_multiples=False) have their own problem: they're still
+    computed relative to the view's current edge, so panning shifts
+    their phase too -- just without the month-boundary artifact. This
+    applies at the month/year level as well: a 2-month interval, say,
+    still steps from dtstart=dmin, so panning past a month boundary can
+    flip an Mar/May/Jul/Sep/Nov set over to Apr/Jun/Aug/Oct/Dec.
+
+    So at DAILY/MONTHLY/YEARLY frequencies, we sidestep both: pick
+    whatever interval size matplotlib's own logic would use (reusing
+    its interval selection), but place those ticks on a fixed,
+    calendar-agnostic grid via _FixedEpochDayLocator / 
+    _FixedEpochMonthLocator instead of relative to the view or a
+    monthly/yearly reset point. That's both evenly spaced *and* immune
+    to phase drift while panning.
+
+    Frequency selection itself happens independently of the
+    interval_multiples flag (it's just used afterward, for how ticks are
+    placed within whichever frequency gets chosen), so it's safe to
+    delegate to the parent class once with the flag set the way we want
+    for this range."""
+
+    def get_locator(self, dmin, dmax):
+        self.interval_multiples = True
+        locator = super().get_locator(dmin, dmax)
+        if self._freq == DAILY:
+            self.interval_multiples = False
+            base_locator = super().get_locator(dmin, dmax)
+            interval = base_locator.rule._construct['interval']
+            locator = _FixedEpochDayLocator(interval)
+            locator.set_axis(self.axis)
+        elif self._freq == MONTHLY:
+            self.interval_multiples = False
+            base_locator = super().get_locator(dmin, dmax)
+            interval = base_locator.rule._construct['interval']
+            locator = _FixedEpochMonthLocator(interval)
+            locator.set_axis(self.axis)
+        elif self._freq == YEARLY:
+            self.interval_multiples = False
+            base_locator = super().get_locator(dmin, dmax)
+            interval = base_locator.rule._construct['interval']
+            # Years are just a 12-month stride at the fixed-epoch level
+            locator = _FixedEpochMonthLocator(interval * 12)
+            locator.set_axis(self.axis)
+        return locator
+
+
+def strip_leading_hour_zero(text):
+    """Turn '07:00 PM' / '06 PM' into '7:00 PM' / '6 PM', case-insensitive
+    on AM/PM, wherever a time string appears — leading zeros on 12-hour
+    clock hours read as slightly odd/robotic ('06 PM' vs '6 PM')."""
+    return _LEADING_HOUR_ZERO_RE.sub(r'\1', text)
+
+
+def format_unit_mathtext(unit):
+    """"Bq/m3" -> "Bq/m$^3$" for matplotlib text (title, axis labels,
+    legend, hover tooltip, export panel) so the exponent renders as a
+    proper superscript instead of a plain trailing digit. Only Bq/m3
+    has an exponent to begin with — pCi/L passes through unchanged.
+    Kept separate from the plain "Bq/m3"/"pCi/L" strings used for
+    threshold lookups and unit-conversion logic (get_authority_zones,
+    convert_value, etc.), which must stay exactly as they are for those
+    comparisons to keep working."""
+    return "Bq/m$^3$" if unit == "Bq/m3" else unit
+
+
+def format_unit_html(unit):
+    """HTML counterpart to format_unit_mathtext, for the Qt rich-text
+    stat cards ("Bq/m3" -> "Bq/m<sup>3</sup>")."""
+    return "Bq/m<sup>3</sup>" if unit == "Bq/m3" else unit
+
+
+class HourFriendlyDateFormatter(ConciseDateFormatter):
+    """Hourly RD200 readings land on the hour, so hour-level ticks never
+    need their minutes. This formatter drops the ':00' from hour ticks
+    (via the 'formats' passed in at construction) and strips the leading
+    zero matplotlib's strftime leaves on times like '06 PM', turning it
+    into a cleaner '6 PM'. Minute-level ticks — only reachable on data
+    logged more often than hourly, whose zoom limit is narrower (see
+    MainWindow._on_xlim_changed) — keep their minutes ('4:30 PM').
+    Date-level ticks (day/month/year) are left untouched."""
+    def format_ticks(self, values):
+        labels = super().format_ticks(values)
+        return [strip_leading_hour_zero(lbl) for lbl in labels]
+
+
+def configure_date_axis(ax):
+    """Put the app's date ticks on `ax`'s x-axis: SmartAutoDateLocator
+    positions and HourFriendlyDateFormatter labels, with the custom
+    formats below. Used by the main plot and by render_tile."""
+    # SmartAutoDateLocator anchors ticks to fixed boundaries (so
+    # dragging doesn't shift which hours get labeled) only at the
+    # hour level and finer, and falls back to plain even spacing at
+    # the day level and coarser (avoiding matplotlib's hardcoded
+    # 1st/8th/15th/22nd-of-month anchoring, which produces uneven
+    # gaps around month boundaries at the day/week zoom level — see
+    # SmartAutoDateLocator's docstring for the full story).
+    locator = SmartAutoDateLocator()
+    # Custom formats: day level shows month+day on one line and the
+    # year on a second line beneath it ("May 08" / "2026") — compact,
+    # and gives year context even when zoomed in far enough that only
+    # day-level ticks are visible. Hour level drops minutes entirely
+    # (every tick at that level is on the hour) and uses 12-hour AM/PM
+    # instead of 24-hour. Order matches ConciseDateFormatter's levels:
+    # [year, month, day, hour, minute, second] — the minute level only
+    # shows up on sub-hourly data zoomed in past a few hours, and the
+    # second level is effectively unreachable given the zoom limit (see
+    # _on_xlim_changed), but kept simplified too just in case.
+    formats = ['%Y', '%b %Y', '%b %d\n%Y', '%I %p', '%I:%M %p', '%S.%f']
+    # ConciseDateFormatter's default "zero tick" behavior collapses
+    # January's month tick down to just the bare year ("2026"),
+    # dropping "Jan" — on the theory that the coarser level above
+    # already conveys it. We want the opposite: January should keep
+    # showing "Jan 2026" like every other month, so the year-change
+    # point reads clearly rather than looking like a missing label.
+    # Same idea for a day-level tick landing on the 1st of a month
+    # (e.g. via SmartAutoDateLocator's even day-level spacing): it
+    # should still show "Apr 01" rather than collapsing to just
+    # "Apr 2026", or it reads like a coarser-granularity tick that
+    # skipped the day number entirely.
+    zero_formats = [''] + formats[:-1]
+    zero_formats[1] = formats[1]  # was formats[0] ('%Y') — keep the month
+    zero_formats[2] = formats[2]  # was formats[1] ('%b %Y') — keep the day
+    formatter = HourFriendlyDateFormatter(locator, formats=formats, zero_formats=zero_formats)
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(formatter)
+    return locator, formatter
+
+
+def normalize_unit(raw_unit):
+    """RD200 exports sometimes use a proper superscript 3 (Bq/m³) and
+    sometimes a plain '3' (Bq/m3). Normalize so downstream logic
+    (which keys off exact strings) always gets one of the two
+    recognized forms."""
+    if not raw_unit:
+        return "Bq/m3"
+    cleaned = raw_unit.strip()
+    if cleaned.lower().startswith("bq/m"):
+        return "Bq/m3"
+    if cleaned.lower().startswith("pci/l"):
+        return "pCi/L"
+    return cleaned
+
+
+def unit_scale(from_unit, to_unit):
+    """Multiplicative factor taking a reading in from_unit to to_unit.
+    1.0 for same-unit or unrecognized combinations (passed through
+    unchanged). Every statistic here (means, percentiles, sums) is
+    linear in the readings, so an already-computed value converts with
+    this single factor instead of being recomputed from the raw data."""
+    if from_unit == "Bq/m3" and to_unit == "pCi/L":
+        return 1.0 / BQ_PER_PCI
+    if from_unit == "pCi/L" and to_unit == "Bq/m3":
+        return BQ_PER_PCI
+    return 1.0
+
+
+# Standard radon action/reference levels from major authoritative bodies.
+# Values are stored as canonical Bq/m3 thresholds; pCi/L values are derived
+# using the standard 1 pCi/L = 37 Bq/m3 conversion. These reflect commonly
+# published public guidance and are provided for general reference only —
+# always verify against the authority's current official guidance for
+# anything beyond casual home reference.
+BQ_PER_PCI = 37.0
+AUTHORITIES = {
+    # --- Pinned to the top of the dropdown ---
+    'who': {
+        'name': 'WHO',
+        'low_bq': 100,   # WHO reference level
+        'high_bq': 300,  # WHO maximum recommended level where 100 isn't achievable
+    },
+    'canada': {
+        'name': 'Canada (Health Canada)',
+        'low_bq': 100,   # informal "elevated, worth monitoring" zone
+        'high_bq': 200,  # official Health Canada guideline (remedial action recommended)
+    },
+    'epa': {
+        'name': 'USA (EPA)',
+        'low_bq': 2 * BQ_PER_PCI,   # 2 pCi/L — EPA "consider fixing" range starts here
+        'high_bq': 4 * BQ_PER_PCI,  # 4 pCi/L — EPA action level
+    },
+    # --- Everything else, alphabetical by display name ---
+    'australia': {
+        'name': 'Australia (ARPANSA)',
+        'low_bq': 100,
+        'high_bq': 200,
+    },
+    'china': {
+        'name': 'China',
+        'low_bq': 100,   # new-building limit
+        'high_bq': 200,  # existing-building limit
+    },
+    'finland': {
+        'name': 'Finland',
+        'low_bq': 200,   # new-building reference
+        'high_bq': 300,  # existing-building action level
+    },
+    'france': {
+        'name': 'France (ASN/IRSN)',
+        'low_bq': 100,
+        'high_bq': 300,
+    },
+    'germany': {
+        'name': 'Germany',
+        'low_bq': 100,
+        'high_bq': 300,
+    },
+    'ireland': {
+        'name': 'Ireland (EPA)',
+        'low_bq': 100,
+        'high_bq': 200,
+    },
+    'new_zealand': {
+        'name': 'New Zealand',
+        'low_bq': 100,
+        'high_bq': 300,
+    },
+    'norway': {
+        'name': 'Norway',
+        'low_bq': 100,
+        'high_bq': 200,
+    },
+    'south_korea': {
+        'name': 'South Korea',
+        'low_bq': 100,
+        'high_bq': 148,  # ~4 pCi/L equivalent, common multi-unit housing recommendation
+    },
+    'sweden': {
+        'name': 'Sweden',
+        'low_bq': 100,
+        'high_bq': 200,
+    },
+    'switzerland': {
+        'name': 'Switzerland',
+        'low_bq': 100,
+        'high_bq': 300,
+    },
+    'uk': {
+        'name': 'United Kingdom (UKHSA)',
+        'low_bq': 100,   # target level
+        'high_bq': 200,  # action level
+    },
+}
+
+# Sentinel for cache lookups where None is itself a legitimate cached
+# value (e.g. a period average with no readings in range)
+_MISSING = object()
+
+# Order the dropdown should present these in: WHO/Canada/US pinned first
+# (in that order), then everything else alphabetical by display name.
+AUTHORITY_ORDER = ['who', 'canada', 'epa'] + sorted(
+    (k for k in AUTHORITIES if k not in ('who', 'canada', 'epa')),
+    key=lambda k: AUTHORITIES[k]['name']
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_authority_zones(key, unit):
+    """Return (thresholds, color_map, legend_labels, legend_title) for the
+    given authority key ('canada', 'who', 'epa') in the given display unit.
+
+    Memoized — there are only a handful of authority/unit pairs, and
+    every dropdown change, stat card and secondary view asks for them.
+    Callers must treat the returned lists as read-only."""
+    info = AUTHORITIES[key]
+    name = info['name']
+
+    if unit == "pCi/L":
+        low = round(info['low_bq'] / BQ_PER_PCI, 1)
+        high = round(info['high_bq'] / BQ_PER_PCI, 1)
+    else:
+        low = info['low_bq']
+        high = info['high_bq']
+
+    def fmt(v):
+        return f"{v:.1f}" if unit == "pCi/L" else f"{v:.0f}"
+
+    thresholds = [low, high]
+    color_map = [(0, low, mcolors.to_rgb("green")),
+                 (low, high, mcolors.to_rgb("#FFA500")),
+                 (high, float('inf'), mcolors.to_rgb("red"))]
+
+    unit_disp = format_unit_mathtext(unit)
+
+    if key == 'who':
+        legend_labels = [
+            f"0 to {fmt(low)} {unit_disp} (At/Below WHO Reference Level)",
+            f"{fmt(low)} to {fmt(high)} {unit_disp} (Above Reference — Consider Mitigation)",
+            f">{fmt(high)} {unit_disp} (Exceeds WHO Maximum Level)",
+        ]
+    elif key == 'epa':
+        legend_labels = [
+            f"0 to {fmt(low)} {unit_disp} (Below EPA Action Range)",
+            f"{fmt(low)} to {fmt(high)} {unit_disp} (EPA: Consider Fixing)",
+            f">{fmt(high)} {unit_disp} (EPA Action Level — Fix Recommended)",
+        ]
+    elif key == 'canada':
+        legend_labels = [
+            f"0 to {fmt(low)} {unit_disp} (Low)",
+            f"{fmt(low)} to {fmt(high)} {unit_disp} (Elevated — Monitor)",
+            f">{fmt(high)} {unit_disp} (Exceeds Health Canada Guideline)",
+        ]
+    else:
+        # Generic wording for the additional countries — good-faith figures
+        # from commonly published national guidance, not each authority's
+        # own precise legal phrasing
+        legend_labels = [
+            f"0 to {fmt(low)} {unit_disp} (Low)",
+            f"{fmt(low)} to {fmt(high)} {unit_disp} (Elevated — Monitor)",
+            f">{fmt(high)} {unit_disp} (Exceeds {name} Guideline)",
+        ]
+
+    legend_title = f'RISK CATEGORY ({name})'
+    return thresholds, color_map, legend_labels, legend_title
+
+
+def reading_gap_breaks(timestamp_nums, gap_factor=1.5):
+    """Boolean mask over consecutive pairs of readings: True where the
+    two are far enough apart — more than `gap_factor` times the typical
+    (median) spacing — that there's a gap in the log between them
+    rather than the next reading, so the plotted line shouldn't join
+    them. Works on any slice of the readings, so every renderer gets
+    the same breaks from the date numbers alone."""
+    spacing = np.diff(np.asarray(timestamp_nums, dtype=float))
+    if len(spacing) == 0:
+        return np.zeros(0, dtype=bool)
+    return spacing > gap_factor * np.median(spacing)
+
+
+def segment_by_zones(timestamp_nums, levels, thresholds, color_map, breaks=None):
+    """Split the reading-to-reading line into segments at every
+    threshold crossing, so each piece can be colored by the risk zone it
+    lies in. Returns (segments, colors) ready for a LineCollection: an
+    (n, 2, 2) array of segment endpoints and an array of their colors.
+
+    Consecutive readings with a gap in the log between them (`breaks`,
+    a mask over the pairs — reading_gap_breaks by default) aren't
+    joined at all, so the line breaks there instead of drawing a
+    straight line across the missing stretch.
+
+    Whole-array operations throughout: every pair's crossings of every
+    threshold are found at once (there are only ever two or three
+    thresholds), sorted along the pair by where they fall, and each
+    pair expands into one piece more than it has crossings. A piece is
+    colored by the zone it starts in: the first by its reading's zone
+    (low <= value < high), each later one by the zone just past the
+    threshold it starts on. A reading exactly on a threshold doesn't
+    split the step it starts or ends."""
+    nums = np.asarray(timestamp_nums, dtype=float)
+    values = np.asarray(levels, dtype=float)
+    palette = np.asarray([color for _, _, color in color_map])
+    if len(values) < 2:
+        return np.zeros((0, 2, 2)), palette[:0]
+    if breaks is None:
+        breaks = reading_gap_breaks(nums)
+    keep = ~np.asarray(breaks, dtype=bool)
+    x0, x1 = nums[:-1][keep], nums[1:][keep]
+    v0, v1 = values[:-1][keep], values[1:][keep]
+
+    cuts = np.sort(np.asarray(thresholds, dtype=float))
+    rising = v1 > v0
+    crosses = ((v0[:, None] < cuts) & (v1[:, None] > cuts)) | ((v0[:, None] > cuts) & (v1[:, None] < cuts))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(crosses, (cuts - v0[:, None]) / (v1 - v0)[:, None], np.nan)
+    # Crossings in the order the line meets them (NaN — none — last)
+    order = np.argsort(fraction, axis=1)
+    fraction = np.take_along_axis(fraction, order, axis=1)
+    crossed = np.take_along_axis(np.broadcast_to(np.arange(len(cuts)), fraction.shape), order, axis=1)
+    # Zone entered at a crossing: the one above the threshold going up,
+    # the one below it going down
+    entered = np.where(rising[:, None], crossed + 1, crossed)
+
+    n_pairs = len(v0)
+    column = np.full((n_pairs, 1), np.nan)
+    start_frac = np.hstack((np.zeros((n_pairs, 1)), fraction))
+    end_frac = np.hstack((fraction, column))
+    has_piece = ~np.isnan(start_frac)
+    end_frac = np.where(np.isnan(end_frac), 1.0, end_frac)
+    # Exact threshold values at the crossings, as the line's y there
+    cut_values = np.where(np.isnan(fraction), np.nan, cuts[np.minimum(crossed, len(cuts) - 1)])
+    start_y = np.hstack((v0[:, None], cut_values))
+    end_y = np.hstack((cut_values, column))
+    end_y = np.where(np.isnan(end_y), v1[:, None], end_y)
+    start_zone = np.hstack((np.digitize(v0, cuts)[:, None], entered))
+
+    # (pieces ending on a reading end exactly on it, not x0 + 1.0 * span,
+    # so merge_zone_runs sees the next step start where this one ends)
+    span = (x1 - x0)[:, None]
+    start_x = np.where(start_frac == 0, x0[:, None], x0[:, None] + start_frac * span)
+    end_x = np.where(end_frac == 1, x1[:, None], x0[:, None] + end_frac * span)
+    segments = np.stack((
+        np.stack((start_x, start_y), axis=-1)[has_piece],
+        np.stack((end_x, end_y), axis=-1)[has_piece],
+    ), axis=1)
+    zones = np.minimum(start_zone[has_piece], len(palette) - 1)
+    return segments, palette[zones]
+
+
+class _SparseRangeMinMax:
+    """Answers "min and max of values[lo..hi]" for any index range in
+    O(BLOCK) time and O(n) memory. The values are split into blocks of
+    BLOCK; a sparse table over the blocks' min/max (level k holding
+    every window of 2**k consecutive blocks, so any run of whole blocks
+    is covered by two possibly overlapping windows) answers the middle
+    of a range, and the partial blocks at its ends are scanned directly.
+    A sparse table over the readings themselves would answer in O(1),
+    but keeps log2(n) copies of them — gigabytes at 10M readings, just
+    for y-autoscale. Levels are built with whole-array np.fmin/np.fmax,
+    so NaN entries are ignored rather than poisoning every window that
+    touches them.
+
+    Min and max commute with a positive factor, so a table built on the
+    native-unit readings serves every display unit: scale what query()
+    returns rather than building another table."""
+
+    BLOCK = 64
+
+    def __init__(self, values):
+        self._values = np.asarray(values, dtype=float)
+        n_blocks = -(-len(self._values) // self.BLOCK)
+        blocks = np.pad(self._values, (0, n_blocks * self.BLOCK - len(self._values)),
+                        constant_values=np.nan).reshape(n_blocks, self.BLOCK)
+        self._mins = [np.fmin.reduce(blocks, axis=1)]
+        self._maxs = [np.fmax.reduce(blocks, axis=1)]
+        k = 1
+        while (1 << k) <= n_blocks:
+            half = 1 << (k - 1)
+            prev_min, prev_max = self._mins[-1], self._maxs[-1]
+            self._mins.append(np.fmin(prev_min[:-half], prev_min[half:]))
+            self._maxs.append(np.fmax(prev_max[:-half], prev_max[half:]))
+            k += 1
+
+    def __len__(self):
+        return len(self._values)
+
+    def query(self, lo, hi):
+        """(min, max) over the inclusive index range [lo, hi], or None if
+        the range is empty."""
+        lo = max(int(lo), 0)
+        hi = min(int(hi), len(self) - 1)
+        if hi < lo:
+            return None
+        first_block, last_block = lo // self.BLOCK, hi // self.BLOCK
+        if first_block == last_block:
+            part = self._values[lo:hi + 1]
+            return float(np.fmin.reduce(part)), float(np.fmax.reduce(part))
+        # The partial blocks at either end, scanned directly...
+        ends = np.concatenate((self._values[lo:(first_block + 1) * self.BLOCK],
+                               self._values[last_block * self.BLOCK:hi + 1]))
+        low, high = np.fmin.reduce(ends), np.fmax.reduce(ends)
+        # ...and the whole blocks between them from the table
+        b_lo, b_hi = first_block + 1, last_block - 1
+        if b_lo <= b_hi:
+            k = (b_hi - b_lo + 1).bit_length() - 1
+            j = b_hi - (1 << k) + 1
+            mins, maxs = self._mins[k], self._maxs[k]
+            low = np.fmin(low, np.fmin(mins[b_lo], mins[j]))
+            high = np.fmax(high, np.fmax(maxs[b_lo], maxs[j]))
+        return float(low), float(high)
+
+
+class SpikeDetector:
+    """Flags single-reading spikes and dropouts: any reading further
+    than `threshold` robust standard deviations (1.4826 x the rolling
+    MAD) from the rolling median of a centered window around it.
+
+    The rolling statistics are computed with a strided sliding-window
+    view, so there's no Python loop over readings; windows are handed to
+    np.median in chunks of at most CHUNK_ELEMENTS values (rows x window)
+    purely to keep the temporary copies bounded — a fixed row count
+    would let them grow with the window, which on 1-minute data is
+    1441 readings long. The array's ends are reflect-padded, so
+    a spike in the very last reading is still judged against its real
+    neighbors rather than against copies of itself.
+
+    Readings can be appended later via extend(): only the tail whose
+    windows actually changed (the new readings plus the last half-window
+    of old ones) is recomputed."""
+
+    # Window values per chunk: each chunk makes a few float copies of
+    # this size (median's partition copy, the deviations, their
+    # absolute values), so ~4M elements keeps a pass under 100 MB
+    CHUNK_ELEMENTS = 4_000_000
+    # The app's defaults: a day-long window, flagging readings more than
+    # this many robust standard deviations from its median
+    DEFAULT_WINDOW_HOURS = 24
+    DEFAULT_THRESHOLD_MADS = 6.0
+    # Floor on the spread estimate, as a fraction of the local median, so
+    # a perfectly flat stretch (MAD 0) doesn't flag every +/-1 wobble
+    MIN_SPREAD_FRACTION = 0.1
+
+    def __init__(self, levels, window_readings, threshold=6.0):
+        self.window = max(3, int(window_readings) | 1)  # odd, so it has a center
+        self.threshold = float(threshold)
+        self.levels = np.asarray(levels, dtype=float)
+        self.flags = self._detect_from(self.levels, 0)
+
+    @staticmethod
+    def window_readings_for(window_hours, interval):
+        """Number of readings in `window_hours` at the file's logging
+        interval (a timedelta, from its Interval: header)."""
+        interval_hours = interval.total_seconds() / 3600.0
+        if interval_hours <= 0:
+            return 3
+        return int(round(window_hours / interval_hours))
+
+    @staticmethod
+    def _sliding_windows(values, window):
+        """Read-only view of every `window`-long run of the 1-D array
+        `values`, one per row: numpy's sliding_window_view where there is
+        one (numpy 1.20+), else the same view built with as_strided."""
+        try:
+            from numpy.lib.stride_tricks import sliding_window_view
+        except ImportError:
+            from numpy.lib.stride_tricks import as_strided
+            return as_strided(values, shape=(len(values) - window + 1, window),
+                              strides=values.strides * 2, writeable=False)
+        return sliding_window_view(values, window)
+
+    def _detect_from(self, levels, start):
+        """Flags for readings start..end, using the (full) levels array
+        for their neighborhoods."""
+        n = len(levels)
+        half = self.window // 2
+        if n - start <= 0:
+            return np.zeros(0, dtype=bool)
+        if n < 3:
+            return np.zeros(n - start, dtype=bool)
+        lo = max(0, start - half)
+        segment = levels[lo:]
+        left_pad = half - (start - lo)
+        mode = 'reflect' if len(segment) > max(left_pad, half) else 'edge'
+        padded = np.pad(segment, (left_pad, half), mode=mode)
+        windows = self._sliding_windows(padded, self.window)
+
+        flags = np.empty(n - start, dtype=bool)
+        rows = max(1, self.CHUNK_ELEMENTS // self.window)
+        for c in range(0, n - start, rows):
+            block = windows[c:c + rows]
+            median = np.median(block, axis=1)
+            mad = np.median(np.abs(block - median[:, None]), axis=1)
+            spread = np.maximum(1.4826 * mad, self.MIN_SPREAD_FRACTION * np.abs(median))
+            spread = np.maximum(spread, 1e-9)
+            values = levels[start + c:start + c + len(block)]
+            flags[c:c + len(block)] = np.abs(values - median) > self.threshold * spread
+        return flags
+
+    def extend(self, levels):
+        """Update for a longer series whose first len(self.levels)
+        readings are unchanged."""
+        levels = np.asarray(levels, dtype=float)
+        old_n = len(self.levels)
+        restart = max(0, old_n - self.window // 2)
+        self.levels = levels
+        self.flags = np.concatenate((self.flags[:restart], self._detect_from(levels, restart)))
+        return self.flags
+
+
+def zone_point_colors(levels, color_map):
+    """Risk-zone color for every individual reading, as an array (values
+    outside every zone — past the top one, or NaN — get the top zone's
+    color). One binary search over the zone edges for all readings."""
+    values = np.asarray(levels, dtype=float)
+    palette = np.asarray([color for _, _, color in color_map])
+    lows = np.array([low for low, _, _ in color_map], dtype=float)
+    highs = np.array([high for _, high, _ in color_map], dtype=float)
+    zones = np.searchsorted(lows, values, side='right') - 1
+    inside = (zones >= 0) & (values < highs[np.clip(zones, 0, len(highs) - 1)])
+    return palette[np.where(inside, zones, len(palette) - 1)]
+
+
+WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def _group_percentiles(groups, values, n_groups, percentiles):
+    """Per-group percentiles (numpy's default 'linear' method) without a
+    Python loop over either the readings or the groups: one lexsort puts
+    every group's values in ascending order back to back, after which
+    each group's percentile is just an interpolated lookup at a position
+    computed from that group's start offset and count. Empty groups
+    come back as NaN."""
+    counts = np.bincount(groups, minlength=n_groups)
+    result = {}
+    if len(values) == 0:
+        for p in percentiles:
+            result[p] = np.full(n_groups, np.nan)
+        return result
+    sorted_vals = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = len(sorted_vals) - 1
+    for p in percentiles:
+        pos = starts + np.maximum(counts - 1, 0) * (p / 100.0)
+        lo = np.clip(np.floor(pos).astype(int), 0, last)
+        hi = np.clip(np.ceil(pos).astype(int), 0, last)
+        frac = pos - np.floor(pos)
+        vals = sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * frac
+        vals[counts == 0] = np.nan
+        result[p] = vals
+    return result
+
+
+def compute_time_of_day_profile(timestamp_nums, levels, percentiles=(10, 25, 75, 90)):
+    """Hour-of-day and day-of-week profile of the given readings, as a
+    dict of plain arrays:
+
+      'hour_mean', 'hour_count'  -- shape (24,)
+      'hour_pcts'                -- {percentile: shape (24,)}
+      'week_mean', 'week_count'  -- shape (7, 24), Monday first
+
+    Everything is a vectorized group-by over the timeline: each reading's
+    hour and weekday index come straight from its matplotlib date number
+    (rounded to the minute first, so float error on a reading that's
+    exactly on the hour can't push it into the previous hour), and the
+    means are np.bincount sums divided by np.bincount counts. Weekday is
+    counted from the first reading's own weekday, so this doesn't depend
+    on which epoch matplotlib's date numbering happens to use."""
+    timestamp_nums = np.asarray(timestamp_nums, dtype=float)
+    levels = np.asarray(levels, dtype=float)
+    empty_week = np.full((7, 24), np.nan)
+    if len(levels) == 0:
+        return {
+            'hour_mean': np.full(24, np.nan), 'hour_count': np.zeros(24, dtype=int),
+            'hour_pcts': _group_percentiles(np.zeros(0, dtype=int), levels, 24, percentiles),
+            'week_mean': empty_week, 'week_count': np.zeros((7, 24), dtype=int),
+        }
+
+    total_minutes = np.round(timestamp_nums * 1440).astype(np.int64)
+    days = total_minutes // 1440
+    hours = (total_minutes % 1440) // 60
+    first_weekday = mdates.num2date(float(days[0])).weekday()
+    weekdays = (days - days[0] + first_weekday) % 7
+
+    hour_count = np.bincount(hours, minlength=24)
+    hour_sum = np.bincount(hours, weights=levels, minlength=24)
+    cells = weekdays * 24 + hours
+    week_count = np.bincount(cells, minlength=168)
+    week_sum = np.bincount(cells, weights=levels, minlength=168)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hour_mean = np.where(hour_count > 0, hour_sum / hour_count, np.nan)
+        week_mean = np.where(week_count > 0, week_sum / week_count, np.nan)
+
+    return {
+        'hour_mean': hour_mean,
+        'hour_count': hour_count,
+        'hour_pcts': _group_percentiles(hours, levels, 24, percentiles),
+        'week_mean': week_mean.reshape(7, 24),
+        'week_count': week_count.reshape(7, 24),
+    }
+
+
+def compute_daily_means(timestamp_nums, levels):
+    """Return (first_day_num, daily_mean) where daily_mean[i] is the mean
+    of every reading on calendar day first_day_num + i (NaN for a day
+    with no readings). One np.bincount pass over each reading's day
+    offset — no loop over readings or days."""
+    timestamp_nums = np.asarray(timestamp_nums, dtype=float)
+    levels = np.asarray(levels, dtype=float)
+    if len(levels) == 0:
+        return 0.0, np.zeros(0)
+    days = np.round(timestamp_nums * 1440).astype(np.int64) // 1440
+    offsets = days - days[0]
+    counts = np.bincount(offsets)
+    sums = np.bincount(offsets, weights=levels)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        daily_mean = np.where(counts > 0, sums / counts, np.nan)
+    return float(days[0]), daily_mean
+
+
+def build_calendar_grid(first_day_num, daily_values):
+    """Lay a run of per-day values out as a (weeks, 7) grid, Monday in
+    the first column, by padding the front to the first day's weekday
+    and the back to a whole week and then reshaping. Returns (grid,
+    lead) where lead is how many padding cells precede the first day,
+    so cell (row, col) is day index row * 7 + col - lead."""
+    lead = mdates.num2date(first_day_num).weekday()
+    n_cells = -(-(lead + len(daily_values)) // 7) * 7
+    padded = np.full(n_cells, np.nan)
+    padded[lead:lead + len(daily_values)] = daily_values
+    return padded.reshape(-1, 7), lead
+
+
+@functools.lru_cache(maxsize=64)
+def fixed_margin_fractions(width_in, height_in, top_in, bottom_in, left_in, right_in, edge_bar_in):
+    """subplots_adjust fractions that put the given physical (inch)
+    margins around the axes of a width_in x height_in figure — see
+    _RadonFigureLayout._apply_fixed_margins. Cached: a window resize or
+    a batch of same-size pages asks for the same few sizes over and
+    over."""
+    top_frac = 1 - (top_in / height_in)
+    bottom_frac = bottom_in / height_in
+    # The bookend bars sit outside the plotted data, in a strip
+    # immediately next to the axes — so the axes' own left/right edges
+    # need to leave room for the bar width on top of the usual margin,
+    # or the plot would render underneath the bars instead of beside them
+    left_frac = (left_in + edge_bar_in) / width_in
+    right_frac = 1 - ((right_in + edge_bar_in) / width_in)
+    # Guard rails so a very small window can't invert or collapse the
+    # plot area entirely
+    return {
+        'top': max(0.5, min(0.95, top_frac)),
+        'bottom': max(0.05, min(0.4, bottom_frac)),
+        'left': max(0.03, min(0.35, left_frac)),
+        'right': max(0.65, min(0.999, right_frac)),
+    }
+
+
+class _RadonFigureLayout:
+    """Fixed-inch layout, bookend bars, manual tick marks, selection
+    bubbles and the export stats panel — everything that positions
+    artists on a figure around the main axes. Shared by MainWindow (the
+    on-screen Qt figure) and _OffscreenReportFigure (an independent
+    figure that exports render into), so both lay out identically.
+
+    Expects self.figure, self.ax and self.canvas to exist; everything
+    else it needs is stored on self as it goes."""
+
+    # Fraction of the y-axis reserved above the data for the legend —
+    # see render_zones, and _autoscale_y_to_visible which keeps the
+    # same headroom when fitting the y-axis to just the visible range
+    LEGEND_HEADROOM_FRACTION = 0.25
+
+    # Constant physical padding (inches) above the title and below the
+    # date/time label, matching the original look at the app's default
+    # window size. Kept as inches (not a fraction) specifically so this
+    # whitespace stays visually constant regardless of how tall the window
+    # is stretched — a fraction-based margin would otherwise grow right
+    # along with the window.
+    TOP_MARGIN_INCHES = 0.87  # matches LEFT_MARGIN_INCHES
+    BOTTOM_MARGIN_INCHES = 0.96
+    LEFT_MARGIN_INCHES = 0.95
+    RIGHT_MARGIN_INCHES = 0.15
+    EDGE_BAR_WIDTH_INCHES = 0.3  # width of the left/right date "bookend" bars
+    # Where the "DATE AND TIME" x-axis title sits, measured from the
+    # very bottom of the figure — fixed regardless of how many lines
+    # the tick labels below the axes take up. Left as-is (using
+    # matplotlib's automatic tick-relative labelpad), the title's
+    # vertical position depends on the tick labels' own height, which
+    # changes based on the current zoom level (e.g. a single-line
+    # "Nov 2025" vs a two-line "Nov 06\n2025"). That made the title
+    # visibly shift up and down as you zoomed/panned, and crowded the
+    # averages cards below whenever the taller two-line ticks were
+    # showing. Pinning it to a fixed distance from the figure's bottom
+    # edge instead keeps it stationary and leaves consistent breathing
+    # room below it no matter what the tick labels are doing above it.
+    XLABEL_BOTTOM_OFFSET_INCHES = 0.20
+
+    def _position_xlabel(self):
+        """Pin the "DATE AND TIME" title to a fixed distance from the
+        figure's bottom edge (see XLABEL_BOTTOM_OFFSET_INCHES) instead
+        of letting matplotlib place it relative to the tick labels'
+        own (variable) height. Called after every margin/size change
+        (render_zones and _apply_fixed_margins) so it stays correct
+        across resizes too, not just full re-renders."""
+        if not hasattr(self, 'ax'):
+            return
+        fig_height_in = self.figure.get_figheight()
+        if fig_height_in <= 0:
+            return
+        y_frac = self.XLABEL_BOTTOM_OFFSET_INCHES / fig_height_in
+        self.ax.xaxis.set_label_coords(0.5, y_frac, transform=self.figure.transFigure)
+
+    def _apply_fixed_margins(self):
+        fig_height_in = self.figure.get_figheight()
+        fig_width_in = self.figure.get_figwidth()
+        if fig_height_in <= 0 or fig_width_in <= 0:
+            return
+        self.figure.subplots_adjust(**fixed_margin_fractions(
+            fig_width_in, fig_height_in, self.TOP_MARGIN_INCHES, self.BOTTOM_MARGIN_INCHES,
+            self.LEFT_MARGIN_INCHES, self.RIGHT_MARGIN_INCHES, self.EDGE_BAR_WIDTH_INCHES,
+        ))
+        self._position_edge_bars()
+        self._position_xlabel()
+
+    def _finalize_layout(self):
+        """Settle the axes' position after _draw_plot_contents has
+        rebuilt them, using the fixed physical (inch) margins — see
+        _apply_fixed_margins for why. There used to be a tight_layout()
+        pass first, but with a single subplot and all four margins
+        pinned in inches straight afterwards, every value it worked out
+        was overwritten; it only cost a full text-measuring draw on
+        every re-render (about a quarter of a second at startup)."""
+        self._apply_fixed_margins()
+
+    def _create_edge_bars(self):
+        """Create the left/right 'bookend' bars showing the visible date
+        range. These are figure-level artists (transform=transFigure), not
+        axes-level — that's what lets them sit outside the plotted data
+        area, in the margin, rather than overlapping it. Called once from
+        init_ui; ax.cla() (which runs on every render_zones rebuild) only
+        clears axes-level children, so these persist and just need their
+        position/text refreshed afterward via _position_edge_bars."""
+        bar_color = '#37474F'
+        self.corner_bar_left = Rectangle(
+            (0, 0), 0, 0, transform=self.figure.transFigure,
+            facecolor=bar_color, edgecolor='none', alpha=0.88, zorder=9, clip_on=False
+        )
+        self.corner_bar_right = Rectangle(
+            (0, 0), 0, 0, transform=self.figure.transFigure,
+            facecolor=bar_color, edgecolor='none', alpha=0.88, zorder=9, clip_on=False
+        )
+        self.figure.add_artist(self.corner_bar_left)
+        self.figure.add_artist(self.corner_bar_right)
+
+        # Right side rotated the opposite way (270 vs 90) so the two bars
+        # mirror each other rather than both reading in the same direction
+        self.corner_date_left = self.figure.text(
+            0, 0, "", transform=self.figure.transFigure, ha='center', va='center',
+            rotation=90, fontsize=9, fontweight='bold', color='white', zorder=10
+        )
+        self.corner_date_right = self.figure.text(
+            0, 0, "", transform=self.figure.transFigure, ha='center', va='center',
+            rotation=270, fontsize=9, fontweight='bold', color='white', zorder=10
+        )
+
+    def _position_edge_bars(self):
+        """Place the left/right bookend bars flush against the actual
+        plotted-data boundary (the axes edge) — not the outer window
+        edge — so they read as part of the graph itself. To keep them
+        from covering the y-axis tick numbers (which matplotlib draws
+        immediately outside the axes edge by default, in the same spot),
+        those tick numbers are pushed further out via increased tick
+        padding (see the y-axis tick_params call in render_zones),
+        freeing up exactly the bar's width right next to the axes for
+        the bar to occupy instead. Spans the axes' full height, aligned
+        exactly to the axes boundary. Safe to call before the bars exist
+        yet (e.g. during the very first render)."""
+        if not hasattr(self, 'corner_bar_left'):
+            return
+        pos = self.ax.get_position()
+        fig_width_in = self.figure.get_figwidth()
+        bar_w_frac = self.EDGE_BAR_WIDTH_INCHES / fig_width_in if fig_width_in > 0 else 0
+        fig_height_in = self.figure.get_figheight()
+        # Shrink very slightly inward from the exact axes bounds — the
+        # axes spine's own stroke width otherwise makes the bar look
+        # about a pixel too tall (over-extending past the actual plotted
+        # grid area top/bottom)
+        inset_frac = (0.5 / self.figure.dpi) / fig_height_in if fig_height_in > 0 else 0
+        bar_y0 = pos.y0 + inset_frac
+        bar_height = pos.height - 2 * inset_frac
+
+        # Flush against the actual axes edges — the tick numbers have
+        # been pushed further out (see tick_params pad) to leave exactly
+        # this much room clear
+        self.corner_bar_left.set_bounds(pos.x0 - bar_w_frac, bar_y0, bar_w_frac, bar_height)
+        self.corner_bar_right.set_bounds(pos.x1, bar_y0, bar_w_frac, bar_height)
+
+        left_cx = pos.x0 - bar_w_frac / 2
+        right_cx = pos.x1 + bar_w_frac / 2
+
+        # Small deliberate push toward the middle of the chart (i.e.
+        # toward the plot area, not the outer edge of the window) — a
+        # visual-balance tweak on top of the ink-based centering in
+        # _recenter_edge_bar_texts. Given as a fraction of the bar's
+        # width; increase for a bigger push, flip the sign to push the
+        # other way instead.
+        EDGE_BAR_TEXT_INWARD_NUDGE_FRACTION = 0.10
+        inward_nudge = EDGE_BAR_TEXT_INWARD_NUDGE_FRACTION * bar_w_frac
+        left_cx += inward_nudge
+        right_cx -= inward_nudge
+
+        cy = pos.y0 + pos.height / 2
+        self._edge_bar_left_cx = left_cx
+        self._edge_bar_right_cx = right_cx
+        self._edge_bar_cy = cy
+        self._recenter_edge_bar_texts()
+
+        self._draw_left_tick_marks()
+
+    def _recenter_edge_bar_texts(self):
+        """Position the rotated date labels so they're truly centered
+        on the bookend bar in both directions — along its length (the
+        text's own reading direction before rotation) and across its
+        width (the text's own line-height/ascent-descent direction
+        before rotation, which becomes the left-right screen axis once
+        rotated 90/270 degrees).
+
+        ha='center'/va='center' alone aren't enough here: matplotlib
+        centers text using the font's abstract metrics for each of
+        those axes (string-width and ascent/descent), not the actual
+        ink of the rendered glyphs. That gap is normally too small to
+        notice, but once rotated it can show up as a visible offset in
+        either direction — along the bar's length or across its width
+        — and how far off depends on the specific font/platform.
+
+        To make this robust, we measure the actual rendered bounding
+        box after an initial center placement, then nudge the anchor by
+        however far that real ink is from the target center on both
+        axes. Called after every position/text change (see
+        _position_edge_bars and _update_range_subtitle) so it stays
+        correct across resizes and as the date text itself changes."""
+        if not hasattr(self, 'corner_date_left'):
+            return
+        cy = getattr(self, '_edge_bar_cy', None)
+        left_cx = getattr(self, '_edge_bar_left_cx', None)
+        right_cx = getattr(self, '_edge_bar_right_cx', None)
+        if cy is None or left_cx is None or right_cx is None:
+            return
+        try:
+            renderer = self.canvas.get_renderer()
+        except Exception:
+            renderer = None
+        for text_artist, cx in ((self.corner_date_left, left_cx), (self.corner_date_right, right_cx)):
+            # Start from the font-metric center as a baseline
+            text_artist.set_position((cx, cy))
+            if renderer is None or not text_artist.get_text():
+                continue
+            bbox = text_artist.get_window_extent(renderer=renderer)
+            bbox_fig = bbox.transformed(self.figure.transFigure.inverted())
+            actual_center_x = (bbox_fig.x0 + bbox_fig.x1) / 2
+            actual_center_y = (bbox_fig.y0 + bbox_fig.y1) / 2
+            offset_x = cx - actual_center_x
+            offset_y = cy - actual_center_y
+            text_artist.set_position((cx + offset_x, cy + offset_y))
+
+    def _draw_left_tick_marks(self):
+        """Draw the y-axis tick marks ourselves, as figure-level Line2D
+        artists — the same layer the bookend bar lives in — so they're
+        guaranteed to render correctly relative to the bar regardless of
+        zorder quirks between axes-level and figure-level artists (see
+        the note in render_zones where the built-in tick marks are
+        hidden). Drawn in the gap between the bar's outer edge and the
+        tick numbers. Old marks are removed and redrawn each call, since
+        the number of ticks and their y-positions change with the view."""
+        for line in getattr(self, '_manual_tick_lines', []):
+            try:
+                line.remove()
+            except Exception:
+                pass
+        self._manual_tick_lines = []
+
+        if not hasattr(self, 'corner_bar_left'):
+            return
+
+        pos = self.ax.get_position()
+        fig_width_in = self.figure.get_figwidth()
+        if fig_width_in <= 0:
+            return
+        bar_outer_x = pos.x0 - (self.EDGE_BAR_WIDTH_INCHES / fig_width_in)
+        mark_len_frac = (8.0 / 72) / fig_width_in  # 8pt visible tick mark
+
+        ymin, ymax = self.ax.get_ylim()
+        if ymax == ymin:
+            return
+        for tick_val in self.ax.get_yticks():
+            if tick_val < ymin or tick_val > ymax:
+                continue
+            y_frac = pos.y0 + ((tick_val - ymin) / (ymax - ymin)) * pos.height
+            line = Line2D(
+                [bar_outer_x - mark_len_frac, bar_outer_x], [y_frac, y_frac],
+                transform=self.figure.transFigure, color='#333333',
+                linewidth=1.2, zorder=9.5, clip_on=False
+            )
+            self.figure.add_artist(line)
+            self._manual_tick_lines.append(line)
+
+    def _update_edge_bar_dates(self, data_lo, data_hi):
+        """Set the bookend bars' text to the visible date/time range,
+        clamped to the data's own first/last reading (data_lo/data_hi)."""
+        xlim = self.ax.get_xlim()
+        lo, hi = min(xlim), max(xlim)
+        # Clamp to the actual data range — xlim can briefly extend beyond
+        # the data during a zoom-out past the edges
+        lo = max(lo, data_lo)
+        hi = min(hi, data_hi)
+        try:
+            lo_dt = mdates.num2date(lo)
+            hi_dt = mdates.num2date(hi)
+            # The "Showing: ..." line under the title was retired in favor
+            # of folding the same start/end date *and* time into the
+            # existing rotated edge bars beside the graph (see just below)
+            # -- one less thing competing for space right under the title,
+            # and the edge bars were already showing half of this info.
+            if hasattr(self, 'corner_date_left'):
+                self.corner_date_left.set_text(strip_leading_hour_zero(lo_dt.strftime('%b %d, %Y %I:%M %p')))
+                self.corner_date_right.set_text(strip_leading_hour_zero(hi_dt.strftime('%b %d, %Y %I:%M %p')))
+                self._recenter_edge_bar_texts()
+        except (ValueError, OverflowError):
+            if hasattr(self, 'corner_date_left'):
+                self.corner_date_left.set_text("")
+                self.corner_date_right.set_text("")
+                self._recenter_edge_bar_texts()
+
+    def _style_tick_labels(self):
+        """Apply the x tick label sizing; returns True if anything
+        changed (the labels only exist after a draw, so the caller
+        needs to draw again to see it)."""
+        changed = False
+        for label in self.ax.get_xticklabels():
+            text = label.get_text()
+            text_upper = text.upper()
+            is_time = ('AM' in text_upper) or ('PM' in text_upper)
+
+            # No bold anywhere anymore — every tick (time, day, month,
+            # year, including January) is regular weight. Size still
+            # distinguishes the coarser date-level ticks from the
+            # finer time-level ones.
+            desired_weight = 'normal'
+            desired_size = 9 if is_time else 10
+
+            if label.get_fontweight() != desired_weight or label.get_fontsize() != desired_size:
+                label.set_fontweight(desired_weight)
+                label.set_fontsize(desired_size)
+                changed = True
+        return changed
+
+    def _update_range_edge_bubbles(self, ax, lo, hi):
+        """Small floating labels showing the exact date/time at each edge
+        of the current selection, so it's easy to fine-tune the range
+        width without having to release and check the stats card. Reuses
+        the same tooltip look, minus the rounded corners (square here).
+
+        Positioned via annotate's points-offset rather than a plain
+        axes-fraction y — axes-fraction scales with the axes' pixel
+        height, which changes as the window is resized (Qt keeps DPI
+        fixed and resizes the figure itself), so a fraction-based offset
+        drifts relative to the title's pad (which is points-based, i.e. a
+        fixed physical size) and can end up crowding or overlapping the
+        title at some window sizes. Anchoring the offset to points
+        instead keeps a constant, guaranteed gap no matter how the
+        window is stretched — same approach the old "Showing: ..."
+        subtitle used before it was retired in favor of this.
+
+        Centered directly above its edge (ha='center'), with a straight
+        vertical tick line connecting down to that exact x-position —
+        annotate's own arrow (a plain line, no arrowhead) does this
+        automatically, running from the xy anchor to the bottom-center
+        of the bubble.
+
+        Single line (date and time together), not two -- with two lines,
+        the bubble's own height plus its 14pt offset was tall enough to
+        reach into the title's own reserved vertical space above the
+        axes, so the two would visibly overlap whenever a bubble
+        happened to land under the title's actual text (easy to miss in
+        testing, since it only shows up depending on where the selection
+        edges land relative to the title's horizontal extent -- a narrow
+        early selection can look fine while a wider one overlaps). One
+        line keeps the bubble short enough to stay clear with real
+        margin, verified against the title's own rendered bbox rather
+        than guessed."""
+        for attr in ('_selection_start_bubble', '_selection_end_bubble'):
+            bubble = getattr(self, attr, None)
+            if bubble is not None:
+                try:
+                    bubble.remove()
+                except Exception:
+                    pass  # already gone, e.g. after an ax.cla() rebuild
+                setattr(self, attr, None)
+
+        def label_for(xval):
+            dt = mdates.num2date(xval)
+            return strip_leading_hour_zero(dt.strftime('%b %d, %Y %I:%M %p'))
+
+        common_style = dict(
+            xycoords=('data', 'axes fraction'), xytext=(0, 14), textcoords='offset points',
+            ha='center', va='bottom', fontsize=8.5,
+            bbox=dict(boxstyle="square,pad=0.3", fc="white", ec="steelblue", alpha=0.95),
+            arrowprops=dict(arrowstyle='-', color='steelblue', linewidth=1.3, shrinkA=0, shrinkB=2),
+            zorder=12, annotation_clip=False
+        )
+        self._selection_start_bubble = ax.annotate(label_for(lo), xy=(lo, 1.0), **common_style)
+        self._selection_end_bubble = ax.annotate(label_for(hi), xy=(hi, 1.0), **common_style)
+
+    def _draw_plot_contents(self, plot):
+        """Draw the radon trace and everything on or around the main axes
+        (zone-colored line and points, threshold lines, date ticks,
+        labels, legend, bookend bars, fixed margins) for the data
+        described by `plot`, a dict of:
+
+          timestamp_nums, levels  -- the readings, in the display unit
+          unit, authority_key, serial_number
+          zone_data    -- (segments, colors, point_colors) for these
+                          readings under this authority/unit
+          flagged      -- optional bool array of spikes to circle
+
+        Expects a freshly cleared axes. Leaves the full-data y-limits in
+        self._full_data_ylim. Shared by render_zones and the offscreen
+        report figure, which is what keeps exports identical to the
+        screen without touching the on-screen figure at all."""
+        timestamp_nums = plot['timestamp_nums']
+        levels = plot['levels']
+        unit = plot['unit']
+        serial_number = plot['serial_number']
+
+        thresholds, color_map, legend_labels, legend_title = get_authority_zones(plot['authority_key'], unit)
+
+        # Zone-split line segments and per-point colors, precomputed by
+        # the caller (MainWindow caches them per unit/threshold pair)
+        segments, colors, point_colors = plot['zone_data']
+
+        # Create LineCollection without label
+        lc = LineCollection(segments, colors=colors, linewidth=0.5)
+        self.ax.add_collection(lc)
+        self.zone_lines = lc
+
+        # Add a small marker at every actual data point, colored to match
+        # its risk zone, so hover targets are visible on the graph
+        self.point_scatter = self.ax.scatter(
+            timestamp_nums, levels,
+            s=6, c=point_colors, zorder=3, edgecolors='none'
+        )
+
+        # Flagged spikes/dropouts (see SpikeDetector), circled so they
+        # stand out without hiding the reading's own zone color
+        flagged = plot.get('flagged')
+        self.flag_scatter = None
+        if flagged is not None:
+            self.flag_scatter = self.ax.scatter(
+                timestamp_nums[flagged], levels[flagged],
+                s=40, facecolors='none', edgecolors='black', linewidths=1.0, zorder=3.5
+            )
+
+        # The default spine zorder (2.5) sits just below the scatter
+        # points' zorder (3), so data points near the left/bottom edge
+        # get drawn over the plot border instead of the border sitting
+        # cleanly on top of them. Bump the spines above the scatter so
+        # the border always reads as a clean line, not a dotted one.
+        for spine in self.ax.spines.values():
+            spine.set_zorder(4)
+
+        # Add threshold lines
+        for threshold in thresholds:
+            self.ax.axhline(y=threshold, color="#FFA500" if threshold == thresholds[0] else "red", linestyle='--', linewidth=1)
+
+        configure_date_axis(self.ax)
+        self.ax.set_xlim(timestamp_nums[0], timestamp_nums[-1])
+        self.figure.autofmt_xdate()
+
+        # ConciseDateFormatter normally draws a small "2025" / "Jul 2025"
+        # label in the bottom-right corner once zoomed in enough that all
+        # visible ticks share that year/month. Hide it — the rotated edge
+        # bars beside the graph already show the full start/end date and
+        # time at all times, making this redundant.
+        self.ax.xaxis.get_offset_text().set_visible(False)
+
+        self.ax.set_xlabel('DATE AND TIME', fontsize=11, fontweight='bold', labelpad=15)
+        self.ax.set_ylabel(f'RADON LEVEL ({format_unit_mathtext(unit)})', fontsize=11, fontweight='bold', labelpad=15)
+        self.ax.set_title(f'Radon Levels Over Time ({serial_number})', fontsize=16, fontweight='bold', pad=34)
+
+        # Built-in tick marks are axes-level children, while our bookend
+        # bar is a figure-level artist — those two layers don't reliably
+        # respect zorder comparisons against each other in matplotlib (an
+        # axes' children get composited as a unit), so a long built-in
+        # tick mark meant to poke through the bar can end up invisible,
+        # painted over regardless of its zorder. Hidden here (length=0);
+        # _draw_left_tick_marks below draws real tick marks ourselves, as
+        # figure-level artists in the same layer as the bar, sidestepping
+        # the issue entirely. 'pad' still controls the number's distance
+        # from the axes edge, independent of the (now zero) tick length.
+        tick_label_pad = self.EDGE_BAR_WIDTH_INCHES * 72 + 14
+        self.ax.tick_params(axis='y', pad=tick_label_pad, length=0)
+
+        # "Bookend" bars along the left/right edges showing the visible
+        # date range — figure-level artists (see _create_edge_bars, called
+        # once from init_ui) that live outside the axes entirely, so they
+        # sit beside the plotted data rather than overlapping it. ax.cla()
+        # only clears axes-level children, so these persist across every
+        # render_zones rebuild; just keep their position/text in sync here.
+        self._position_edge_bars()
+
+        # Reserve extra headroom above the data so the highest reading is
+        # never hidden behind the risk-category legend, which sits in the
+        # upper-right corner. Without this, a peak that lands on the right
+        # side of the visible range can land directly under the legend
+        # panel. self.ax.get_ylim() at this point already reflects
+        # matplotlib's autoscale over the plotted data and threshold lines
+        # (including its default ~5% margins), so we just push the top
+        # of that range up further. This runs on every render_zones call,
+        # and since it happens before render_zones' toolbar.update()/
+        # push_current(), the padded range becomes the view "Home" resets to.
+        auto_ymin, auto_ymax = self.ax.get_ylim()
+        data_span = auto_ymax - auto_ymin
+        if data_span <= 0:
+            data_span = max(abs(auto_ymax), 1.0)
+        padded_ymax = auto_ymin + data_span / (1 - self.LEGEND_HEADROOM_FRACTION)
+        self.ax.set_ylim(auto_ymin, padded_ymax)
+        # Remembered so turning "Autoscale Y to Visible Range" back off
+        # can restore the full-data limits without a full re-render
+        self._full_data_ylim = (auto_ymin, padded_ymax)
+
+        # Create custom color legend, title reflects the selected authority
+        legend_patches = [Patch(color=color, label=label) for color, label in zip([c[2] for c in color_map], legend_labels)]
+        self.ax.legend(handles=legend_patches, loc='upper right', title=legend_title, fontsize=7, bbox_to_anchor=(0.99, 0.99), borderpad=1.35, handletextpad=0.75, labelspacing=0.7, framealpha=0.95)
+
+        self.ax.grid(True)
+
+        # Finalize the plot layout
+        self._finalize_layout()
+
+    def _draw_export_stats_panel(self, stats_height_in, cards):
+        """Draw a row of stat boxes as plain matplotlib Rectangle/Text
+        artists, positioned in the blank strip reserved at the very
+        bottom of the export figure. `cards` is the list built by
+        MainWindow._compute_export_stat_values. Matches the
+        on-screen averages row's content, but built from vector
+        primitives so it stays real vector output in PDF/SVG exports
+        rather than a rasterized copy of the Qt widgets.
+
+        Each card's block of lines is centered around the card's own
+        vertical middle, based on how many lines *that* card actually
+        has -- a fixed set of y-positions used for every card regardless
+        of its line count left short cards (like the 2-line 24-hour
+        average) looking top-heavy, since the unused lower slots just
+        went blank instead of the content re-centering to fill the space.
+
+        The detail line (selection date range + reading count) varies a
+        lot in length depending on what's actually selected, so a fixed
+        font size that fits a short range can easily overflow the card's
+        width for a longer one. Each line's actual rendered width gets
+        measured after being drawn, via the figure's own canvas
+        renderer, and shrunk to fit if it's wider than
+        the card (with a little side padding) -- rather than guessing a
+        size that happens to work for whatever range was tested."""
+        fig = self.figure
+        fig_w_in, fig_h_in = fig.get_size_inches()
+        self._export_stats_artists = []
+        try:
+            renderer = self.canvas.get_renderer()
+        except Exception:
+            renderer = None
+
+        left_in = self.LEFT_MARGIN_INCHES
+        right_in = self.RIGHT_MARGIN_INCHES
+        usable_w_in = fig_w_in - left_in - right_in
+        gap_in = 0.15
+        n = 4
+        card_w_in = (usable_w_in - gap_in * (n - 1)) / n
+        card_h_in = max(0.4, stats_height_in - 0.15)
+        card_y0_in = (stats_height_in - card_h_in) / 2
+        max_text_w_in = card_w_in - 0.16  # a little side padding within the card
+
+        for i, info in enumerate(cards):
+            x0_in = left_in + i * (card_w_in + gap_in)
+            x0_frac = x0_in / fig_w_in
+            w_frac = card_w_in / fig_w_in
+            y0_frac = card_y0_in / fig_h_in
+            h_frac = card_h_in / fig_h_in
+            cx = x0_frac + w_frac / 2
+
+            rect = Rectangle(
+                (x0_frac, y0_frac), w_frac, h_frac, transform=fig.transFigure,
+                facecolor='white', edgecolor='#999999', linewidth=1.0, zorder=9
+            )
+            fig.add_artist(rect)
+            self._export_stats_artists.append(rect)
+
+            lines = [
+                (info['title'], 9, 'bold', '#555555'),
+                (info['value'], 15, 'bold', '#111111'),
+            ]
+            if info.get('note'):
+                lines.append((info['note'], 7, 'normal', '#888888'))
+            if info.get('detail'):
+                lines.append((info['detail'], 6.5, 'normal', '#666666'))
+
+            line_gap_frac = 0.23
+            top_y = 0.5 + line_gap_frac * (len(lines) - 1) / 2
+            for j, (text, fontsize, weight, color) in enumerate(lines):
+                y_rel = top_y - j * line_gap_frac
+                t = fig.text(
+                    cx, y0_frac + h_frac * y_rel, text, transform=fig.transFigure,
+                    ha='center', va='center', fontsize=fontsize, fontweight=weight,
+                    color=color, zorder=10
+                )
+                self._export_stats_artists.append(t)
+
+                if renderer is not None and text:
+                    bbox_in = t.get_window_extent(renderer=renderer).transformed(fig.dpi_scale_trans.inverted())
+                    if bbox_in.width > max_text_w_in > 0:
+                        t.set_fontsize(max(5.0, fontsize * (max_text_w_in / bbox_in.width)))
+
+    def _clear_export_stats_panel(self):
+        for artist in getattr(self, '_export_stats_artists', []):
+            try:
+                artist.remove()
+            except Exception:
+                pass
+        self._export_stats_artists = []
+
+
+# Standard report page sizes, (width, height) in inches — landscape,
+# since the chart is much wider than it is tall. See report_page_layout.
+REPORT_PAGE_SIZES = {
+    'letter': (11.0, 8.5),
+    'a4': (11.69, 8.27),
+}
+# Height of the stats panel strip along the bottom of every report page
+REPORT_STATS_PANEL_HEIGHT_INCHES = 1.05
+
+ReportPageLayout = collections.namedtuple('ReportPageLayout', [
+    'size_inches',        # (width, height) of the whole page
+    'stats_height_in',    # the stats panel strip along the bottom
+    'margins',            # subplots_adjust fractions for the plot axes
+])
+
+
+@functools.lru_cache(maxsize=32)
+def report_page_layout(size_inches, stats_height_in=REPORT_STATS_PANEL_HEIGHT_INCHES):
+    """The geometry of a report page of `size_inches` (width, height):
+    where the plot axes go, leaving the usual fixed-inch margins, edge
+    bars and the stats panel strip underneath. Computed once per page
+    size and cached, so a batch of hundreds of same-size pages — or the
+    same export repeated — never works it out again, and the pages
+    themselves (see _OffscreenReportFigure) need no layout pass at all:
+    with every margin fixed in inches there's nothing left to decide."""
+    width_in, height_in = size_inches
+    margins = fixed_margin_fractions(
+        width_in, height_in, _RadonFigureLayout.TOP_MARGIN_INCHES,
+        _RadonFigureLayout.BOTTOM_MARGIN_INCHES + stats_height_in, _RadonFigureLayout.LEFT_MARGIN_INCHES,
+        _RadonFigureLayout.RIGHT_MARGIN_INCHES, _RadonFigureLayout.EDGE_BAR_WIDTH_INCHES,
+    )
+    return ReportPageLayout((float(width_in), float(height_in)), stats_height_in, margins)
+
+
+def snapshot_page_layout(snapshot):
+    """report_page_layout for an export snapshot: its 'page_size' —
+    a REPORT_PAGE_SIZES key or a custom (width, height) in inches — or,
+    with none set, a page the size of the on-screen figure plus the
+    stats panel underneath, so the plot keeps its on-screen size."""
+    page_size = snapshot.get('page_size')
+    if page_size is None:
+        width_in, height_in = snapshot['size_inches']
+        return report_page_layout((width_in, height_in + REPORT_STATS_PANEL_HEIGHT_INCHES))
+    return report_page_layout(tuple(REPORT_PAGE_SIZES.get(page_size, page_size)))
+
+
+class _OffscreenReportFigure(_RadonFigureLayout):
+    """A standalone Agg-backed figure laid out like the on-screen one,
+    for exports, on a page whose geometry comes from a ReportPageLayout
+    (see report_page_layout). Its BOTTOM_MARGIN_INCHES and
+    XLABEL_BOTTOM_OFFSET_INCHES are grown by the stats panel's height
+    (as instance attributes, shadowing the class defaults only on this
+    object), so the edge bars, tick marks and title sit where they do on
+    screen, and the "DATE AND TIME" label stays in the gap above the
+    panel rather than landing inside it. Nothing here refers to Qt, so
+    it can be built and drawn in a worker process."""
+
+    def __init__(self, layout, dpi):
+        self.layout = layout
+        self.figure = Figure(figsize=layout.size_inches, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.BOTTOM_MARGIN_INCHES = _RadonFigureLayout.BOTTOM_MARGIN_INCHES + layout.stats_height_in
+        self.XLABEL_BOTTOM_OFFSET_INCHES = _RadonFigureLayout.XLABEL_BOTTOM_OFFSET_INCHES + layout.stats_height_in
+        self._create_edge_bars()
+
+    def _apply_fixed_margins(self):
+        self.figure.subplots_adjust(**self.layout.margins)
+        self._position_edge_bars()
+        self._position_xlabel()
+
+    def draw_snapshot(self, snapshot):
+        """Draw a MainWindow._report_snapshot: the plot at the snapshot's
+        view limits, any selection shading and edge bubbles, and the
+        stats panel."""
+        self.draw_page(snapshot['plot'], snapshot['xlim'], snapshot['ylim'], snapshot['cards'],
+                       selection=snapshot['selection'])
+
+    def draw_page(self, plot, xlim, ylim, cards, selection=None, data_range=None, title=None, keep_layout=False):
+        """Draw one full report page — plot, view limits, optional
+        selection, edge-bar dates and stats panel — replacing whatever
+        the previous call drew, so one figure can be reused for every
+        page of a multi-page report. `data_range` is the (first, last)
+        reading the edge bars clamp to (the plot's own first/last by
+        default); `title` replaces the usual plot title if given.
+
+        With keep_layout, a page after the first only swaps the data
+        into the existing line and scatter artists instead of rebuilding
+        the axes — for pages that share everything else (unit, standard,
+        y-range), which skips rebuilding the legend, the axis labels and
+        the tick labels' styling on every page."""
+        reuse = keep_layout and getattr(self, 'zone_lines', None) is not None
+        if reuse:
+            self._replace_plot_data(plot)
+        else:
+            self.ax.cla()
+            self._draw_plot_contents(plot)
+        self._clear_export_stats_panel()
+        if title is not None:
+            self.ax.set_title(title, fontsize=16, fontweight='bold', pad=34)
+        self.ax.set_xlim(*xlim)
+        if ylim is not None:
+            self.ax.set_ylim(*ylim)
+        self._draw_left_tick_marks()
+        if selection is not None:
+            lo, hi = selection
+            self.ax.axvspan(lo, hi, color='steelblue', alpha=0.25, zorder=2)
+            self._update_range_edge_bubbles(self.ax, lo, hi)
+        if data_range is None:
+            nums = plot['timestamp_nums']
+            data_range = (nums[0], nums[-1])
+        self._update_edge_bar_dates(*data_range)
+        self._draw_export_stats_panel(self.layout.stats_height_in, cards)
+        # Tick labels only exist after a draw; size them the same way
+        # the on-screen draw_event hook does before the real save. A
+        # layout-only draw is enough for that — nothing is rasterized.
+        # A reused layout keeps its already-styled tick labels (the axis
+        # reuses its Tick objects, and with them their font settings).
+        if not reuse:
+            self.figure.draw_without_rendering()
+            self._style_tick_labels()
+
+    def set_data_rasterized(self, rasterized):
+        """Rasterize (or stop rasterizing) just the dense data layers —
+        see render_report's hybrid mode."""
+        for artist in (self.zone_lines, self.point_scatter, self.flag_scatter):
+            if artist is not None:
+                artist.set_rasterized(rasterized)
+
+    def _replace_plot_data(self, plot):
+        """Swap `plot`'s readings into the line and scatter artists the
+        previous _draw_plot_contents call created (see draw_page)."""
+        nums, levels = plot['timestamp_nums'], plot['levels']
+        segments, colors, point_colors = plot['zone_data']
+        self.zone_lines.set_segments(segments)
+        self.zone_lines.set_color(colors)
+        self.point_scatter.set_offsets(np.column_stack((nums, levels)))
+        self.point_scatter.set_facecolor(point_colors)
+        flagged = plot.get('flagged')
+        if self.flag_scatter is not None and flagged is not None:
+            self.flag_scatter.set_offsets(np.column_stack((nums[flagged], levels[flagged])))
+
+
+# Vector formats render_report can save in hybrid mode (dense data
+# layers rasterized, everything else vector), and the DPI offered for
+# the rasterized layers by default
+HYBRID_RASTER_FORMATS = ('pdf', 'svg')
+DEFAULT_RASTER_DPI = 300
+
+# rcParams every report render runs under — see render_report for why
+# PDFs use the standard Core 14 fonts rather than embedding any
+REPORT_RC_PARAMS = {'pdf.fonttype': 42, 'pdf.use14corefonts': True, 'ps.fonttype': 42}
+
+
+def format_file_size(num_bytes):
+    """Human-readable file size for status messages, e.g. "2.4 MB"."""
+    if num_bytes < 1024:
+        return f"{num_bytes} bytes"
+    if num_bytes < 1024 ** 2:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / 1024 ** 2:.1f} MB"
+
+
+def merge_zone_runs(segments, colors):
+    """Join each run of consecutive same-colored segments from
+    segment_by_zones into one polyline. Within a run each segment starts
+    where the previous one ended, so the line looks the same, but a
+    month of readings becomes a few dozen paths instead of one per
+    reading — a vector file writes every path separately, with its own
+    color. A run also ends wherever a segment doesn't start at the last
+    one's end (a gap in the readings), so the break stays a break."""
+    if len(segments) == 0:
+        return segments, colors
+    points = np.asarray(segments, dtype=float)  # (n, 2, 2)
+    # Colors may be names or RGB(A) tuples; compare them row by row
+    color_arr = np.asarray(colors).reshape(len(colors), -1)
+    changed = (color_arr[1:] != color_arr[:-1]).any(axis=1)
+    changed |= (points[1:, 0] != points[:-1, 1]).any(axis=1)
+    run_starts = np.flatnonzero(np.r_[True, changed])
+    run_ends = np.r_[run_starts[1:], len(points)]
+    polylines = [
+        np.vstack((points[a:b, 0], points[b - 1, 1]))
+        for a, b in zip(run_starts, run_ends)
+    ]
+    return polylines, [colors[a] for a in run_starts]
+
+
+def render_report(snapshot, path, fmt):
+    """Render a MainWindow._report_snapshot to `path` in format `fmt`
+    through matplotlib's own savefig — so PDF/SVG come out as true
+    vector output (real paths and text, not a rasterized screenshot),
+    and PNG/JPEG come out consistent with them rather than a separate
+    raster-only code path. `path` may also be a writable binary file
+    object. Returns {'seconds', 'bytes'} for what was written.
+
+    The page is the on-screen figure's size plus the stats panel, or a
+    standard/custom page size if the snapshot has a 'page_size' (see
+    snapshot_page_layout).
+
+    A snapshot 'raster_dpi' (PDF/SVG only) switches to hybrid output:
+    just the dense data layers — the zone-colored line, the reading
+    markers and spike circles — are rasterized at that DPI, while the
+    text, axes, grid, threshold lines, edge bars and stats panel stay
+    vector. A year of 10-minute readings otherwise writes every line
+    segment and marker as its own path. (The export's status message
+    compares against the last fully vector export of the same view, if
+    there was one — see MainWindow.export_report — rather than paying
+    for a second, vector save here.)
+
+    Runs in a worker process (see MainWindow.export_report) rather
+    than a thread: matplotlib's text layout shares module-level state
+    (the mathtext parser in particular) that isn't safe to use from two
+    threads at once, and the GUI thread keeps drawing while a report is
+    being written.
+
+    Also switches the PDF backend to the standard PDF "Core 14"
+    fonts (Helvetica et al.) instead of embedding DejaVu Sans.
+    Embedding ran into two different problems depending on how it
+    was configured: Type 3 (matplotlib's default) embeds glyphs as
+    bitmap-like procedures that some PDF viewers substitute with a
+    fallback font entirely; Type 42 embeds real outlines but showed
+    visibly off kerning in testing. Core 14 fonts sidestep both --
+    they're referenced by name rather than embedded, so every PDF
+    viewer uses its own correctly-kerned built-in implementation.
+    The visual tradeoff is a Helvetica-style look rather than
+    DejaVu Sans specifically, which is a reasonable, standard look
+    for this kind of report. Doesn't affect PNG/JPEG, which don't
+    embed fonts at all."""
+    started = time.perf_counter()
+    report_fig = _OffscreenReportFigure(snapshot_page_layout(snapshot), snapshot['dpi'])
+    report_fig.draw_snapshot(snapshot)
+    raster_dpi = snapshot.get('raster_dpi') if fmt in HYBRID_RASTER_FORMATS else None
+
+    with matplotlib.rc_context(REPORT_RC_PARAMS):
+        if raster_dpi:
+            report_fig.set_data_rasterized(True)
+            report_fig.figure.savefig(path, format=fmt, facecolor='white', dpi=raster_dpi)
+        else:
+            report_fig.figure.savefig(path, format=fmt, facecolor='white')
+    written = path.tell() if hasattr(path, 'write') else os.path.getsize(path)
+    return {'seconds': time.perf_counter() - started, 'bytes': written}
+
+
+def render_report_bytes(snapshot, fmt):
+    """render_report into memory: returns (file_bytes, result)."""
+    buffer = io.BytesIO()
+    result = render_report(snapshot, buffer, fmt)
+    return buffer.getvalue(), result
+
+
+def dataset_digest(*arrays):
+    """A content hash of the given arrays (BLAKE2b, hex) — identifies a
+    dataset for RenderCache keys regardless of which file or path it
+    came from."""
+    h = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        h.update(str(array.dtype).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """Content hash (BLAKE2b, hex) of a file on disk, read in blocks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def report_cache_key(snapshot, digest, fmt):
+    """RenderCache key for rendering `snapshot` (see
+    MainWindow._report_snapshot) as `fmt`: the dataset's digest plus
+    every plain-value setting that changes the output — unit, risk
+    standard, view and selection, spike marking, the stats cards'
+    contents, window and page size, DPI and raster mode. The arrays themselves are
+    covered by the digest."""
+    plot = snapshot['plot']
+    settings = (
+        plot['unit'], plot['authority_key'], plot['serial_number'], plot['flagged'] is not None,
+        tuple(snapshot['xlim']), None if snapshot['ylim'] is None else tuple(snapshot['ylim']), snapshot['selection'],
+        repr(snapshot['cards']), tuple(snapshot['size_inches']), snapshot['dpi'],
+        snapshot.get('raster_dpi'), snapshot.get('page_size'), fmt,
+    )
+    return digest + ':' + hashlib.blake2b(repr(settings).encode(), digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """Rendered output (bytes) by key, least-recently-used first out
+    once the total size passes max_bytes. A value bigger than the whole
+    budget is never stored. Safe to share between threads.
+
+    Each entry is (data, info), where info is whatever small metadata
+    the caller wants back on a hit (e.g. render_report's result)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """(data, info) for `key`, marking it most recently used — or
+        None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, data, info=None):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[0])
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = (data, info)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# Thumbnails (see render_thumbnails): small, low-DPI previews of whole files
+THUMBNAIL_SIZE_INCHES = (3.2, 2.0)
+THUMBNAIL_DPI = 50
+THUMBNAIL_MAX_POINTS = 400
+
+
+def render_file_thumbnail(path, size_inches=THUMBNAIL_SIZE_INCHES, dpi=THUMBNAIL_DPI, fmt='png',
+                          authority_key='who', unit="Bq/m3"):
+    """A small preview image of a whole export file: the zone-colored
+    trace and threshold lines, no labels. Long files are averaged down
+    to THUMBNAIL_MAX_POINTS equal blocks first — far more points than
+    that can't show at thumbnail size anyway. Returns the image bytes,
+    or None if the file can't be read."""
+    try:
+        end_datetime = end_datetime_from_filename(path) or default_end_datetime(path)
+        data = parse_rd200_file(path, end_datetime, with_datetimes=False, verbose=False)
+    except Exception:
+        return None
+    nums = data['timestamp_nums']
+    levels = data['radon_levels'] * unit_scale(data['unit'], unit)
+    if len(levels) > THUMBNAIL_MAX_POINTS:
+        starts = np.linspace(0, len(levels), THUMBNAIL_MAX_POINTS, endpoint=False).astype(np.int64)
+        counts = np.diff(np.r_[starts, len(levels)])
+        nums = np.add.reduceat(nums, starts) / counts
+        levels = np.add.reduceat(levels, starts) / counts
+
+    thresholds, color_map = get_authority_zones(authority_key, unit)[:2]
+    fig = Figure(figsize=size_inches, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    if len(levels) > 1:
+        segments, colors = merge_zone_runs(*segment_by_zones(nums, levels, thresholds, color_map))
+        ax.add_collection(LineCollection(segments, colors=colors, linewidth=1.0))
+        ax.set_xlim(nums[0], nums[-1])
+    else:
+        ax.scatter(nums, levels, c=zone_point_colors(levels, color_map), s=8)
+    for threshold in thresholds:
+        ax.axhline(threshold, color="#FFA500" if threshold == thresholds[0] else "red", linestyle='--', linewidth=0.6)
+    ax.set_ylim(0, max(float(np.max(levels)), thresholds[-1]) * 1.08)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, facecolor='white')
+    return buffer.getvalue()
+
+
+def render_thumbnails(paths, size_inches=THUMBNAIL_SIZE_INCHES, dpi=THUMBNAIL_DPI, fmt='png',
+                      authority_key='who', unit="Bq/m3", cache=None, max_workers=None):
+    """Thumbnails (see render_file_thumbnail) for many files at once,
+    returned as {path: image bytes, or None if unreadable}. Files are
+    identified by content hash, so with a RenderCache passed in, any
+    file already rendered at these settings — even under another name
+    or path — comes straight from the cache; the rest are rendered in
+    parallel in a process pool and added to it."""
+    settings = (tuple(size_inches), dpi, fmt, authority_key, unit)
+    keys = {}
+    results = {}
+    for path in paths:
+        try:
+            keys[path] = 'thumb:' + file_digest(path) + ':' + repr(settings)
+        except OSError:
+            results[path] = None
+            continue
+        hit = cache.get(keys[path]) if cache is not None else None
+        if hit is not None:
+            results[path] = hit[0]
+
+    missing = [path for path in keys if path not in results]
+    if missing:
+        workers = min(len(missing), max_workers or os.cpu_count() or 1)
+        render = functools.partial(render_file_thumbnail, size_inches=size_inches, dpi=dpi, fmt=fmt,
+                                   authority_key=authority_key, unit=unit)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, data in zip(missing, pool.map(render, missing, chunksize=max(1, len(missing) // (workers * 4)))):
+                results[path] = data
+                if data is not None and cache is not None:
+                    cache.put(keys[path], data)
+    return {path: results[path] for path in paths}
+
+
+# Time-range tiles (see TileSet): each zoom level splits time into
+# fixed-length tiles counted from a fixed epoch (date number 0), so a
+# tile's span never depends on where the data starts or ends
+TILE_ZOOM_DAYS = (365, 90, 30, 7, 1)  # tile length in days, per zoom level
+TILE_SIZE_INCHES = (6.0, 3.0)
+TILE_DPI = 100
+TILE_AXIS_HEIGHT_INCHES = 0.45  # strip under the plot for the date labels
+# Bump whenever render_tile's drawing changes, so tiles cached on disk
+# by an older version stop matching
+TILE_STYLE_VERSION = 1
+
+
+def tile_bounds(zoom, index):
+    """(start, end) date numbers of tile `index` at zoom level `zoom`."""
+    days = TILE_ZOOM_DAYS[zoom]
+    return index * days, (index + 1) * days
+
+
+def tile_index(zoom, num):
+    """Index of the tile at zoom level `zoom` containing date number
+    `num`."""
+    return int(np.floor(num / TILE_ZOOM_DAYS[zoom]))
+
+
+def tile_ymax(levels, thresholds):
+    """A y-axis top shared by every tile of a dataset, so tiles line up
+    side by side: a little above the highest reading or the top
+    threshold, rounded up to a 1/2/5 step — so appending readings only
+    changes it (and with it every tile) when a new peak crosses a step."""
+    peak = max(float(np.max(levels)) if len(levels) else 0.0, thresholds[-1]) * 1.08
+    magnitude = 10 ** np.floor(np.log10(peak)) if peak > 0 else 1.0
+    for step in (1, 2, 5, 10):
+        if peak <= step * magnitude:
+            return float(step * magnitude)
+    return float(peak)
+
+
+def render_tile(job):
+    """Draw one tile (see TileSet) and return its image bytes. `job` is
+    a dict of the tile's readings (timestamp_nums, levels — only those
+    inside it plus one either side, so the line runs off the edges into
+    the neighboring tiles), unit, authority_key, xlim, ymax, size_inches,
+    dpi and fmt.
+
+    Same zone colors, threshold lines and date ticks as the main plot,
+    but no title, legend, y-axis labels or side margins: the axes span
+    the tile's full width, so tiles placed side by side join up into one
+    continuous chart."""
+    nums, levels = job['timestamp_nums'], job['levels']
+    thresholds, color_map = get_authority_zones(job['authority_key'], job['unit'])[:2]
+    width_in, height_in = job['size_inches']
+    fig = Figure(figsize=(width_in, height_in), dpi=job['dpi'])
+    FigureCanvasAgg(fig)
+    axis_frac = TILE_AXIS_HEIGHT_INCHES / height_in
+    ax = fig.add_axes([0, axis_frac, 1, 1 - axis_frac])
+    if len(levels) > 1:
+        segments, colors = merge_zone_runs(*segment_by_zones(nums, levels, thresholds, color_map))
+        ax.add_collection(LineCollection(segments, colors=colors, linewidth=0.5))
+    if len(levels):
+        ax.scatter(nums, levels, s=6, c=zone_point_colors(levels, color_map), zorder=3, edgecolors='none')
+    for threshold in thresholds:
+        ax.axhline(y=threshold, color="#FFA500" if threshold == thresholds[0] else "red", linestyle='--', linewidth=1)
+    configure_date_axis(ax)
+    ax.xaxis.get_offset_text().set_visible(False)
+    ax.tick_params(axis='y', left=False, labelleft=False)
+    ax.tick_params(axis='x', labelsize=8)
+    for side in ('left', 'right', 'top'):
+        ax.spines[side].set_visible(False)
+    ax.grid(True)
+    ax.set_xlim(*job['xlim'])
+    ax.set_ylim(0, job['ymax'])
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=job['fmt'], facecolor='white')
+    return buffer.getvalue()
+
+
+class TileCache:
+    """Rendered tiles on disk, content-addressed: each tile is stored
+    under a hash of everything that went into drawing it (see
+    TileSet.key), as <directory>/<first 2 hex digits>/<hash>.<fmt>.
+    Nothing ever needs invalidating by name — a tile whose data changed
+    simply hashes to a new file, and identical tiles (the same readings
+    under another file name, say) share one. prune() clears out the
+    least recently used files once the directory passes max_bytes; put()
+    runs it itself every `prune_every` bytes written (an eighth of
+    max_bytes by default), so a long-running server's cache stays
+    bounded without a full directory scan per tile. Files are written to
+    a temporary name and renamed into place, so several processes can
+    share one directory."""
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, prune_every=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every or max(1, max_bytes // 8)
+        self._written = 0  # bytes put() since the last prune
+        self._written_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key, fmt):
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def get(self, key, fmt):
+        path = self.path_for(key, fmt)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used, for prune()
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, fmt, data):
+        path = self.path_for(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self._written_lock:
+            self._written += len(data)
+            due = self._written >= self.prune_every
+            if due:
+                # Reset here, not in prune(), so other threads' puts
+                # during the scan don't start prunes of their own
+                self._written = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Delete least recently used tiles until the cache fits in
+        max_bytes. Returns the number of files removed."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue  # another put() still writing it
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+class TileSet:
+    """The tiles of one dataset, at one unit, risk standard and tile
+    size, backed by a TileCache.
+
+    A tile's cache key hashes its own readings (plus the neighbors either
+    side that it draws) and the drawing settings, so it's computed by
+    slicing out just that tile — never by hashing the whole file — and
+    remembered. extend() takes the dataset with readings appended and
+    forgets the keys of only the tiles those readings can reach: the
+    tile holding the previous last reading and everything after it.
+    Every other tile keeps its key, and with it its cached image, so
+    new data re-renders one tile per zoom level (occasionally two)
+    instead of the whole history. A new peak that moves the shared
+    y-axis top (see tile_ymax) is the exception, and re-keys them all."""
+
+    def __init__(self, timestamp_nums, levels, unit, authority_key, cache,
+                 size_inches=TILE_SIZE_INCHES, dpi=TILE_DPI, fmt='png'):
+        self.unit = unit
+        self.authority_key = authority_key
+        self.cache = cache
+        self.size_inches = tuple(size_inches)
+        self.dpi = dpi
+        self.fmt = fmt
+        self.thresholds = get_authority_zones(authority_key, unit)[0]
+        self._keys = {}
+        self._set_data(timestamp_nums, levels)
+
+    def _set_data(self, timestamp_nums, levels):
+        self.timestamp_nums = timestamp_nums
+        self.levels = levels
+        self.ymax = tile_ymax(levels, self.thresholds)
+
+    def extend(self, timestamp_nums, levels):
+        """Switch to an updated copy of the dataset. Returns the
+        (zoom, index) tiles whose keys were dropped — all of them
+        (None) if the new data isn't the old data with readings added
+        on the end, or the y-axis top moved."""
+        old_n = len(self.timestamp_nums)
+        appended = (
+            len(timestamp_nums) >= old_n > 0
+            and np.array_equal(timestamp_nums[:old_n], self.timestamp_nums)
+            and np.array_equal(levels[:old_n], self.levels)
+        )
+        old_ymax = self.ymax
+        old_last = self.timestamp_nums[-1] if old_n else None
+        self._set_data(timestamp_nums, levels)
+        if not appended or self.ymax != old_ymax:
+            self._keys.clear()
+            return None
+        if len(timestamp_nums) == old_n:
+            return []
+        first_changed = {zoom: tile_index(zoom, old_last) for zoom in range(len(TILE_ZOOM_DAYS))}
+        dropped = [tile for tile in self._keys if tile[1] >= first_changed[tile[0]]]
+        for tile in dropped:
+            del self._keys[tile]
+        return dropped
+
+    def tiles_covering(self, zoom, start_num=None, end_num=None):
+        """(zoom, index) of every tile overlapping start..end (by default
+        the whole dataset)."""
+        nums = self.timestamp_nums
+        start_num = nums[0] if start_num is None else start_num
+        end_num = nums[-1] if end_num is None else end_num
+        return [(zoom, index) for index in range(tile_index(zoom, start_num), tile_index(zoom, end_num) + 1)]
+
+    def job(self, zoom, index):
+        """render_tile's input for tile (zoom, index)."""
+        start, end = tile_bounds(zoom, index)
+        nums = self.timestamp_nums
+        lo = max(int(np.searchsorted(nums, start, side='left')) - 1, 0)
+        hi = min(int(np.searchsorted(nums, end, side='left')) + 1, len(nums))
+        return {
+            'timestamp_nums': nums[lo:hi],
+            'levels': self.levels[lo:hi],
+            'unit': self.unit,
+            'authority_key': self.authority_key,
+            'xlim': (start, end),
+            'ymax': self.ymax,
+            'size_inches': self.size_inches,
+            'dpi': self.dpi,
+            'fmt': self.fmt,
+        }
+
+    def key(self, zoom, index):
+        """The tile's content hash (see TileCache)."""
+        key = self._keys.get((zoom, index))
+        if key is None:
+            job = self.job(zoom, index)
+            settings = (
+                TILE_STYLE_VERSION, zoom, index, self.unit, self.authority_key,
+                self.ymax, self.size_inches, self.dpi, self.fmt,
+            )
+            key = dataset_digest(job['timestamp_nums'], job['levels']) + hashlib.blake2b(
+                repr(settings).encode(), digest_size=8).hexdigest()
+            self._keys[(zoom, index)] = key
+        return key
+
+    def get(self, zoom, index):
+        """The tile's image bytes, rendering (in this process) and
+        caching it if it isn't cached yet."""
+        key = self.key(zoom, index)
+        data = self.cache.get(key, self.fmt)
+        if data is None:
+            data = render_tile(self.job(zoom, index))
+            self.cache.put(key, self.fmt, data)
+        return data
+
+    def render(self, tiles, executor=None, max_workers=None):
+        """Make sure every (zoom, index) in `tiles` is cached, rendering
+        the missing ones in parallel worker processes — on `executor` if
+        given, else a process pool of its own. Returns the number
+        rendered."""
+        missing = {}
+        for zoom, index in tiles:
+            key = self.key(zoom, index)
+            if key not in missing and not os.path.exists(self.cache.path_for(key, self.fmt)):
+                missing[key] = (zoom, index)
+        if not missing:
+            return 0
+        jobs = [self.job(*tile) for tile in missing.values()]
+        if executor is None:
+            workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                images = list(pool.map(render_tile, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        else:
+            images = list(executor.map(render_tile, jobs))
+        for key, data in zip(missing, images):
+            self.cache.put(key, self.fmt, data)
+        return len(jobs)
+
+
+def export_average_card(title, avg, unit, available_days=None, days_wanted=None, detail=None):
+    """One stats-panel card (see _draw_export_stats_panel) for an
+    average: "n/a" when there's nothing to average, and a smaller
+    "(Nd avail.)" note when fewer than `days_wanted` days of data were
+    available to average over."""
+    if avg is None:
+        return {'title': title, 'value': 'n/a', 'detail': detail}
+    note = None
+    if days_wanted is not None and available_days < days_wanted:
+        note = f"({available_days:.0f}d avail.)"
+    return {'title': title, 'value': f"{avg:.1f} {format_unit_mathtext(unit)}", 'note': note, 'detail': detail}
+
+
+def selection_average_card(unit, avg=None, count=0, first=None, last=None):
+    """The stats panel's fourth card: the selected range's average, its
+    first/last reading times (datetimes) and reading count — or a dash
+    when nothing is selected (count 0)."""
+    if not count:
+        return {'title': "SELECTED RANGE AVERAGE", 'value': "\u2013"}
+    start_dt = strip_leading_hour_zero(first.strftime('%Y-%m-%d %I:%M %p'))
+    end_dt = strip_leading_hour_zero(last.strftime('%Y-%m-%d %I:%M %p'))
+    return {
+        'title': "SELECTED RANGE AVERAGE",
+        'value': "n/a" if avg is None else f"{avg:.1f} {format_unit_mathtext(unit)}",
+        'detail': f"{start_dt} \u2013 {end_dt} ({count} readings)",
+    }
+
+
+# The trailing-average cards, in the window's stats panel and every
+# report, and the fleet report's average columns: (title, short label,
+# days)
+AVERAGE_PERIODS = (("24-HOUR AVERAGE", "24h", 1), ("30-DAY AVERAGE", "30d", 30), ("1-YEAR AVERAGE", "1y", 365))
+
+
+def level_prefix_sums(levels, include=None):
+    """Running totals (sums, counts) of `levels`, each with a leading 0,
+    so the sum and number of readings over any index range [i, j) are
+    one subtraction apiece. `include` optionally masks readings out
+    (spike exclusion)."""
+    if include is None:
+        return np.concatenate(([0.0], np.cumsum(levels, dtype=float))), np.arange(len(levels) + 1)
+    return (
+        np.concatenate(([0.0], np.cumsum(np.where(include, levels, 0.0)))),
+        np.concatenate(([0], np.cumsum(include))),
+    )
+
+
+def range_averages(sums, counts, starts, stops):
+    """Averages over readings starts..stops-1 from level_prefix_sums
+    totals, None wherever there's nothing to average. Given ints,
+    returns one average; given arrays, a list of them."""
+    n = np.asarray(counts[stops] - counts[starts])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = (sums[stops] - sums[starts]) / n
+    if n.ndim == 0:
+        return float(avg) if n > 0 else None
+    return [float(a) if c > 0 else None for a, c in zip(avg, n)]
+
+
+def trailing_period_averages(timestamps, sums, counts, stops, end_nums):
+    """{days: average(s)} over every AVERAGE_PERIODS window ending at
+    reading stops - 1 (whose date number is end_nums): the readings at
+    or after end - days. `timestamps` is the date numbers as an array or
+    a Timeline; stops/end_nums are ints or arrays, as range_averages."""
+    # Small tolerance so a reading exactly on the cutoff counts as
+    # inside it despite float rounding in the date numbers
+    return {
+        days: range_averages(sums, counts, timestamps.searchsorted(end_nums - days - 1e-9, side='left'), stops)
+        for _, _, days in AVERAGE_PERIODS
+    }
+
+
+def average_summary(timestamp_nums, levels, selection=None, include=None):
+    """The numbers behind the stats panel, straight from arrays — for
+    callers without a MainWindow (see radon_server), and matching
+    MainWindow._compute_export_stat_values: the trailing averages of
+    AVERAGE_PERIODS (readings at or after last - days) and, if given, the
+    average over the index range `selection` = (lo, hi). `include`
+    optionally masks readings out of every average (spike exclusion).
+    Returns {'total_days', 'periods': {days: average or None},
+    'selection': None or {'first', 'last', 'readings', 'average'}}."""
+    nums = timestamp_nums
+    sums, counts = level_prefix_sums(levels, include)
+    periods = trailing_period_averages(nums, sums, counts, len(nums), nums[-1])
+    summary = {'total_days': float(nums[-1] - nums[0]), 'periods': periods, 'selection': None}
+    if selection is not None and selection[1] > selection[0]:
+        lo, hi = selection
+        summary['selection'] = {
+            'first': float(nums[lo]), 'last': float(nums[hi - 1]), 'readings': hi - lo,
+            'average': range_averages(sums, counts, lo, hi),
+        }
+    return summary
+
+
+def summary_cards(summary, unit):
+    """The four stats-panel cards (see _draw_export_stats_panel) for an
+    average_summary in `unit`."""
+    cards = [
+        export_average_card(title, summary['periods'][days], unit, summary['total_days'], days)
+        for title, _, days in AVERAGE_PERIODS
+    ]
+    selection = summary['selection']
+    if selection is None:
+        cards.append(selection_average_card(unit))
+    else:
+        cards.append(selection_average_card(
+            unit, selection['average'], selection['readings'],
+            mdates.num2date(selection['first']), mdates.num2date(selection['last']),
+        ))
+    return cards
+
+
+def month_page_bounds(timestamp_nums):
+    """Split the readings into calendar months, one per monthly report
+    page: a list of (label, month_start_num, next_month_start_num, lo,
+    hi) where readings lo..hi-1 fall in that month. Months with no
+    readings at all (a gap in logging) are left out."""
+    first = mdates.num2date(timestamp_nums[0])
+    last = mdates.num2date(timestamp_nums[-1])
+    last_month = datetime.datetime(last.year, last.month, 1)
+    # Every month's first day, through the one after the last month
+    month_starts = [datetime.datetime(first.year, first.month, 1)]
+    while month_starts[-1] <= last_month:
+        prev = month_starts[-1]
+        month_starts.append(datetime.datetime(prev.year + prev.month // 12, prev.month % 12 + 1, 1))
+    edges = mdates.date2num(month_starts)
+    idx = np.searchsorted(timestamp_nums, edges, side='left')
+    pages = []
+    for k in range(len(month_starts) - 1):
+        lo, hi = int(idx[k]), int(idx[k + 1])
+        if hi > lo:
+            pages.append((month_starts[k].strftime('%B %Y'), float(edges[k]), float(edges[k + 1]), lo, hi))
+    return pages
+
+
+def monthly_report_cards(timestamp_nums, levels, unit, pages, include=None):
+    """The four stats cards for every monthly report page at once: the
+    trailing 24-hour, 30-day and 1-year averages as of the month's last
+    reading (what the on-screen cards would have shown at the end of
+    that month), plus the month's own average. `include` optionally
+    masks readings out of every average (spike exclusion).
+
+    One prefix sum over the whole file and a vectorized binary search
+    per window length, so every page's numbers cost a handful of array
+    operations total rather than a pass over the data per page."""
+    sums, counts = level_prefix_sums(levels, include)
+    lo = np.array([page[3] for page in pages])
+    hi = np.array([page[4] for page in pages])
+    end_nums = timestamp_nums[hi - 1]
+    available_days = end_nums - timestamp_nums[0]
+
+    trailing = trailing_period_averages(timestamp_nums, sums, counts, hi, end_nums)
+    month_avgs = range_averages(sums, counts, lo, hi)
+
+    cards = []
+    for k, page in enumerate(pages):
+        end_label = strip_leading_hour_zero(mdates.num2date(end_nums[k]).strftime('%b %d, %Y %I:%M %p'))
+        page_cards = [
+            export_average_card(title, trailing[days][k], unit, available_days[k], days, detail=f"ending {end_label}")
+            for title, _, days in AVERAGE_PERIODS
+        ]
+        page_cards.append(export_average_card(
+            "MONTH AVERAGE", month_avgs[k], unit,
+            detail=f"{page[0]} ({int(hi[k] - lo[k])} readings)",
+        ))
+        cards.append(page_cards)
+    return cards, month_avgs
+
+
+def _draw_monthly_report_cover(pdf, size_inches, plot, pages, month_avgs):
+    """The summary cover page of a monthly report: the covered period,
+    overall average and peak, and a bar per month of its average,
+    colored by risk zone with the standard's thresholds drawn across."""
+    nums, levels, unit = plot['timestamp_nums'], plot['levels'], plot['unit']
+    thresholds, color_map, _, legend_title = get_authority_zones(plot['authority_key'], unit)
+    unit_text = format_unit_mathtext(unit)
+    fig = Figure(figsize=size_inches)
+    FigureCanvasAgg(fig)
+
+    peak = int(np.argmax(levels))
+    peak_label = strip_leading_hour_zero(mdates.num2date(nums[peak]).strftime('%b %d, %Y %I:%M %p'))
+    serial_number = plot['serial_number']
+    fig.text(0.5, 0.92, f"Monthly Radon Report ({serial_number})",
+             ha='center', fontsize=20, fontweight='bold')
+    fig.text(0.5, 0.86, f"{pages[0][0]} \u2013 {pages[-1][0]}  \u00b7  {len(levels)} readings  \u00b7  {legend_title}",
+             ha='center', fontsize=11, color='#555555')
+    fig.text(0.5, 0.81, f"Overall average {float(np.mean(levels)):.1f} {unit_text}  \u00b7  "
+                        f"Peak {float(levels[peak]):.1f} {unit_text} on {peak_label}",
+             ha='center', fontsize=11, color='#555555')
+
+    ax = fig.add_axes([0.08, 0.14, 0.88, 0.6])
+    heights = np.array([np.nan if avg is None else avg for avg in month_avgs])
+    ax.bar(np.arange(len(pages)), np.nan_to_num(heights),
+           color=zone_point_colors(np.nan_to_num(heights), color_map), edgecolor='#333333', linewidth=0.5)
+    for threshold in thresholds:
+        ax.axhline(y=threshold, color="#FFA500" if threshold == thresholds[0] else "red", linestyle='--', linewidth=1)
+    ax.set_xticks(np.arange(len(pages)))
+    ax.set_xticklabels([datetime.datetime.strptime(page[0], '%B %Y').strftime('%b\n%Y') for page in pages],
+                       fontsize=8 if len(pages) <= 24 else 6)
+    ax.set_xlim(-0.6, len(pages) - 0.4)
+    ax.set_ylabel(f'MONTHLY AVERAGE ({unit_text})', fontsize=10, fontweight='bold')
+    ax.grid(True, axis='y')
+    ax.set_axisbelow(True)
+    pdf.savefig(fig, facecolor='white')
+
+
+def render_monthly_report(snapshot, path):
+    """Write a multi-page PDF with a summary cover page followed by one
+    page per calendar month, each drawn like a normal export (trace,
+    zone coloring, edge bars) at that month's range, with the stats
+    panel's four cards scoped to that month (see monthly_report_cards).
+    `snapshot` is MainWindow._monthly_report_snapshot. Returns
+    {'seconds', 'bytes'} like render_report.
+
+    A single _OffscreenReportFigure is redrawn for every page and each
+    page is streamed into PdfPages as soon as it's drawn, so memory
+    stays flat however many months the file spans. Each page plots only
+    its own month's readings (plus one on either side, so the line runs
+    off the page edges instead of stopping short) — a vector page still
+    contains every path handed to it, even ones clipped out of view.
+
+    Writing into one PDF is inherently sequential, so the parallel part
+    is page preparation: slicing each month out and splitting its line
+    into zone-colored segments runs on a small thread pool a few pages
+    ahead of the page being drawn (bounded, so prepared pages can't pile
+    up in memory if drawing falls behind)."""
+    # Imported here rather than at module level: the PDF backend is
+    # only needed for PDF reports, and loading it up front added a
+    # tenth of a second to every app launch and worker start
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    started = time.perf_counter()
+    plot = snapshot['plot']
+    nums, levels = plot['timestamp_nums'], plot['levels']
+    flagged = plot.get('flagged')
+    serial_number = plot['serial_number']
+    thresholds, color_map = get_authority_zones(plot['authority_key'], plot['unit'])[:2]
+    pages = month_page_bounds(nums)
+    cards, month_avgs = monthly_report_cards(nums, levels, plot['unit'], pages, snapshot.get('include'))
+    layout = snapshot_page_layout(snapshot)
+
+    def prepare(k):
+        label, _, _, lo, hi = pages[k]
+        lo, hi = max(lo - 1, 0), min(hi + 1, len(nums))
+        page_nums, page_levels = nums[lo:hi], levels[lo:hi]
+        segments, colors = merge_zone_runs(*segment_by_zones(page_nums, page_levels, thresholds, color_map))
+        return dict(
+            plot,
+            timestamp_nums=page_nums,
+            levels=page_levels,
+            zone_data=(segments, colors, zone_point_colors(page_levels, color_map)),
+            flagged=None if flagged is None else flagged[lo:hi],
+        )
+
+    report_fig = _OffscreenReportFigure(layout, snapshot['dpi'])
+    lookahead = max(2, (os.cpu_count() or 2))
+    with matplotlib.rc_context(REPORT_RC_PARAMS), PdfPages(path) as pdf, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=lookahead) as pool:
+        _draw_monthly_report_cover(pdf, layout.size_inches, plot, pages, month_avgs)
+        pending = collections.deque()
+
+        def draw_next():
+            k, future = pending.popleft()
+            label, start_num, end_num, lo, hi = pages[k]
+            report_fig.draw_page(
+                future.result(), (start_num, end_num), snapshot['ylim'], cards[k],
+                data_range=(nums[lo], nums[hi - 1]),
+                title=f"Radon Levels, {label} ({serial_number})",
+                keep_layout=True,
+            )
+            pdf.savefig(report_fig.figure, facecolor='white')
+
+        for k in range(len(pages)):
+            pending.append((k, pool.submit(prepare, k)))
+            if len(pending) > lookahead:
+                draw_next()
+        while pending:
+            draw_next()
+    return {'seconds': time.perf_counter() - started, 'bytes': os.path.getsize(path)}
+
+
+# Points per device sparkline in the fleet report (the last year of
+# daily means, averaged down to this many)
+FLEET_SPARKLINE_POINTS = 120
+FLEET_TABLE_ROWS_PER_PAGE = 28
+FLEET_SPARKLINE_GRID = (8, 6)  # rows, columns per page
+# Devices are ranked, and tinted by risk zone, on the longest
+# AVERAGE_PERIODS average (1 year)
+FLEET_RANK_DAYS = AVERAGE_PERIODS[-1][2]
+
+
+def fleet_thresholds_bq():
+    """Every distinct threshold across AUTHORITIES, in Bq/m3, ascending —
+    the fleet report gives the percent of time above each one."""
+    return sorted({float(info[key]) for info in AUTHORITIES.values() for key in ('low_bq', 'high_bq')})
+
+
+def summarize_device_file(path, unit):
+    """Fleet-report statistics for one export file, in `unit`: the
+    AVERAGE_PERIODS trailing averages as of its last reading ('averages',
+    {days: average}, as average_summary's 'periods'), the peak and
+    when it happened, the percent of readings above each
+    fleet_thresholds_bq() level, and a short sparkline of daily means.
+
+    All vectorized — one cumulative sum for the averages and one sort
+    plus a searchsorted for every threshold at once. Runs in a worker
+    process (see collect_fleet_summaries), so it never raises: a file
+    that can't be used comes back with just 'path', 'serial_number' and
+    'error' set, rather than sinking the whole report."""
+    row = {'path': path, 'serial_number': serial_from_filename(path), 'error': None}
+    try:
+        end_datetime = end_datetime_from_filename(path) or default_end_datetime(path)
+        data = parse_rd200_file(path, end_datetime, with_datetimes=False, verbose=False)
+    except Exception as exc:
+        row['error'] = str(exc) or type(exc).__name__
+        return row
+
+    nums = data['timestamp_nums']
+    levels = data['radon_levels'] * unit_scale(data['unit'], unit)
+    n = len(levels)
+    sums, counts = level_prefix_sums(levels)
+    row['averages'] = trailing_period_averages(nums, sums, counts, n, nums[-1])
+
+    peak = int(np.argmax(levels))
+    thresholds = np.array(fleet_thresholds_bq()) * unit_scale("Bq/m3", unit)
+    above = n - np.searchsorted(np.sort(levels), thresholds, side='right')
+
+    # Sparkline: the last year of daily means, averaged in equal blocks
+    # down to at most FLEET_SPARKLINE_POINTS (ignoring empty days)
+    daily = compute_daily_means(nums, levels)[1][-365:]
+    block = -(-len(daily) // FLEET_SPARKLINE_POINTS)
+    blocks = daily[len(daily) % block:].reshape(-1, block)
+    counts = np.count_nonzero(~np.isnan(blocks), axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sparkline = np.where(counts > 0, np.nansum(blocks, axis=1) / counts, np.nan)
+
+    row.update(
+        readings=n,
+        first=mdates.num2date(nums[0]).strftime('%Y-%m-%d %H:%M'),
+        last=mdates.num2date(nums[-1]).strftime('%Y-%m-%d %H:%M'),
+        last_num=float(nums[-1]),
+        peak=float(levels[peak]),
+        peak_time=mdates.num2date(nums[peak]).strftime('%Y-%m-%d %H:%M'),
+        pct_above=[float(v) for v in 100.0 * above / n],
+        sparkline=sparkline,
+    )
+    return row
+
+
+def collect_fleet_summaries(paths, unit, max_workers=None):
+    """summarize_device_file for every path, spread over a process pool
+    (parsing is pure Python, so threads wouldn't help). Results come
+    back in the same order as `paths`."""
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(functools.partial(summarize_device_file, unit=unit), paths, chunksize=chunksize))
+
+
+def latest_per_serial(rows):
+    """Keep one row per serial number — the export whose last reading is
+    the most recent, since a newer export of the same device covers the
+    older one. Returns (kept_rows, number_superseded)."""
+    latest = {}
+    for row in rows:
+        current = latest.get(row['serial_number'])
+        if current is None or row['last_num'] > current['last_num']:
+            latest[row['serial_number']] = row
+    return list(latest.values()), len(rows) - len(latest)
+
+
+def _fleet_threshold_labels(unit):
+    scale = unit_scale("Bq/m3", unit)
+    digits = 1 if unit == "pCi/L" else 0
+    return [f"{value * scale:.{digits}f}" for value in fleet_thresholds_bq()]
+
+
+def write_fleet_csv(rows, path, unit):
+    """The fleet summary as CSV, one row per device (plus any files that
+    couldn't be read, with only their path and error filled in)."""
+    threshold_labels = _fleet_threshold_labels(unit)
+    header = (
+        ["Serial", "Readings", "First Reading", "Last Reading",
+         *(f"{short} Avg ({unit})" for _, short, _ in AVERAGE_PERIODS), f"Peak ({unit})", "Peak Time"]
+        + [f"% of Time > {label} {unit}" for label in threshold_labels]
+        + ["File", "Error"]
+    )
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            if row['error']:
+                writer.writerow([row['serial_number']] + [''] * (len(header) - 3) + [row['path'], row['error']])
+                continue
+            writer.writerow(
+                [row['serial_number'], row['readings'], row['first'], row['last'],
+                 *(f"{row['averages'][days]:.1f}" for _, _, days in AVERAGE_PERIODS),
+                 f"{row['peak']:.1f}", row['peak_time']]
+                + [f"{pct:.1f}" for pct in row['pct_above']]
+                + [row['path'], '']
+            )
+
+
+def _draw_fleet_table_pages(pdf, fig, rows, unit, authority_key, heading, footer):
+    """The fleet summary table, FLEET_TABLE_ROWS_PER_PAGE devices per
+    page, redrawn into the one `fig` for every page. Each device's
+    FLEET_RANK_DAYS average cell is tinted with its risk-zone color."""
+    color_map = get_authority_zones(authority_key, unit)[1]
+    columns = (
+        ["Serial", "Last Reading", *(f"{short} Avg" for _, short, _ in AVERAGE_PERIODS), "Peak", "Peak Time"]
+        + [f"% > {label}" for label in _fleet_threshold_labels(unit)]
+    )
+    period_days = [days for _, _, days in AVERAGE_PERIODS]
+    rank_column = 2 + period_days.index(FLEET_RANK_DAYS)
+    rank_title = next(title for title, _, days in AVERAGE_PERIODS if days == FLEET_RANK_DAYS)
+    pages = max(1, -(-len(rows) // FLEET_TABLE_ROWS_PER_PAGE))
+    for page in range(pages):
+        chunk = rows[page * FLEET_TABLE_ROWS_PER_PAGE:(page + 1) * FLEET_TABLE_ROWS_PER_PAGE]
+        fig.clear()
+        fig.text(0.5, 0.95, heading, ha='center', fontsize=15, fontweight='bold')
+        fig.text(0.5, 0.915, f"Averages and peak in {format_unit_mathtext(unit)}; "
+                             f"thresholds in {format_unit_mathtext(unit)}. Sorted by {rank_title.lower()}.  "
+                             f"Page {page + 1} of {pages}",
+                 ha='center', fontsize=9, color='#555555')
+        if footer:
+            fig.text(0.5, 0.02, footer, ha='center', fontsize=8, color='#888888')
+        ax = fig.add_axes([0.03, 0.06, 0.94, 0.83])
+        ax.axis('off')
+        if not chunk:
+            continue
+        cell_text = [
+            [row['serial_number'], row['last'], *(f"{row['averages'][days]:.1f}" for days in period_days),
+             f"{row['peak']:.1f}", row['peak_time']]
+            + [f"{pct:.1f}" for pct in row['pct_above']]
+            for row in chunk
+        ]
+        # Date/time and serial columns need room for their full text;
+        # the numeric ones split what's left evenly
+        wide = {0: 0.09, 1: 0.115, 3 + len(period_days): 0.115}
+        narrow = (1.0 - sum(wide.values())) / (len(columns) - len(wide))
+        col_widths = [wide.get(c, narrow) for c in range(len(columns))]
+        table = ax.table(cellText=cell_text, colLabels=columns, colWidths=col_widths,
+                         loc='upper center', cellLoc='center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(7.5)
+        table.scale(1, 1.35)
+        for (r, c), cell in table.get_celld().items():
+            cell.set_edgecolor('#BBBBBB')
+            if r == 0:
+                cell.set_text_props(fontweight='bold')
+                cell.set_facecolor('#EEEEEE')
+        zone_colors = zone_point_colors(np.array([row['averages'][FLEET_RANK_DAYS] for row in chunk]), color_map)
+        for r, color in enumerate(zone_colors, start=1):
+            table[r, rank_column].set_facecolor((*mcolors.to_rgb(color), 0.35))
+        pdf.savefig(fig, facecolor='white')
+
+
+def _draw_fleet_sparkline_pages(pdf, fig, rows, unit, authority_key):
+    """Small-multiple sparklines of each device's last year of daily
+    means, FLEET_SPARKLINE_GRID to a page. The grid of axes is built once
+    and every page just swaps each cell's data in, rather than creating
+    a fresh set of axes per page."""
+    thresholds, color_map = get_authority_zones(authority_key, unit)[:2]
+    digits = 1 if unit == "pCi/L" else 0
+    n_rows, n_cols = FLEET_SPARKLINE_GRID
+    per_page = n_rows * n_cols
+    fig.clear()
+    fig.text(0.5, 0.965, f"Last 12 Months of Daily Averages ({format_unit_mathtext(unit)})",
+             ha='center', fontsize=13, fontweight='bold')
+    cells = []
+    for k in range(per_page):
+        ax = fig.add_subplot(n_rows, n_cols, k + 1)
+        ax.set_xticks([])
+        ax.tick_params(axis='y', labelsize=5, length=2, pad=1)
+        for threshold in thresholds:
+            ax.axhline(threshold, color="#FFA500" if threshold == thresholds[0] else "red",
+                       linestyle='--', linewidth=0.5)
+        line, = ax.plot([], [], linewidth=0.8)
+        cells.append((ax, line))
+    fig.subplots_adjust(left=0.04, right=0.99, top=0.93, bottom=0.02, hspace=0.55, wspace=0.25)
+
+    zone_colors = zone_point_colors(np.array([row['averages'][FLEET_RANK_DAYS] for row in rows]), color_map) if rows else []
+    for start in range(0, len(rows), per_page):
+        for k, (ax, line) in enumerate(cells):
+            index = start + k
+            if index >= len(rows):
+                ax.set_visible(False)
+                continue
+            row = rows[index]
+            values = row['sparkline']
+            ax.set_visible(True)
+            line.set_data(np.arange(len(values)), values)
+            line.set_color(zone_colors[index])
+            ax.set_xlim(0, max(len(values) - 1, 1))
+            top = np.nanmax(values) if np.isfinite(values).any() else 0.0
+            ax.set_ylim(0, max(top, thresholds[-1]) * 1.1)
+            ax.set_title(f"{row['serial_number']}  ({row['averages'][FLEET_RANK_DAYS]:.{digits}f})", fontsize=6.5, pad=2)
+        pdf.savefig(fig, facecolor='white')
+
+
+def render_fleet_report(paths, pdf_path, csv_path, unit, authority_key):
+    """Fleet summary across many devices' exports: per-device stats (see
+    summarize_device_file) computed in parallel, one row per serial
+    number (the newest export wins), sorted by their FLEET_RANK_DAYS
+    average. Writes `csv_path` and a PDF at `pdf_path` with the summary
+    table followed by small-multiple sparklines. Returns {'seconds', 'bytes', 'note'}.
+
+    Each page is streamed into PdfPages as it's drawn, reusing one
+    figure throughout, so a thousand-device report doesn't hold hundreds
+    of pages' worth of artists in memory."""
+    started = time.perf_counter()
+    results = collect_fleet_summaries(paths, unit)
+    failed = [row for row in results if row['error']]
+    rows, superseded = latest_per_serial([row for row in results if not row['error']])
+    if not rows:
+        raise ValueError("None of the selected files could be read.")
+    rows.sort(key=lambda row: row['averages'][FLEET_RANK_DAYS], reverse=True)
+    write_fleet_csv(rows + failed, csv_path, unit)
+
+    notes = [f"{len(rows)} devices from {len(paths)} files"]
+    if superseded:
+        notes.append(f"{superseded} older exports superseded by newer ones")
+    if failed:
+        notes.append(f"{len(failed)} unreadable files skipped (listed in the CSV)")
+    heading = f"Fleet Radon Summary ({AUTHORITIES[authority_key]['name']})"
+
+    from matplotlib.backends.backend_pdf import PdfPages  # deferred, as in render_monthly_report
+
+    fig = Figure(figsize=(11, 8.5))
+    FigureCanvasAgg(fig)
+    with matplotlib.rc_context(REPORT_RC_PARAMS), PdfPages(pdf_path) as pdf:
+        _draw_fleet_table_pages(pdf, fig, rows, unit, authority_key, heading, "; ".join(notes))
+        _draw_fleet_sparkline_pages(pdf, fig, rows, unit, authority_key)
+    return {'seconds': time.perf_counter() - started, 'bytes': os.path.getsize(pdf_path), 'note': "; ".join(notes)}
+
+
+# Data export (see write_data_export): what each resolution groups
+# readings by, as a numpy datetime64 unit code (None = raw readings)
+DATA_EXPORT_RESOLUTIONS = {
+    'raw': None,
+    'hourly': 'h',
+    'daily': 'D',
+    'monthly': 'M',
+}
+DATA_EXPORT_CHUNK_ROWS = 100_000
+
+
+def parquet_available():
+    """Whether the optional pyarrow package is installed, which Parquet
+    data export needs (CSV export works without it)."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def timestamp_nums_to_datetime64(timestamp_nums):
+    """matplotlib date numbers as numpy datetime64[s] values, rounded to
+    the second (readings never carry sub-second times)."""
+    epoch = np.datetime64(mdates.get_epoch(), 's')
+    seconds = np.round(np.asarray(timestamp_nums, dtype=float) * 86400).astype(np.int64)
+    return epoch + seconds.astype('timedelta64[s]')
+
+
+def aggregate_readings(timestamp_nums, levels, resolution):
+    """Group readings into calendar hours, days or months (`resolution`
+    as in DATA_EXPORT_RESOLUTIONS) and return (period_starts, mean, min,
+    max, count), one entry per period that has readings. Readings are
+    in time order, so each period is one contiguous run: its boundaries
+    are where the truncated datetime64 changes, and every statistic is a
+    single ufunc.reduceat over those runs."""
+    periods = timestamp_nums_to_datetime64(timestamp_nums).astype(f'datetime64[{DATA_EXPORT_RESOLUTIONS[resolution]}]')
+    levels = np.asarray(levels, dtype=float)
+    if len(levels) == 0:
+        empty = np.zeros(0)
+        return periods.astype('datetime64[s]'), empty, empty, empty, np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    counts = np.diff(np.r_[starts, len(levels)])
+    return (
+        periods[starts].astype('datetime64[s]'),
+        np.add.reduceat(levels, starts) / counts,
+        np.minimum.reduceat(levels, starts),
+        np.maximum.reduceat(levels, starts),
+        counts,
+    )
+
+
+def data_export_columns(resolution, unit):
+    """(key, header) for each column of a data export."""
+    if resolution == 'raw':
+        return [('timestamp', 'Timestamp'), ('value', f'Radon ({unit})')]
+    return [
+        ('timestamp', 'Period Start'),
+        ('mean', f'Mean ({unit})'),
+        ('min', f'Min ({unit})'),
+        ('max', f'Max ({unit})'),
+        ('count', 'Readings'),
+    ]
+
+
+def iter_data_export_chunks(timestamp_nums, levels, resolution, chunk_rows=DATA_EXPORT_CHUNK_ROWS):
+    """Yield the export's rows as dicts of column arrays (keyed as in
+    data_export_columns), at most `chunk_rows` rows each. Raw readings
+    are converted a chunk at a time, so only one chunk's timestamps
+    exist at once however long the file is; aggregates are computed in
+    one pass (there are far fewer of them) and then handed out in
+    chunks the same way."""
+    if resolution == 'raw':
+        for start in range(0, len(levels), chunk_rows):
+            stop = start + chunk_rows
+            yield {
+                'timestamp': timestamp_nums_to_datetime64(timestamp_nums[start:stop]),
+                'value': np.asarray(levels[start:stop], dtype=float),
+            }
+        return
+    period_starts, mean, low, high, count = aggregate_readings(timestamp_nums, levels, resolution)
+    for start in range(0, len(count), chunk_rows):
+        stop = start + chunk_rows
+        yield {
+            'timestamp': period_starts[start:stop],
+            'mean': mean[start:stop],
+            'min': low[start:stop],
+            'max': high[start:stop],
+            'count': count[start:stop],
+        }
+
+
+def _write_data_export_csv(chunks, path, columns, decimals):
+    # Nothing in these columns ever needs CSV quoting, so each chunk is
+    # formatted with one str.format per row over plain Python values —
+    # several times faster than csv.writer over numpy scalars
+    fields = {'timestamp': '{}', 'count': '{}'}
+    row_format = ','.join(fields.get(key, f'{{:.{decimals}f}}') for key, _ in columns) + '\n'
+    row_count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f, lineterminator='\n').writerow([header for _, header in columns])
+        for chunk in chunks:
+            values = []
+            for key, _ in columns:
+                if key == 'timestamp':
+                    values.append(np.char.replace(np.datetime_as_string(chunk[key], unit='s'), 'T', ' ').tolist())
+                else:
+                    values.append(chunk[key].tolist())
+            f.write(''.join(map(row_format.format, *values)))
+            row_count += len(chunk['timestamp'])
+    return row_count
+
+
+def _write_data_export_parquet(chunks, path, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    row_count = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            # One row group per chunk, written as it's produced
+            table = pa.table({header: chunk[key] for key, header in columns})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            row_count += table.num_rows
+        if writer is None:
+            # No rows at all — still write a valid, empty file
+            pq.write_table(pa.table({header: [] for _, header in columns}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return row_count
+
+
+def write_data_export(snapshot, path, fmt):
+    """Write readings or aggregates (see MainWindow._data_export_snapshot)
+    to `path` as 'csv' or 'parquet' (the latter needs pyarrow), streaming
+    DATA_EXPORT_CHUNK_ROWS rows at a time so a multi-million-row export
+    never holds its whole output in memory. Values are in the snapshot's
+    unit. Returns {'seconds', 'bytes', 'note'}."""
+    started = time.perf_counter()
+    lo, hi = snapshot['range']
+    unit, resolution = snapshot['unit'], snapshot['resolution']
+    columns = data_export_columns(resolution, unit)
+    chunks = iter_data_export_chunks(snapshot['timestamp_nums'][lo:hi], snapshot['levels'][lo:hi], resolution)
+    if fmt == 'parquet':
+        row_count = _write_data_export_parquet(chunks, path, columns)
+    else:
+        row_count = _write_data_export_csv(chunks, path, columns, decimals=2 if unit == "pCi/L" else 1)
+    return {'seconds': time.perf_counter() - started, 'bytes': os.path.getsize(path), 'note': f"{row_count} rows"}
@@ -64,6 +64,15 @@ excludes = [
     "tkinter",
 ]
 
+# radon_window.py (the Qt app) and radon_core.py (the Qt-free
+# parsing/rendering core) need no entries of their own: radon_plot.py,
+# the launcher, imports radon_window with a plain import statement
+# (inside a function, so it can load in the background while the file
+# dialog is up — PyInstaller still sees it), which imports radon_core,
+# so the analysis below follows both and bundles them automatically.
+# The export worker processes import radon_core too —
+# multiprocessing.freeze_support() in radon_plot's __main__ block is
+# what lets them start inside the frozen app.
 a = Analysis(
     ["radon_plot.py"],
     pathex=[],
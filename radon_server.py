@@ -0,0 +1,525 @@
+"""A small local HTTP service exposing RD200 exports' stats and charts,
+for dashboards and other tools that want the numbers or an image
+without running the desktop app:
+
+    python radon_server.py EXPORT.csv [EXPORT.csv ...] [--port 8200]
+
+Endpoints (all GET):
+
+    /datasets                      every loaded export: id, serial, unit,
+                                   reading count, first/last reading
+    /datasets/<id>/stats           JSON averages — the same numbers the
+                                   app's stats panel shows
+    /datasets/<id>/chart.png       the chart plus stats panel, as the app
+    /datasets/<id>/chart.svg       exports it (see radon_core.render_report)
+    /datasets/<id>/tiles/<zoom>    JSON list of the time-range tiles at a
+                                   zoom level (see radon_core.TileSet)
+    /datasets/<id>/tiles/<zoom>/<index>.png
+                                   one tile, from the on-disk tile cache
+
+<id> is the device serial from the filename. Both stats and charts
+accept start/end (ISO date or date-time; the chart's view range, and the
+"selected range" the stats cover), unit (Bq/m3 or pCi/L), and
+exclude_spikes=1; charts also take authority, width/height (inches),
+dpi, page (letter/a4, instead of width/height) and spikes=1 to mark
+flagged readings. Tiles take unit and authority.
+
+Everything here is built on radon_core, so there's no Qt involved.
+Requests are handled on a fixed-size thread pool. Parsed files are kept
+in memory (re-read only if the file on disk changes), and rendered
+charts in a RenderCache keyed by content, so repeat requests skip both
+parsing and rendering. Rendering itself runs in a process pool rather
+than on the request threads: matplotlib's text layout isn't safe to use
+from several threads at once (see render_report)."""
+import argparse
+import concurrent.futures
+import datetime
+import http.server
+import json
+import multiprocessing
+import os
+import threading
+import traceback
+import urllib.parse
+
+import matplotlib.dates as mdates
+
+from radon_core import (
+    AUTHORITIES, average_summary, dataset_digest, default_end_datetime, end_datetime_from_filename,
+    get_authority_zones, merge_zone_runs, normalize_unit, parse_rd200_file, render_report_bytes,
+    RenderCache, report_cache_key, REPORT_PAGE_SIZES, segment_by_zones, serial_from_filename,
+    SpikeDetector, summary_cards, TILE_ZOOM_DAYS, tile_bounds, TileCache, TileSet, render_tile,
+    unit_scale, zone_point_colors,
+)
+
+DEFAULT_PORT = 8200
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+# Chart size when none is requested — the app's default window's plot
+CHART_DEFAULT_SIZE_INCHES = (12.0, 6.5)
+CHART_DEFAULT_DPI = 100
+CHART_MAX_PIXELS = 40_000_000  # refuse absurd width x height x dpi requests
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TILE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'radon_plot', 'tiles')
+
+
+class RequestError(Exception):
+    """A bad request: carries the HTTP status to answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DatasetStore:
+    """The exports the server was started with, parsed on first use and
+    kept in memory. Each file's size and modification time are checked
+    on every lookup, and a file that changed on disk (e.g. a fresh
+    export saved over the old one) is parsed again — along with
+    everything cached from it, since its digest changes too."""
+
+    def __init__(self, paths):
+        self.paths = {}
+        for path in paths:
+            self.paths.setdefault(serial_from_filename(path) or os.path.basename(path), path)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def ids(self):
+        return sorted(self.paths)
+
+    def get(self, dataset_id):
+        path = self.paths.get(dataset_id)
+        if path is None:
+            raise RequestError(404, f"No dataset {dataset_id!r}")
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            raise RequestError(404, f"Can't read {os.path.basename(path)}: {exc}")
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            dataset = self._loaded.get(dataset_id)
+            if dataset is not None and dataset['signature'] == signature:
+                return dataset
+        # Parsed outside the lock, so one slow file doesn't hold up
+        # requests for the others; at worst two threads parse the same
+        # file at once and the second result wins
+        dataset = self._parse(path, signature)
+        with self._lock:
+            self._loaded[dataset_id] = dataset
+        return dataset
+
+    @staticmethod
+    def _parse(path, signature):
+        end_datetime = end_datetime_from_filename(path) or default_end_datetime(path)
+        try:
+            data = parse_rd200_file(path, end_datetime, with_datetimes=False, verbose=False)
+        except Exception as exc:
+            raise RequestError(500, f"Can't parse {os.path.basename(path)}: {exc}")
+        levels = data['radon_levels']
+        levels.setflags(write=False)
+        return {
+            'path': path,
+            'signature': signature,
+            'serial_number': data['serial_number'],
+            'unit': data['unit'],
+            'interval': data['interval'],
+            'timeline': data['timeline'],
+            'timestamp_nums': data['timestamp_nums'],
+            'levels': levels,
+            'digest': dataset_digest(data['timestamp_nums'], levels),
+            'lock': threading.Lock(),
+            'flags': None,
+        }
+
+    @staticmethod
+    def spike_flags(dataset):
+        """The dataset's spike/dropout flags with the app's default
+        settings, detected once on first use."""
+        with dataset['lock']:
+            if dataset['flags'] is None:
+                window = SpikeDetector.window_readings_for(SpikeDetector.DEFAULT_WINDOW_HOURS, dataset['interval'])
+                dataset['flags'] = SpikeDetector(dataset['levels'], window, SpikeDetector.DEFAULT_THRESHOLD_MADS).flags
+            return dataset['flags']
+
+
+def _query_datetime_num(query, name):
+    value = query.get(name)
+    if not value:
+        return None
+    try:
+        return mdates.date2num(datetime.datetime.fromisoformat(value))
+    except ValueError:
+        raise RequestError(400, f"{name} must be an ISO date or date-time, not {value!r}")
+
+
+def _query_float(query, name, default, low, high):
+    value = query.get(name)
+    if not value:
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    if number is None or not low <= number <= high:
+        raise RequestError(400, f"{name} must be a number from {low} to {high}")
+    return number
+
+
+def _query_unit(query, dataset):
+    unit = query.get('unit')
+    if not unit:
+        return dataset['unit']
+    unit = normalize_unit(unit)
+    if unit not in ("Bq/m3", "pCi/L"):
+        raise RequestError(400, "unit must be Bq/m3 or pCi/L")
+    return unit
+
+
+def _query_range(query, timeline):
+    """(lo, hi) index range of the readings between the start/end
+    parameters, or None if neither was given."""
+    start, end = _query_datetime_num(query, 'start'), _query_datetime_num(query, 'end')
+    if start is None and end is None:
+        return None
+    lo = 0 if start is None else timeline.searchsorted(start, side='left')
+    hi = len(timeline) if end is None else timeline.searchsorted(end, side='right')
+    if hi <= lo:
+        raise RequestError(400, "No readings between start and end")
+    return lo, hi
+
+
+def dataset_stats(store, dataset_id, query):
+    """The /stats response: average_summary's numbers plus the four
+    stats-panel cards, for the dataset in the requested unit."""
+    dataset = store.get(dataset_id)
+    unit = _query_unit(query, dataset)
+    nums = dataset['timestamp_nums']
+    levels = dataset['levels'] * unit_scale(dataset['unit'], unit)
+    include = ~store.spike_flags(dataset) if query.get('exclude_spikes') == '1' else None
+    selection = _query_range(query, dataset['timeline'])
+    summary = average_summary(nums, levels, selection, include)
+
+    def iso(num):
+        return mdates.num2date(num).replace(tzinfo=None).isoformat(timespec='minutes')
+
+    selected = summary['selection']
+    return {
+        'dataset': dataset_id,
+        'serial_number': dataset['serial_number'],
+        'unit': unit,
+        'readings': len(nums),
+        'first': iso(nums[0]),
+        'last': iso(nums[-1]),
+        'spikes_excluded': include is not None,
+        'averages': {f"{days}d": avg for days, avg in summary['periods'].items()},
+        'days_available': summary['total_days'],
+        'selection': None if selected is None else {
+            'first': iso(selected['first']),
+            'last': iso(selected['last']),
+            'readings': selected['readings'],
+            'average': selected['average'],
+        },
+        'cards': summary_cards(summary, unit),
+    }
+
+
+def chart_snapshot(store, dataset_id, query):
+    """A render_report snapshot for a chart request. Only the readings
+    in the requested range (plus one either side, so the line runs off
+    the edges) are handed to the renderer — a vector chart would
+    otherwise still write out every path of the whole file. The y-axis
+    fits the readings in range, like the app's "Autoscale Y to Visible
+    Range". Returns (snapshot, dataset digest)."""
+    dataset = store.get(dataset_id)
+    unit = _query_unit(query, dataset)
+    authority_key = query.get('authority', 'who')
+    if authority_key not in AUTHORITIES:
+        raise RequestError(400, f"Unknown authority {authority_key!r}; one of {', '.join(sorted(AUTHORITIES))}")
+    nums = dataset['timestamp_nums']
+    levels = dataset['levels'] * unit_scale(dataset['unit'], unit)
+    view = _query_range(query, dataset['timeline']) or (0, len(nums))
+    flags = store.spike_flags(dataset) if query.get('spikes') == '1' or query.get('exclude_spikes') == '1' else None
+    include = ~flags if query.get('exclude_spikes') == '1' else None
+
+    page_size = query.get('page')
+    if page_size is not None and page_size not in REPORT_PAGE_SIZES:
+        raise RequestError(400, f"page must be one of {', '.join(REPORT_PAGE_SIZES)}")
+    width_in = _query_float(query, 'width', CHART_DEFAULT_SIZE_INCHES[0], 2.0, 60.0)
+    height_in = _query_float(query, 'height', CHART_DEFAULT_SIZE_INCHES[1], 2.0, 60.0)
+    dpi = _query_float(query, 'dpi', CHART_DEFAULT_DPI, 20, 600)
+    if width_in * height_in * dpi * dpi > CHART_MAX_PIXELS:
+        raise RequestError(400, "Requested chart is too large")
+
+    lo, hi = max(view[0] - 1, 0), min(view[1] + 1, len(nums))
+    page_nums, page_levels = nums[lo:hi], levels[lo:hi]
+    thresholds, color_map = get_authority_zones(authority_key, unit)[:2]
+    segments, colors = merge_zone_runs(*segment_by_zones(page_nums, page_levels, thresholds, color_map))
+    # The chart's view is the range asked for, not the reading either
+    # side of it, unless no range was given at all
+    first, last = nums[view[0]], nums[view[1] - 1]
+    if last <= first:
+        first, last = first - 0.5, last + 0.5
+    snapshot = {
+        'plot': {
+            'timestamp_nums': page_nums,
+            'levels': page_levels,
+            'unit': unit,
+            'authority_key': authority_key,
+            'serial_number': dataset['serial_number'],
+            'zone_data': (segments, colors, zone_point_colors(page_levels, color_map)),
+            'flagged': flags[lo:hi] if query.get('spikes') == '1' else None,
+        },
+        'xlim': (float(first), float(last)),
+        'ylim': None,
+        'selection': None,
+        'cards': summary_cards(average_summary(nums, levels, view, include), unit),
+        'size_inches': (width_in, height_in),
+        'page_size': page_size,
+        'dpi': dpi,
+    }
+    return snapshot, dataset['digest']
+
+
+class RadonHTTPServer(http.server.HTTPServer):
+    """HTTPServer that hands each connection to a fixed thread pool
+    (rather than a new thread per request, like ThreadingHTTPServer), and
+    holds the shared caches and the render process pool."""
+
+    def __init__(self, address, store, request_workers=8, render_workers=None,
+                 render_cache_bytes=RENDER_CACHE_MAX_BYTES, tile_cache_dir=None):
+        super().__init__(address, RadonRequestHandler)
+        self.store = store
+        self.render_cache = RenderCache(render_cache_bytes)
+        self._request_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=request_workers, thread_name_prefix='radon-http'
+        )
+        self._render_pool = concurrent.futures.ProcessPoolExecutor(max_workers=render_workers or os.cpu_count() or 1)
+        # Renders in progress by cache key, so identical requests that
+        # arrive together wait on one render instead of each starting
+        # their own
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self.tile_cache = TileCache(tile_cache_dir or DEFAULT_TILE_CACHE_DIR)
+        self._tile_sets = {}
+        self._tiles_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        self._request_pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def _render_once(self, key, render, job, store):
+        """render(job) in the process pool, with identical renders that
+        are already running shared rather than started again; store(result)
+        caches the result before the in-flight entry goes, so a request
+        arriving in between finds one or the other."""
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._render_pool.submit(render, *job)
+                self._in_flight[key] = future
+        try:
+            result = future.result()
+            store(result)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+        return result
+
+    def render_chart(self, snapshot, digest, fmt):
+        """Chart bytes for `snapshot`: from the render cache if this
+        exact chart was rendered before, else rendered in the process
+        pool and cached."""
+        key = report_cache_key(snapshot, digest, fmt)
+        cached = self.render_cache.get(key)
+        if cached is not None:
+            return cached[0]
+        data, _ = self._render_once(key, render_report_bytes, (snapshot, fmt),
+                                    lambda rendered: self.render_cache.put(key, *rendered))
+        return data
+
+    def tile_set(self, dataset_id, unit, authority_key):
+        """The TileSet for a dataset at a unit and standard, brought up to
+        date with the file on disk: a re-exported file with readings
+        added only drops the tiles the new readings reach (see
+        TileSet.extend)."""
+        dataset = self.store.get(dataset_id)
+        levels = dataset['levels'] * unit_scale(dataset['unit'], unit)
+        with self._tiles_lock:
+            entry = self._tile_sets.get((dataset_id, unit, authority_key))
+            if entry is None:
+                tile_set = TileSet(dataset['timestamp_nums'], levels, unit, authority_key, self.tile_cache)
+            else:
+                tile_set, digest = entry
+                if digest != dataset['digest']:
+                    tile_set.extend(dataset['timestamp_nums'], levels)
+            self._tile_sets[(dataset_id, unit, authority_key)] = (tile_set, dataset['digest'])
+        return tile_set
+
+    def render_tile(self, tile_set, zoom, index):
+        """A tile's image bytes, from the on-disk tile cache or rendered
+        in the process pool and added to it."""
+        with self._tiles_lock:
+            key = tile_set.key(zoom, index)
+            job = tile_set.job(zoom, index)
+        data = self.tile_cache.get(key, tile_set.fmt)
+        if data is None:
+            data = self._render_once(key, render_tile, (job,), lambda image: self.tile_cache.put(key, tile_set.fmt, image))
+        return data
+
+    def pregenerate_tiles(self, unit=None, authority_key='who'):
+        """Render every tile of every dataset, at every zoom level, that
+        isn't cached yet — for a kiosk that should never wait on one."""
+        rendered = 0
+        for dataset_id in self.store.ids():
+            try:
+                dataset = self.store.get(dataset_id)
+            except RequestError:
+                continue
+            tile_set = self.tile_set(dataset_id, unit or dataset['unit'], authority_key)
+            tiles = [tile for zoom in range(len(TILE_ZOOM_DAYS)) for tile in tile_set.tiles_covering(zoom)]
+            rendered += tile_set.render(tiles, executor=self._render_pool)
+        return rendered
+
+    def server_close(self):
+        super().server_close()
+        self._request_pool.shutdown(wait=True)
+        self._render_pool.shutdown(wait=True)
+
+
+class RadonRequestHandler(http.server.BaseHTTPRequestHandler):
+    server_version = "RadonPlot/1.0"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = {name: values[-1] for name, values in urllib.parse.parse_qs(url.query).items()}
+        parts = [urllib.parse.unquote(part) for part in url.path.strip('/').split('/') if part]
+        try:
+            if parts == ['datasets']:
+                self._send_json(self._list_datasets())
+            elif len(parts) == 3 and parts[0] == 'datasets' and parts[2] == 'stats':
+                self._send_json(dataset_stats(self.server.store, parts[1], query))
+            elif len(parts) == 3 and parts[0] == 'datasets' and parts[2].startswith('chart.'):
+                fmt = parts[2].split('.', 1)[1]
+                if fmt not in CHART_FORMATS:
+                    raise RequestError(404, f"Charts are available as {', '.join(CHART_FORMATS)}")
+                snapshot, digest = chart_snapshot(self.server.store, parts[1], query)
+                self._send(200, CHART_FORMATS[fmt], self.server.render_chart(snapshot, digest, fmt))
+            elif len(parts) in (4, 5) and parts[0] == 'datasets' and parts[2] == 'tiles':
+                self._tiles(parts[1], parts[3:], query)
+            else:
+                raise RequestError(404, "Not found")
+        except RequestError as exc:
+            self._send_json({'error': str(exc)}, exc.status)
+        except Exception as exc:
+            # Anything else (a render that failed in the worker pool, a
+            # dataset with no readings) still gets an answer rather than
+            # a dropped connection; the details go to the server's log
+            self.log_error("%s failed: %s: %s", self.path, type(exc).__name__, exc)
+            traceback.print_exc()
+            self._send_json({'error': f"Internal error: {type(exc).__name__}: {exc}"}, 500)
+
+    def _tiles(self, dataset_id, path, query):
+        """/tiles/<zoom>: JSON list of the tiles covering the dataset at
+        that zoom level; /tiles/<zoom>/<index>.png: one tile."""
+        zoom = int(path[0]) if path[0].isdigit() else -1
+        if not 0 <= zoom < len(TILE_ZOOM_DAYS):
+            raise RequestError(404, f"Zoom levels are 0 to {len(TILE_ZOOM_DAYS) - 1}")
+        dataset = self.server.store.get(dataset_id)
+        unit = _query_unit(query, dataset)
+        authority_key = query.get('authority', 'who')
+        if authority_key not in AUTHORITIES:
+            raise RequestError(400, f"Unknown authority {authority_key!r}")
+        tile_set = self.server.tile_set(dataset_id, unit, authority_key)
+        if len(path) == 1:
+            def iso(num):
+                return mdates.num2date(num).replace(tzinfo=None).isoformat(timespec='minutes')
+            tiles = [
+                {'index': index, 'start': iso(tile_bounds(zoom, index)[0]), 'end': iso(tile_bounds(zoom, index)[1])}
+                for _, index in tile_set.tiles_covering(zoom)
+            ]
+            self._send_json({'zoom': zoom, 'days': TILE_ZOOM_DAYS[zoom], 'ymax': tile_set.ymax, 'tiles': tiles})
+            return
+        name, _, fmt = path[1].partition('.')
+        try:
+            index = int(name)
+        except ValueError:
+            index = None
+        if index is None or fmt != tile_set.fmt:
+            raise RequestError(404, f"Tiles are <index>.{tile_set.fmt}")
+        # Only tiles with data in them: anything else would render (and
+        # cache on disk for good) a blank tile, or overflow the date
+        # arithmetic altogether for an absurd index
+        covering = tile_set.tiles_covering(zoom)
+        if (zoom, index) not in covering:
+            raise RequestError(404, f"Zoom {zoom} tiles for this dataset are {covering[0][1]} to {covering[-1][1]}")
+        self._send(200, CHART_FORMATS[tile_set.fmt], self.server.render_tile(tile_set, zoom, index))
+
+    def _list_datasets(self):
+        listing = []
+        for dataset_id in self.server.store.ids():
+            try:
+                dataset = self.server.store.get(dataset_id)
+            except RequestError as exc:
+                listing.append({'id': dataset_id, 'error': str(exc)})
+                continue
+            nums = dataset['timestamp_nums']
+            listing.append({
+                'id': dataset_id,
+                'serial_number': dataset['serial_number'],
+                'file': os.path.basename(dataset['path']),
+                'unit': dataset['unit'],
+                'readings': len(nums),
+                'first': mdates.num2date(nums[0]).replace(tzinfo=None).isoformat(timespec='minutes'),
+                'last': mdates.num2date(nums[-1]).replace(tzinfo=None).isoformat(timespec='minutes'),
+            })
+        return {'datasets': listing}
+
+    def _send_json(self, payload, status=200):
+        self._send(status, 'application/json', json.dumps(payload).encode('utf-8'))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve RD200 export stats and charts over HTTP.")
+    parser.add_argument('files', nargs='+', help="RD200 export files to serve")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on (default: %(default)s)")
+    parser.add_argument('--threads', type=int, default=8, help="request-handling threads (default: %(default)s)")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="chart-rendering processes (default: one per CPU)")
+    parser.add_argument('--tile-cache', default=DEFAULT_TILE_CACHE_DIR,
+                        help="directory for rendered tiles (default: %(default)s)")
+    parser.add_argument('--pregenerate-tiles', action='store_true',
+                        help="render every tile up front, and prune the tile cache, before serving")
+    args = parser.parse_args(argv)
+
+    server = RadonHTTPServer((args.host, args.port), DatasetStore(args.files),
+                             request_workers=args.threads, render_workers=args.render_workers,
+                             tile_cache_dir=args.tile_cache)
+    if args.pregenerate_tiles:
+        print(f"Rendered {server.pregenerate_tiles()} tile(s); pruned {server.tile_cache.prune()} old one(s)")
+    print(f"Serving {len(server.store.ids())} dataset(s) on http://{args.host}:{server.server_address[1]}/datasets")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
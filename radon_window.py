@@ -0,0 +1,2446 @@
+import matplotlib
+matplotlib.use('Qt5Agg')
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT as NavigationToolbar
+from matplotlib.backend_bases import MouseButton
+from matplotlib.figure import Figure
+import matplotlib.colors as mcolors
+import matplotlib.dates as mdates
+import numpy as np
+import concurrent.futures
+import datetime
+import functools
+import inspect
+import os
+import time
+from PyQt5.QtWidgets import QFileDialog, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QInputDialog, QMessageBox, QComboBox, QLabel, QSizePolicy, QAction, QPushButton, QDialog, QDockWidget, QProgressBar, QActionGroup
+from PyQt5.QtCore import Qt, QRectF, QPointF, QSize, QTimer
+from PyQt5.QtGui import QPainter, QPen, QIcon, QPixmap, QColor, QPainterPath
+import sys
+
+from action_profiling import ActionProfiler, DEFAULT_PROFILE_DIR, profile_dir_from_environment
+from action_telemetry import log_action
+
+# Parsing, analysis, layout and every export renderer live in the
+# Qt-free radon_core (usable headless and from worker processes); this
+# module is the Qt application on top of it, and radon_plot.py the small
+# launcher that starts it
+from radon_core import (
+    AUTHORITIES, AUTHORITY_ORDER, AVERAGE_PERIODS, build_calendar_grid, compute_daily_means,
+    compute_time_of_day_profile, dataset_digest, default_end_datetime, DEFAULT_RASTER_DPI,
+    end_datetime_from_filename, export_average_card, format_file_size, format_unit_html,
+    format_unit_mathtext, get_authority_zones, level_prefix_sums, _MISSING, NoReadingsError,
+    parquet_available, parse_rd200_file, _RadonFigureLayout, range_averages, render_fleet_report,
+    render_monthly_report, render_report_bytes, RenderCache, report_cache_key, REPORT_PAGE_SIZES,
+    RESAMPLE_AGGREGATIONS, resample_readings, segment_by_zones, selection_average_card,
+    _SparseRangeMinMax, SpikeDetector, strip_leading_hour_zero, trailing_period_averages,
+    unit_scale, WEEKDAY_NAMES, write_data_export, zone_point_colors,
+)
+
+
+# File-type filter for the "Select RadonEye RD200 Data File" dialog
+# (the launcher in radon_plot.py keeps its own copy, since it shows the
+# startup dialog before this module is imported)
+DATA_FILE_FILTER = "RadonEye Data Files (*.txt *.csv);;Text files (*.txt);;CSV files (*.csv);;All files (*.*)"
+
+
+def _user_action(action):
+    """Decorator marking a MainWindow method as one user-level action
+    (see MainWindow._begin_user_action), named `action`, that lasts
+    until the event loop is next idle — so it takes in the redraw the
+    method scheduled with draw_idle, not just the method itself.
+
+    These methods are connected straight to Qt signals, and PyQt passes
+    a slot every argument the signal carries (the combo's new index, a
+    menu action's checked state) if the slot accepts them; the wrapper
+    passes on only as many positional arguments as the method itself
+    takes, so its signature decides, as it would unwrapped."""
+    def decorate(method):
+        positional = [
+            param for param in inspect.signature(method).parameters.values()
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+        ]
+        takes = len(positional) - 1  # not counting self
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            began = self._begin_user_action(action)
+            try:
+                return method(self, *args[:takes], **kwargs)
+            finally:
+                if began:
+                    QTimer.singleShot(0, self._end_user_action)
+        return wrapper
+    return decorate
+
+
+def _make_line_icon(draw_fn, size=24, stroke=1.8, color="#404040"):
+    """Render a small custom icon by calling draw_fn(painter, size) with a
+    QPainter set up for a plain black-outline, no-fill look — matplotlib's
+    own bundled toolbar icons (used for Save originally, still used for
+    other trimmed-out buttons) are simple line-art pictograms in the same
+    spirit, so custom icons (Load Data, Export, and the overlay Home
+    button) are drawn to match that style rather than pulling in a
+    mismatched OS-native icon."""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    pen = QPen(QColor(color))
+    pen.setWidthF(stroke)
+    pen.setJoinStyle(Qt.RoundJoin)
+    pen.setCapStyle(Qt.RoundCap)
+    painter.setPen(pen)
+    painter.setBrush(Qt.NoBrush)
+    draw_fn(painter, size)
+    painter.end()
+    return QIcon(pixmap)
+
+
+def _draw_folder_icon(painter, size):
+    """Simple open-folder outline for the Load Data button."""
+    m = size * 0.16
+    painter.drawRect(QRectF(m, size * 0.38, size - 2 * m, size * 0.42))
+    tab = QPainterPath()
+    tab.moveTo(m, size * 0.38)
+    tab.lineTo(m, size * 0.24)
+    tab.lineTo(size * 0.46, size * 0.24)
+    tab.lineTo(size * 0.56, size * 0.38)
+    painter.drawPath(tab)
+
+
+def _draw_export_icon(painter, size):
+    """A tray with an arrow pointing up and out of it — reads as
+    "export"/"send out" rather than the traditional floppy-disk "save"
+    icon, which is what a Save button used to look like here."""
+    m = size * 0.16
+    painter.drawRect(QRectF(m, size * 0.66, size - 2 * m, size * 0.2))
+    painter.drawLine(QPointF(size * 0.5, size * 0.14), QPointF(size * 0.5, size * 0.58))
+    arrow = QPainterPath()
+    arrow.moveTo(size * 0.32, size * 0.32)
+    arrow.lineTo(size * 0.5, size * 0.14)
+    arrow.lineTo(size * 0.68, size * 0.32)
+    painter.drawPath(arrow)
+
+
+def _draw_home_icon(painter, size):
+    """Simple house outline for the overlay "reset view" button."""
+    roof = QPainterPath()
+    roof.moveTo(size * 0.14, size * 0.52)
+    roof.lineTo(size * 0.5, size * 0.16)
+    roof.lineTo(size * 0.86, size * 0.52)
+    painter.drawPath(roof)
+    painter.drawRect(QRectF(size * 0.23, size * 0.5, size * 0.54, size * 0.36))
+    painter.drawRect(QRectF(size * 0.44, size * 0.63, size * 0.12, size * 0.23))
+
+
+def _build_trimmed_toolitems():
+    """Keep only Save as a visible toolbar button. There's no separate
+    Pan/Zoom toggle anymore — dragging, clicking, and shift-dragging all
+    work all the time (see TrimmedNavigationToolbar below), so there's
+    nothing to switch between. Built as a standalone function rather than
+    inline in the class body, since list comprehensions in a class body
+    can't see other class-level names."""
+    kept = {'Save'}
+    tooltip_overrides = {
+        'Save': "Export the graph as an image or document (PNG, PDF, SVG, and more)",
+    }
+    return [
+        (name, tooltip_overrides.get(name, desc), icon, callback)
+        for name, desc, icon, callback in NavigationToolbar.toolitems
+        if name in kept
+    ]
+
+
+class TrimmedNavigationToolbar(NavigationToolbar):
+    """Same toolbar as matplotlib's default, minus buttons that don't add
+    value for this app: Back/Forward (redundant with Home), Pan/Zoom
+    (merged into always-on mouse behavior — see press_pan/release_pan
+    below), Subplots (can desync layout), and Customize (built for
+    editing individual Line2D curves — this app draws a LineCollection,
+    which that dialog doesn't handle well). Home has moved off the
+    toolbar entirely, into a floating button pinned over the plot's own
+    top-left corner (see the home_overlay_button setup below).
+
+    Mouse behavior (active at all times, no mode switching required):
+      - Drag (left button): pan
+      - Right-drag: matplotlib's built-in interactive zoom
+      - Click (no drag): zoom in one step, centered on the click
+      - Right-click (no drag): zoom out one step
+      - Shift + drag: select a date range (see MainWindow.begin_range_drag)
+      - Shift + drag near an existing selection's edge: resize that edge
+      - Scroll wheel: zoom
+    """
+    toolitems = _build_trimmed_toolitems()
+
+    def __init__(self, canvas, parent, *args, **kwargs):
+        super().__init__(canvas, parent, *args, **kwargs)
+        # The MainWindow instance — used to hand off shift-drag range
+        # selection, since that needs access to the loaded data (timestamps,
+        # readings) that only the host window has.
+        self.host = parent
+        self._click_zoom_start = None
+        self._shift_drag_active = False
+        # Whether the current press started a user action (see
+        # MainWindow._begin_user_action) for release_pan to end
+        self._user_action_began = False
+
+        # "Load Data" button, added directly as a QAction rather than
+        # through toolitems/matplotlib's bundled icon set — matplotlib
+        # doesn't ship an "open file" icon. Drawn as a simple line-art
+        # folder icon (_draw_folder_icon) to match the style of Save's
+        # icon below and the floating Home button, rather than pulling
+        # in a mismatched OS-native icon. Placed first (leftmost).
+        load_action = QAction(_make_line_icon(_draw_folder_icon), "Load Data", self)
+        load_action.setToolTip("Load a different RadonEye data file")
+        load_action.triggered.connect(self.host.load_new_file)
+        existing_actions = self.actions()
+        if existing_actions:
+            self.insertAction(existing_actions[0], load_action)
+        else:
+            self.addAction(load_action)
+
+        # Override Save's icon (built from toolitems, so it started out
+        # as matplotlib's default floppy-disk icon) with an "export"
+        # style instead -- a tray with an arrow pointing out of it reads
+        # more clearly as "send this out as a file" than a save icon,
+        # and matches the Load/Home icons' line-art style.
+        for action in self.actions():
+            if action.text() == 'Save':
+                action.setIcon(_make_line_icon(_draw_export_icon))
+                break
+
+        # Floating "reset view" button, positioned over the plot's own
+        # top-left corner instead of living in the toolbar row. A plain
+        # child widget of the canvas rather than a toolbar action, so it
+        # can be positioned freely with move() below. Its (8, 8) offset
+        # is relative to the canvas's own top-left corner, not the
+        # window — Qt positions child widgets relative to their parent,
+        # so this stays pinned there automatically as the window/canvas
+        # is resized, with no resize handler needed.
+        self.home_overlay_button = QPushButton(canvas)
+        self.home_overlay_button.setIcon(_make_line_icon(_draw_home_icon, size=20))
+        self.home_overlay_button.setIconSize(QSize(18, 18))
+        self.home_overlay_button.setFixedSize(28, 28)
+        self.home_overlay_button.setToolTip("Reset the view to show all data points")
+        self.home_overlay_button.setCursor(Qt.PointingHandCursor)
+        self.home_overlay_button.setStyleSheet(
+            "QPushButton { background-color: rgba(255,255,255,0.85); border: 1px solid #999; border-radius: 4px; }"
+            "QPushButton:hover { background-color: rgba(255,255,255,1.0); }"
+            "QPushButton:pressed { background-color: rgba(230,230,230,1.0); }"
+        )
+        self.home_overlay_button.clicked.connect(self.home)
+        # Positioned relative to the axes' own top-left corner (not just
+        # the canvas's), so it lands over the actual plot rather than
+        # over the y-axis labels / left edge bar — see
+        # MainWindow._position_home_overlay_button, called once the
+        # canvas has a real size (raw new-widget sizes aren't reliable
+        # this early) and again on every resize.
+        self.home_overlay_button.raise_()
+        self.home_overlay_button.show()
+
+    def press_pan(self, event):
+        # Shift-drag is reserved for range selection — hand off to the
+        # host MainWindow entirely and skip normal pan/click-zoom setup.
+        if event.button == MouseButton.LEFT and 'shift' in event.modifiers:
+            self._shift_drag_active = True
+            self._user_action_began = self.host._begin_user_action('selection')
+            self.host.begin_range_drag(event)
+            return
+        self._shift_drag_active = False
+        # A press starts a pan (or a right-drag zoom) as far as profiling
+        # is concerned; release_pan relabels it if it was a click-zoom
+        self._user_action_began = self.host._begin_user_action(
+            'zoom-drag' if event.button == MouseButton.RIGHT else 'pan')
+
+        # Remember the click's starting screen position (in pixels) so
+        # release_pan can tell a genuine drag apart from a stationary
+        # click. Let the normal pan machinery run too, so an actual drag
+        # still pans (or, with the right mouse button, does matplotlib's
+        # built-in interactive zoom) exactly as before.
+        if event.button in (MouseButton.LEFT, MouseButton.RIGHT) and event.x is not None and event.y is not None:
+            self._click_zoom_start = (event.button, event.inaxes, event.x, event.y)
+        else:
+            self._click_zoom_start = None
+        super().press_pan(event)
+
+    def save_figure(self, *args):
+        """The default NavigationToolbar save action only captures the
+        matplotlib canvas itself, leaving out the averages row entirely
+        (a separate set of Qt widgets, not part of the figure).
+
+        An earlier version of this fixed that by rendering the whole Qt
+        widget (toolbar, plot, averages row) via QPainter/widget.render.
+        That's a raster capture, though -- the plot itself, drawn by
+        matplotlib's Agg backend inside the canvas, was already a bitmap
+        by the time Qt grabbed it, so PDF/SVG exports ended up with a
+        rasterized plot embedded in an otherwise-vector file rather than
+        true vector paths. See MainWindow.export_report for the fix:
+        it draws a matching stats panel directly as matplotlib artists
+        and saves through the figure's own savefig, so PDF/SVG stay
+        genuinely vector throughout, not just around the edges."""
+        serial = getattr(self.host, 'serial_number', None) or 'unit'
+        date_str = datetime.datetime.now().strftime('%Y-%m-%d')
+        default_name = f"RD200_{serial}_{date_str}"
+
+        path, chosen_filter = QFileDialog.getSaveFileName(
+            self, "Save the figure", default_name,
+            "PDF Document (*.pdf);;PDF Document, raster data layers (*.pdf);;"
+            "SVG Image (*.svg);;SVG Image, raster data layers (*.svg);;"
+            "PNG Image (*.png);;JPEG Image (*.jpg *.jpeg);;All Files (*)"
+        )
+        if not path:
+            return
+
+        # The "raster data layers" variants keep text, axes and the stats
+        # panel vector but rasterize the dense trace and markers (see
+        # render_report) — much smaller files for long, dense datasets
+        raster_dpi = None
+        if 'raster' in chosen_filter:
+            raster_dpi, ok = QInputDialog.getInt(
+                self, "Raster Resolution",
+                "Resolution for the rasterized data layers (DPI):",
+                DEFAULT_RASTER_DPI, 72, 1200, 50,
+            )
+            if not ok:
+                return
+
+        # If the user typed a name with no extension, infer one from
+        # whichever filter was active in the dialog (PDF by default)
+        ext = os.path.splitext(path)[1].lower()
+        if not ext:
+            ext = {'PDF': '.pdf', 'SVG': '.svg', 'PNG': '.png', 'JPEG': '.jpg'}.get(
+                next((k for k in ('PDF', 'SVG', 'PNG', 'JPEG') if k in chosen_filter), 'PDF'), '.pdf'
+            )
+            path += ext
+
+        try:
+            self.host.export_report(path, ext.lstrip('.'), raster_dpi=raster_dpi)
+        except Exception as exc:
+            QMessageBox.critical(self, "Save Error", f"Could not save the file:\n{exc}")
+
+    def release_pan(self, event):
+        # Whatever press_pan started — pan, zoom, selection — ends here
+        # (see MainWindow._begin_user_action)
+        try:
+            self._finish_pan(event)
+        finally:
+            if self._user_action_began:
+                self._user_action_began = False
+                QTimer.singleShot(0, self.host._end_user_action)
+
+    def _finish_pan(self, event):
+        if event is None:
+            # matplotlib cancelling a pan whose button release it never
+            # saw (e.g. released outside the window) — there's no
+            # release position, so no click-zoom or selection to finish
+            self._click_zoom_start = None
+            self._shift_drag_active = False
+            super().release_pan(event)
+            return
+        if self._shift_drag_active:
+            self._shift_drag_active = False
+            self.host.end_range_drag(event)
+            return
+
+        start = self._click_zoom_start
+        self._click_zoom_start = None
+        # Let the normal pan interaction finish/clean up first. If the
+        # mouse never actually moved, this is a harmless no-op.
+        super().release_pan(event)
+
+        if not start:
+            return
+        button, start_ax, x0, y0 = start
+        if start_ax is None or event.x is None or event.y is None:
+            return
+        moved = ((event.x - x0) ** 2 + (event.y - y0) ** 2) ** 0.5
+        if moved >= 5:
+            return  # a real drag happened — that was a pan/zoom-drag, not a click
+        if event.inaxes != start_ax or event.xdata is None:
+            return
+
+        self.host._rename_user_action('zoom-click')
+        try:
+            ax = start_ax
+            scale_factor = 0.5 if button == MouseButton.LEFT else 2.0  # left=in, right=out
+            xlim = ax.get_xlim()
+            old_width = xlim[1] - xlim[0]
+            new_width = old_width * scale_factor
+            rel = (event.xdata - xlim[0]) / old_width if old_width != 0 else 0.5
+            ax.set_xlim(event.xdata - new_width * rel, event.xdata + new_width * (1 - rel))
+            self.canvas.draw_idle()
+        except Exception:
+            pass  # fail safe — don't crash the app over a zoom click
+
+
+class ProfileWindow(QDialog):
+    """Separate, non-modal window showing the hour-of-day profile (mean
+    line with 25-75% and 10-90% percentile bands) above a weekday x hour
+    heatmap of mean levels. Covers the whole dataset, or just the
+    current Shift-drag selection when there is one. All numbers come
+    from MainWindow.get_time_of_day_profile, which caches them — this
+    window only draws."""
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.host = host
+        self.setWindowTitle("Hour-of-Day / Weekly Profile")
+        self.figure = Figure(figsize=(9, 7), dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+        self.resize(900, 700)
+
+    def refresh(self):
+        profile, scope_label = self.host.get_time_of_day_profile()
+        unit_disp = format_unit_mathtext(self.host.unit)
+        self.figure.clear()
+        ax_hour, ax_week = self.figure.subplots(2, 1, gridspec_kw={'height_ratios': [3, 2]})
+
+        hours = np.arange(24)
+        pcts = profile['hour_pcts']
+        ax_hour.fill_between(hours, pcts[10], pcts[90], color='steelblue', alpha=0.18, linewidth=0, label='10th–90th percentile')
+        ax_hour.fill_between(hours, pcts[25], pcts[75], color='steelblue', alpha=0.35, linewidth=0, label='25th–75th percentile')
+        ax_hour.plot(hours, profile['hour_mean'], color='#1f3b57', linewidth=2, marker='o', markersize=3, label='Mean')
+        thresholds = get_authority_zones(self.host.authority_key, self.host.unit)[0]
+        for threshold in thresholds:
+            ax_hour.axhline(y=threshold, color="#FFA500" if threshold == thresholds[0] else "red", linestyle='--', linewidth=1)
+        ax_hour.set_xlim(-0.5, 23.5)
+        ax_hour.set_xticks(range(0, 24, 3))
+        ax_hour.set_xticklabels([strip_leading_hour_zero(datetime.time(h).strftime('%I %p')) for h in range(0, 24, 3)])
+        ax_hour.set_ylabel(f'RADON LEVEL ({unit_disp})', fontsize=9, fontweight='bold')
+        ax_hour.set_title(f'Hour-of-Day Profile ({scope_label})', fontsize=12, fontweight='bold')
+        ax_hour.grid(True, alpha=0.5)
+        ax_hour.legend(loc='upper right', fontsize=8, framealpha=0.95)
+
+        cmap = matplotlib.colormaps['YlOrRd'].copy()
+        cmap.set_bad('#eeeeee')
+        image = ax_week.imshow(
+            np.ma.masked_invalid(profile['week_mean']), aspect='auto', cmap=cmap,
+            interpolation='nearest', origin='upper'
+        )
+        ax_week.set_yticks(range(7))
+        ax_week.set_yticklabels(WEEKDAY_NAMES)
+        ax_week.set_xticks(range(0, 24, 3))
+        ax_week.set_xticklabels([strip_leading_hour_zero(datetime.time(h).strftime('%I %p')) for h in range(0, 24, 3)])
+        ax_week.set_title('Mean Level by Weekday and Hour', fontsize=11, fontweight='bold')
+        self.figure.colorbar(image, ax=ax_week, label=unit_disp, pad=0.02)
+
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+
+class CalendarView(QWidget):
+    """Calendar heatmap of daily averages, one cell per day (a row per
+    week, Monday first), colored by the selected risk standard's zones.
+    Lives in a dock beside the main plot. The whole grid is a single
+    imshow image rather than one Rectangle per day, so even a multi-year
+    deployment redraws instantly. Clicking a day zooms the main graph
+    to exactly that day."""
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.host = host
+        self._grid_origin = None  # (first_day_num, lead, n_days) of the drawn grid
+        self.figure = Figure(figsize=(2.6, 6), dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect('button_press_event', self._on_click)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+        self.setMinimumWidth(240)
+
+    def refresh(self):
+        first_day_num, daily_mean = self.host.get_daily_means()
+        thresholds, color_map, _, _ = get_authority_zones(self.host.authority_key, self.host.unit)
+        # Zone index per day: 0 below the low threshold, 1 between the
+        # two, 2 at/above the high one — the same low <= v < high rule
+        # render_zones uses to color the main trace
+        zones = np.digitize(daily_mean, thresholds).astype(float)
+        zones[np.isnan(daily_mean)] = np.nan
+        grid, lead = build_calendar_grid(first_day_num, zones)
+        self._grid_origin = (first_day_num, lead, len(daily_mean))
+
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        cmap = mcolors.ListedColormap([c[2] for c in color_map])
+        cmap.set_bad('#eeeeee')
+        ax.imshow(np.ma.masked_invalid(grid), aspect='auto', cmap=cmap, vmin=-0.5, vmax=2.5,
+                  interpolation='nearest', origin='upper')
+        ax.set_xticks(range(7))
+        ax.set_xticklabels([name[0] for name in WEEKDAY_NAMES], fontsize=8)
+        ax.xaxis.tick_top()
+
+        # Month labels on the first row of each month, thinned out for
+        # long deployments so they don't collide
+        n_rows = grid.shape[0]
+        row_starts = first_day_num - lead + 7 * np.arange(n_rows)
+        months = np.array([d.year * 12 + d.month - 1 for d in mdates.num2date(row_starts + 6)])
+        new_month_rows = np.flatnonzero(np.diff(months, prepend=months[0] - 1))
+        stride = 1 if n_rows <= 60 else (3 if n_rows <= 160 else 6)
+        label_rows = [r for r in new_month_rows if (months[r] % stride) == 0]
+        ax.set_yticks(label_rows)
+        ax.set_yticklabels([datetime.date(months[r] // 12, months[r] % 12 + 1, 1).strftime('%b %Y') for r in label_rows], fontsize=7)
+        ax.tick_params(length=0)
+        ax.set_title('Daily Average', fontsize=10, fontweight='bold', pad=18)
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def _on_click(self, event):
+        if self._grid_origin is None or event.inaxes is None or event.xdata is None:
+            return
+        first_day_num, lead, n_days = self._grid_origin
+        row, col = int(round(event.ydata)), int(round(event.xdata))
+        day_index = row * 7 + col - lead
+        if not (0 <= col < 7 and 0 <= day_index < n_days):
+            return
+        day_start = first_day_num + day_index
+        self.host.ax.set_xlim(day_start, day_start + 1)
+        self.host.canvas.draw_idle()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+
+class MainWindow(QMainWindow, _RadonFigureLayout):
+    def __init__(self, filename=None, end_datetime=None, interval=None, authority_key=None,
+                 display_unit=None, view_range=None, resampling=None):
+        """`filename` is the file to open (the launcher, radon_plot.py,
+        shows the startup file dialog itself before this module is even
+        imported, or takes it from the command line); the rest are the
+        command line's startup options, all optional: the last reading's
+        date/time (skipping the filename/prompt lookup), a reading
+        interval overriding the file's, the risk standard and display
+        unit to start on, a (start, end) date-number range to open
+        zoomed to instead of the full data, and an (interval, how) to
+        resample the readings to (see set_resampling)."""
+        super().__init__()
+        self.setWindowTitle("Radon Plot")
+
+        result = self._prompt_and_parse_file(filename, end_datetime, interval)
+        if result is None:
+            print("No file selected. Exiting.")
+            sys.exit(1)
+
+        # The readings as the file has them, and whatever's resampled
+        # from them; the window shows one series at a time (see
+        # _show_series)
+        self._source = self._series_from(result)
+        self._resampled = {}
+        self._series_caches = {}
+        self.resampling = resampling
+        self._resample_how = resampling[1] if resampling is not None else RESAMPLE_AGGREGATIONS[0]
+        self._show_series(self._series_for(resampling))
+
+        print("Generating plot...")
+        try:
+            self.init_ui(result['unit'], result['serial_number'], authority_key, display_unit)
+            if view_range is not None:
+                self.show_view_range(*view_range)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            QMessageBox.critical(
+                self, "Error Building Plot",
+                f"Something went wrong while building the graph:\n\n{type(e).__name__}: {e}\n\n"
+                "Full details were printed to the terminal window."
+            )
+            sys.exit(1)
+
+    def _prompt_and_parse_file(self, filename=None, end_datetime=None, interval=None):
+        """Prompt for a RadonEye data file (unless `filename` has already
+        been chosen) and parse it, returning a dict
+        of {radon_levels, timeline, timestamp_nums, unit, serial_number}
+        — or None if the user cancels or the file can't be used.
+
+        Used for the initial startup load (__init__); later reloads via
+        the toolbar's "Load Data" button (load_new_file) go through the
+        same two halves, _prompt_for_file and _parse_file, separately,
+        so the same parsing logic and file-format handling only exists in
+        one place. Never calls sys.exit() itself — at startup, the
+        caller exits if this returns None (no data to show at all); for
+        a reload, the caller just leaves the currently-loaded data as-is
+        and lets the user try again. An `end_datetime` given up front
+        (from the command line) skips the end-time prompt, and
+        `interval` is passed on to parse_rd200_file."""
+        chosen = self._prompt_for_file(filename, end_datetime)
+        if chosen is None:
+            return None
+        return self._parse_file(*chosen, interval=interval)
+
+    def _prompt_for_file(self, filename=None, end_datetime=None):
+        """The file-choosing half of _prompt_and_parse_file: the open
+        dialog (unless `filename` is given) and, for a file whose name
+        doesn't carry it, the end-time prompt. Returns (filename,
+        end_datetime), or None if the user cancels."""
+        if filename is None:
+            filename, _ = QFileDialog.getOpenFileName(
+                self,
+                "Select RadonEye RD200 Data File",
+                "",
+                DATA_FILE_FILTER
+            )
+        if not filename:
+            return None
+
+        if end_datetime is None:
+            end_datetime = end_datetime_from_filename(filename)
+
+        # Newer exports (e.g. "SERIAL_LogData_2.txt") don't embed a date at
+        # all, so fall back to the file's last-modified time and let the
+        # user confirm/correct it.
+        if end_datetime is None:
+            default_dt = default_end_datetime(filename)
+            default_str = default_dt.strftime('%Y-%m-%d %H:%M:%S')
+            text, ok = QInputDialog.getText(
+                self,
+                "Confirm End Date/Time",
+                "This file's name doesn't contain a timestamp, so the date/time\n"
+                "of the LAST data point can't be determined automatically.\n\n"
+                "Enter it below (defaulted to the nearest hour to when the\n"
+                "file was saved, since RD200 readings land on hour marks):\n"
+                "Format: YYYY-MM-DD HH:MM:SS",
+                text=default_str
+            )
+            if not ok:
+                return None
+            try:
+                end_datetime = datetime.datetime.strptime(text.strip(), '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                QMessageBox.warning(self, "Invalid Date", "Couldn't parse that date/time. Using file's last-modified time instead.")
+                end_datetime = default_dt
+
+        return filename, end_datetime
+
+    def _parse_file(self, filename, end_datetime, interval=None):
+        """The parsing half of _prompt_and_parse_file: parse_rd200_file's
+        dict, or None (after telling the user why) if the file can't be
+        used."""
+        try:
+            # Datetimes come from self.timeline one reading at a time, as
+            # labels need them, rather than a datetime object per reading
+            return parse_rd200_file(filename, end_datetime, with_datetimes=False, interval=interval)
+        except NoReadingsError:
+            QMessageBox.critical(self, "No Data Found", "Couldn't find any data points in this file. Please check the file format.")
+            return None
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            QMessageBox.critical(self, "Error Reading File", f"Couldn't read this file:\n\n{e}")
+            return None
+
+    def load_new_file(self):
+        """Triggered by the toolbar's "Load Data" button — prompts for a
+        new RadonEye file and, if one's successfully loaded, swaps it in
+        for the currently-displayed data without needing to restart the
+        app. Unlike startup, cancelling or an unparseable file just
+        leaves whatever's currently on screen untouched rather than
+        exiting."""
+        chosen = self._prompt_for_file()
+        if chosen is None:
+            return
+        self._load_file(*chosen)
+
+    @_user_action('load')
+    def _load_file(self, filename, end_datetime):
+        """Parse a file chosen in load_new_file and swap it in — the
+        part of a reload after the dialogs, which is what gets profiled
+        as the 'load' action."""
+        result = self._parse_file(filename, end_datetime)
+        if result is None:
+            return
+
+        # A newer export of the same unit just has more readings on the
+        # end — carry the spike detector over and only scan the new tail
+        # (only if it was run on the file's own readings, not resampled
+        # ones)
+        detector = getattr(self, '_spike_detector', None)
+        if detector is not None and self.resampling is None and self._is_append_of_current(result):
+            detector.extend(result['radon_levels'])
+        else:
+            detector = None
+
+        # Resampled series (and everything derived from them) belong to
+        # the old file; the resampling choice itself carries over
+        self._source = self._series_from(result)
+        self._resampled = {}
+        self._series_caches = {}
+        self._show_series(self._series_for(self.resampling))
+        self.native_unit = result['unit']
+        self.display_unit = result['unit']
+        self.unit = result['unit']
+        self.serial_number = result['serial_number']
+
+        # The unit dropdown's very items (not just its selection) depend
+        # on whether the file's unit is recognized — a fixed, disabled
+        # single item for an unrecognized unit, or the normal two-way
+        # Bq/m3 <-> pCi/L toggle otherwise. Rebuild it fresh rather than
+        # just changing the selected index, since the new file's unit
+        # situation may not match the old one. Signals blocked during the
+        # rebuild since self.display_unit/self.unit are already being set
+        # directly above — on_unit_changed firing mid-rebuild would just
+        # be redundant (and could fire against a half-built combo box).
+        self.unit_combo.blockSignals(True)
+        self.unit_combo.clear()
+        if self.native_unit in ("Bq/m3", "pCi/L"):
+            self.unit_combo.addItem("Bq/m³", "Bq/m3")
+            self.unit_combo.addItem("pCi/L", "pCi/L")
+            self.unit_combo.setCurrentIndex(0 if self.native_unit == "Bq/m3" else 1)
+            self.unit_combo.setEnabled(True)
+        else:
+            self.unit_combo.addItem(self.native_unit, self.native_unit)
+            self.unit_combo.setEnabled(False)
+        self.unit_combo.blockSignals(False)
+
+        # A selection from the old dataset has no meaning against the new
+        # one (different timestamps entirely) — drop it rather than risk
+        # showing a stale/nonsensical selected-range average
+        self._selection = None
+        if getattr(self, '_selection_patch', None) is not None:
+            try:
+                self._selection_patch.remove()
+            except Exception:
+                pass
+            self._selection_patch = None
+        self._clear_range_edge_bubbles()
+        self._reset_derived_caches()
+        self._spike_detector = detector
+        self._sync_resample_menu()
+
+        self.render_zones()
+        self.update_stats_label()
+        self.canvas.draw_idle()
+        self._refresh_secondary_views()
+
+    def _is_append_of_current(self, result):
+        """True if a freshly parsed file is the currently loaded one
+        with extra readings on the end: same serial, same unit and
+        interval, same first timestamp, and an unchanged prefix."""
+        new_levels = result['radon_levels']
+        old_levels = self._source['levels']
+        old_n = len(old_levels)
+        return (
+            result['serial_number'] == self.serial_number
+            and result['unit'] == self.native_unit
+            and result['interval'] == self._source['interval']
+            and len(new_levels) > old_n
+            and result['timeline'].datetime_at(0) == self._source['timeline'].datetime_at(0)
+            and np.array_equal(new_levels[:old_n], old_levels)
+        )
+
+    @staticmethod
+    def _series_from(result):
+        """The series parts of parse_rd200_file's dict."""
+        result['radon_levels'].setflags(write=False)
+        return {'timeline': result['timeline'], 'levels': result['radon_levels'], 'interval': result['interval']}
+
+    def _series_for(self, resampling):
+        """The readings to show for `resampling` — the file's own for
+        None, else resample_readings's series for (interval, how),
+        computed once per file."""
+        if resampling is None:
+            return self._source
+        series = self._resampled.get(resampling)
+        if series is None:
+            interval, how = resampling
+            result = resample_readings(self._source['timeline'], self._source['levels'], interval, how)
+            result['levels'].setflags(write=False)
+            series = {'timeline': result['timeline'], 'levels': result['levels'], 'interval': result['interval']}
+            self._resampled[resampling] = series
+        return series
+
+    def _show_series(self, series):
+        """Make `series` the readings everything else works on: the
+        plot, hover, stats, spike detection and exports all read these
+        attributes. (self.radon_levels is the native-unit readings until
+        init_ui or the caller converts it to the display unit.)"""
+        self.timeline = series['timeline']
+        self.timestamp_nums = series['timeline'].nums
+        self.native_levels = series['levels']
+        self.radon_levels = series['levels']
+        self.interval_delta = series['interval']
+
+    def init_ui(self, unit, serial_number, authority_key=None, display_unit=None):
+        # The unit the file's values are in, never changed after load —
+        # used as the source of truth for unit conversion (native_levels,
+        # the shown series in this unit, is set by _show_series)
+        self.native_unit = unit
+
+        # The unit currently being displayed — starts the same as the file's
+        # native unit (unless the command line asked for the other one),
+        # but can be toggled independently via the dropdown. Conversion
+        # is only defined between the two units the RD200 reports in.
+        if display_unit is None or unit not in ("Bq/m3", "pCi/L"):
+            display_unit = unit
+        self.display_unit = display_unit
+        self.unit = display_unit
+
+        self.serial_number = serial_number
+        # Default risk standard — the dropdown's first entry — unless the
+        # command line picked one
+        self.authority_key = authority_key or AUTHORITY_ORDER[0]
+
+        # Shift-drag range selection state: the selected readings as
+        # index bounds (start, stop) — half-open, like a slice — or None.
+        # Everything shown about a selection (its average, reading
+        # count, date labels) is derived from these two numbers on
+        # demand and memoized (see _selection_info/_selection_average),
+        # so a selection costs the same at any dataset size
+        self._selection = None
+        self._selection_patch = None
+        self._active_drag = None
+        self._selection_start_bubble = None
+        self._selection_end_bubble = None
+
+        # Secondary views (see show_profile_window) and their cached
+        # aggregates — the caches are keyed on _data_version, which
+        # _reset_derived_caches bumps on every load
+        self._data_version = 0
+        self._profile_window = None
+        self._autoscale_y = False
+        self._spike_detector = None
+        self._show_spikes = False
+        self._exclude_spikes = False
+        self._export_pool = None
+        self._pending_exports = []
+        # Per-action profiling (see _begin_user_action), on from the
+        # start if RADON_PLOT_PROFILE_DIR is set, or from the View menu
+        profile_dir = profile_dir_from_environment()
+        self._action_profiler = ActionProfiler(profile_dir) if profile_dir else None
+        # The user action in progress, if any, and a running count of
+        # canvas redraws, for the telemetry log (see _end_user_action)
+        self._user_action = None
+        self._draw_count = 0
+        # Page size for exported reports: None (the window's own
+        # proportions), a REPORT_PAGE_SIZES key, or a custom
+        # (width, height) in inches — see snapshot_page_layout
+        self.report_page_size = None
+        # Rendered exports by content (see report_cache_key), so saving
+        # the same view again — at another path, or after switching
+        # away and back — just writes the bytes already rendered
+        self._render_cache = RenderCache(self.RENDER_CACHE_MAX_BYTES)
+        self._reset_derived_caches()
+        self.radon_levels = self.levels_in_unit(self.display_unit)
+
+        # Create figure and canvas
+        self.figure = Figure(figsize=(12, 6), dpi=120)
+        self.canvas = FigureCanvas(self.figure)
+
+        # Create layout
+        layout = QVBoxLayout()
+        layout.setSpacing(0)
+
+        # Toolbar (Home / Pan / Zoom / Save only)
+        self.toolbar = TrimmedNavigationToolbar(self.canvas, self)
+        # Disable the toolbar's built-in "x=... y=..." coordinate readout —
+        # redundant now that hovering shows a proper tooltip with the exact
+        # timestamp and reading
+        self.toolbar.set_message = lambda s: None
+
+        toolbar_label_style = "font-size: 15pt; font-weight: bold; color: #333; padding-left: 10px;"
+        # Equal, generous padding on both sides for both the closed combo
+        # box and its dropdown popup list
+        h_pad = 16  # horizontal padding, pixels, each side
+        combo_style = (
+            f"QComboBox {{ font-size: 14pt; padding: 4px {h_pad}px; }}"
+            f"QComboBox QAbstractItemView {{ font-size: 14pt; padding: 4px {h_pad}px; }}"
+        )
+
+        def size_combo_to_contents(combo):
+            """AdjustToContents alone doesn't account for the dropdown
+            popup's own padding, which is what was clipping longer entries
+            like 'United Kingdom (UKHSA)' in the list even though the
+            closed box looked fine. Explicitly measure the widest item's
+            text and apply matching padding to both the box and the popup
+            so neither clips and the left/right spacing matches."""
+            fm = combo.fontMetrics()
+            text_width = max(fm.horizontalAdvance(combo.itemText(i)) for i in range(combo.count()))
+            arrow_and_frame_allowance = 40  # room for the dropdown arrow + border
+            full_width = text_width + h_pad * 2 + arrow_and_frame_allowance
+            combo.setMinimumWidth(full_width)
+            combo.view().setMinimumWidth(full_width)
+
+        risk_label = QLabel("Risk Standard: ")
+        risk_label.setStyleSheet(toolbar_label_style)
+        self.toolbar.addWidget(risk_label)
+
+        self.authority_combo = QComboBox()
+        for auth_key in AUTHORITY_ORDER:
+            self.authority_combo.addItem(AUTHORITIES[auth_key]['name'], auth_key)
+        self.authority_combo.setCurrentIndex(AUTHORITY_ORDER.index(self.authority_key))
+        self.authority_combo.setStyleSheet(combo_style)
+        self.authority_combo.currentIndexChanged.connect(self.on_authority_changed)
+        size_combo_to_contents(self.authority_combo)
+        self.toolbar.addWidget(self.authority_combo)
+
+        unit_label = QLabel("    Display Unit: ")
+        unit_label.setStyleSheet(toolbar_label_style)
+        self.toolbar.addWidget(unit_label)
+
+        self.unit_combo = QComboBox()
+        if self.native_unit in ("Bq/m3", "pCi/L"):
+            self.unit_combo.addItem("Bq/m³", "Bq/m3")
+            self.unit_combo.addItem("pCi/L", "pCi/L")
+            self.unit_combo.setCurrentIndex(0 if self.display_unit == "Bq/m3" else 1)
+        else:
+            # Unrecognized unit from the file — conversion isn't defined,
+            # so just show it as the sole, fixed option
+            self.unit_combo.addItem(self.native_unit, self.native_unit)
+            self.unit_combo.setEnabled(False)
+        self.unit_combo.setStyleSheet(combo_style)
+        self.unit_combo.currentIndexChanged.connect(self.on_unit_changed)
+        size_combo_to_contents(self.unit_combo)
+        self.toolbar.addWidget(self.unit_combo)
+
+        # Toolbar stays a fixed height regardless of window resizing —
+        # only the graph itself should grow
+        self.toolbar.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        layout.addWidget(self.toolbar, 0)
+
+        # Graph — gets all the extra space on window resize (stretch=1),
+        # while every other widget in this layout stays a fixed height
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        layout.addWidget(self.canvas, 1)
+
+        # Period-average + selected-range "cards" — all four in one row,
+        # each in its own bordered box with a bold, larger readout
+        stats_row = QHBoxLayout()
+        stats_row.setContentsMargins(10, 8, 10, 8)
+        stats_row.setSpacing(10)
+        self.average_cards = [self._make_stat_card() for _ in AVERAGE_PERIODS]
+        self.selection_card = self._make_stat_card()
+        for card in self.average_cards:
+            stats_row.addWidget(card)
+        stats_row.addWidget(self.selection_card)
+
+        # Lock every card to the same fixed height up front, sized for
+        # the tallest content any of them will ever show (the
+        # post-selection card, which has 4 lines including the "Hold
+        # Shift..." reminder). Without this, the row's height is driven
+        # by whatever's in it *right now* -- since the selection card
+        # starts life showing its shorter 2-line placeholder tip and
+        # only grows to 4 lines once a selection is made, the whole
+        # averages row would visibly grow/shift at that moment. Sizing
+        # every card to the worst case from the start means nothing
+        # ever needs to resize later; the card just centers whatever
+        # shorter content it currently has within that fixed space.
+        card_max_height = self._measure_max_stat_card_height()
+        for card in (*self.average_cards, self.selection_card):
+            card.setFixedHeight(card_max_height)
+
+        stats_container = QWidget()
+        stats_container.setLayout(stats_row)
+        stats_container.setStyleSheet("background-color: #fafafa; border-top: 1px solid #ddd;")
+        # Fixed height — these cards should stay a consistent, readable
+        # size no matter how tall the window gets; only the graph grows
+        stats_container.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        # A fixed pixel gap here (rather than relying on matplotlib's own
+        # internal bottom margin) keeps a consistent visual breathing room
+        # between the "DATE AND TIME" title and the averages row, entirely
+        # independent of anything happening inside the plot/canvas above it.
+        layout.addSpacing(14)
+        layout.addWidget(stats_container, 0)
+
+        # Create widget with layout
+        widget = QWidget()
+        widget.setLayout(layout)
+        self.setCentralWidget(widget)
+
+        # Background export progress (see export_report) — lives in the
+        # status bar and only shows while a report is being written
+        self._export_progress = QProgressBar()
+        self._export_progress.setRange(0, 0)  # busy indicator
+        self._export_progress.setMaximumWidth(200)
+        self._export_progress.hide()
+        self.statusBar().addPermanentWidget(self._export_progress)
+        # Says what the graph is showing while it's resampled (see
+        # _sync_resample_menu)
+        self._resample_label = QLabel()
+        self._resample_label.hide()
+        self.statusBar().addWidget(self._resample_label)
+        self._export_poll_timer = QTimer(self)
+        self._export_poll_timer.setInterval(100)
+        self._export_poll_timer.timeout.connect(self._poll_exports)
+
+        # Secondary views and extra export formats live in menus rather
+        # than the toolbar, which is deliberately kept down to Load /
+        # Export plus the two dropdowns
+        export_menu = self.menuBar().addMenu("Export")
+        monthly_action = QAction("Monthly PDF Report...", self)
+        monthly_action.setToolTip("One page per calendar month, with that month's averages, plus a summary cover page")
+        monthly_action.triggered.connect(self.prompt_monthly_report)
+        export_menu.addAction(monthly_action)
+        fleet_action = QAction("Fleet Report...", self)
+        fleet_action.setToolTip("Summary table and sparklines across many devices' exports, as PDF and CSV")
+        fleet_action.triggered.connect(self.prompt_fleet_report)
+        export_menu.addAction(fleet_action)
+        # Page size every report export uses (the toolbar's export, and
+        # the monthly report) — one checked choice at a time
+        page_menu = export_menu.addMenu("Report Page Size")
+        page_group = QActionGroup(self)
+        self._page_size_actions = {}
+        page_choices = [("Match Window", None), ("Letter (11 × 8.5 in)", 'letter'),
+                        ("A4 (297 × 210 mm)", 'a4'), ("Custom...", 'custom')]
+        for label, page_size in page_choices:
+            page_action = QAction(label, self)
+            page_action.setCheckable(True)
+            page_action.setChecked(page_size is None)
+            page_action.triggered.connect(functools.partial(self.choose_report_page_size, page_size))
+            page_group.addAction(page_action)
+            page_menu.addAction(page_action)
+            self._page_size_actions[page_size] = page_action
+        export_menu.addSeparator()
+        data_action = QAction("Data (CSV/Parquet)...", self)
+        data_action.setToolTip("Raw readings or hourly/daily/monthly averages, for all data or the current selection")
+        data_action.triggered.connect(self.prompt_data_export)
+        export_menu.addAction(data_action)
+
+        view_menu = self.menuBar().addMenu("View")
+        profile_action = QAction("Hour-of-Day / Weekly Profile...", self)
+        profile_action.setToolTip("Average level by hour of day and by weekday, for all data or the current selection")
+        profile_action.triggered.connect(self.show_profile_window)
+        view_menu.addAction(profile_action)
+
+        # Calendar heatmap docked beside the graph, hidden until toggled
+        # on from the View menu (QDockWidget's own toggleViewAction keeps
+        # the menu checkmark in sync with the dock's close button too)
+        self.calendar_view = CalendarView(self)
+        self.calendar_dock = QDockWidget("Calendar", self)
+        self.calendar_dock.setWidget(self.calendar_view)
+        self.calendar_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.calendar_dock)
+        self.calendar_dock.hide()
+        calendar_action = self.calendar_dock.toggleViewAction()
+        calendar_action.setText("Calendar Heatmap")
+        calendar_action.setToolTip("Daily averages on a calendar, colored by risk zone; click a day to zoom to it")
+        view_menu.addAction(calendar_action)
+
+        view_menu.addSeparator()
+        autoscale_action = QAction("Autoscale Y to Visible Range", self)
+        autoscale_action.setCheckable(True)
+        autoscale_action.setToolTip("Fit the y-axis to just the readings currently in view while panning and zooming")
+        autoscale_action.toggled.connect(self.set_autoscale_y)
+        view_menu.addAction(autoscale_action)
+
+        view_menu.addSeparator()
+        spikes_action = QAction("Mark Spikes and Dropouts", self)
+        spikes_action.setCheckable(True)
+        spikes_action.setToolTip("Circle readings far outside their rolling median (rolling median/MAD test)")
+        spikes_action.toggled.connect(self.set_show_spikes)
+        view_menu.addAction(spikes_action)
+        exclude_action = QAction("Exclude Spikes from Averages", self)
+        exclude_action.setCheckable(True)
+        exclude_action.setToolTip("Leave flagged spikes/dropouts out of every average card")
+        exclude_action.toggled.connect(self.set_exclude_spikes)
+        view_menu.addAction(exclude_action)
+
+        # Resampling (see set_resampling): one checked interval, the
+        # file's own first, then one checked aggregation below them
+        view_menu.addSeparator()
+        self._resample_menu = view_menu.addMenu("Resample")
+        self._resample_menu.setToolTipsVisible(True)
+        self._resample_interval_group = QActionGroup(self)
+        self._resample_interval_actions = {}
+        self._resample_how_separator = None
+        for interval in (None,) + self.RESAMPLE_INTERVALS:
+            self._add_resample_interval_action(interval)
+        self._resample_how_separator = self._resample_menu.addSeparator()
+        how_group = QActionGroup(self)
+        self._resample_how_actions = {}
+        for how in RESAMPLE_AGGREGATIONS:
+            how_action = QAction(self.RESAMPLE_AGGREGATION_NAMES[how].title(), self)
+            how_action.setCheckable(True)
+            how_action.triggered.connect(functools.partial(self.choose_resample_how, how))
+            how_group.addAction(how_action)
+            self._resample_menu.addAction(how_action)
+            self._resample_how_actions[how] = how_action
+
+        view_menu.addSeparator()
+        profile_actions_action = QAction("Profile Actions", self)
+        profile_actions_action.setCheckable(True)
+        profile_actions_action.setChecked(self._action_profiler is not None)
+        profile_actions_action.setToolTip("Write a cProfile and peak-memory report for every load, unit/standard change, "
+                                          "pan, zoom, selection and export")
+        profile_actions_action.toggled.connect(self.set_profile_actions)
+        view_menu.addAction(profile_actions_action)
+
+        # Create main axes for the plot
+        self.ax = self.figure.add_subplot(111)
+
+        # Create the left/right bookend bars once, up front — they're
+        # figure-level artists that persist across every render_zones
+        # rebuild (see _create_edge_bars for why), so they only need to
+        # be created a single time here, not inside render_zones itself
+        self._create_edge_bars()
+
+        # Margins (including the space reserved at the top for buttons)
+        # are applied in render_zones, via _finalize_layout, on every
+        # redraw
+
+        self._sync_resample_menu()
+
+        # Draw the plot for the first time using the default authority
+        self.render_zones()
+        # Position the floating Home button now too (not just on later
+        # resizes) — the canvas's size at this point may not be its
+        # final laid-out size yet, but this avoids a visible flash at
+        # Qt's default (0, 0) child-widget position before the window
+        # is actually shown; _on_resize corrects it once real sizing
+        # kicks in.
+        self._position_home_overlay_button()
+
+    def _reset_derived_caches(self):
+        """Invalidate everything computed from the loaded readings.
+        Called once at startup and again whenever a new file replaces
+        the current data — bumping _data_version is enough to make every
+        version-keyed cache miss on its next lookup."""
+        self._data_version = getattr(self, '_data_version', 0) + 1
+        self._unit_levels_cache = {self.native_unit: self.native_levels}
+        self._stat_caches = {}
+        self._zone_cache = {}
+        self._level_prefix = None
+        self._clean_prefix = None
+        self._spike_detector = None
+        self._dataset_digest = None
+
+    def _refresh_secondary_views(self):
+        """Refresh whichever secondary views (profile window, calendar
+        dock) are currently open, after the data, selection, unit, or
+        risk standard changes. Hidden views are skipped entirely — they
+        refresh themselves when next shown."""
+        window = getattr(self, '_profile_window', None)
+        if window is not None and window.isVisible():
+            window.refresh()
+        calendar = getattr(self, 'calendar_view', None)
+        if calendar is not None and calendar.isVisible():
+            calendar.refresh()
+
+    def levels_in_unit(self, unit):
+        """The loaded readings converted to `unit`, computed at most once
+        per unit per loaded file. The native unit's entry is
+        native_levels itself, not a copy, and every cached array is
+        marked read-only so they can be shared freely — toggling the
+        unit dropdown back and forth just swaps references."""
+        levels = self._unit_levels_cache.get(unit)
+        if levels is None:
+            levels = self.convert_levels(self.native_levels, self.native_unit, unit)
+            levels.setflags(write=False)
+            self._unit_levels_cache[unit] = levels
+        return levels
+
+    def _cached_in_unit(self, name, key, compute_native, scale, latest_only=False):
+        """Look up a statistic derived from the readings, in the current
+        display unit. It's computed once from the native-unit readings
+        (compute_native()), and every other unit's value is derived from
+        that one with scale(native_value, factor) rather than from the
+        converted readings — every statistic cached here is linear in
+        the readings. Both live in _stat_caches until the data changes.
+
+        With `latest_only`, only the most recent key's values are kept —
+        for per-selection statistics, which would otherwise pile up an
+        entry for every selection ever made."""
+        cache = self._stat_caches.setdefault(name, {})
+        if latest_only and cache and next(iter(cache))[0] != key:
+            cache.clear()
+        value = cache.get((key, self.unit), _MISSING)
+        if value is _MISSING:
+            native = cache.get((key, self.native_unit), _MISSING)
+            if native is _MISSING:
+                native = compute_native()
+                cache[(key, self.native_unit)] = native
+            factor = unit_scale(self.native_unit, self.unit)
+            value = native if factor == 1.0 else scale(native, factor)
+            cache[(key, self.unit)] = value
+        return value
+
+
+    def _spike_flags(self):
+        """Per-reading spike/dropout flags, detected on first use. The
+        window is SPIKE_WINDOW_HOURS converted to readings at this
+        file's own logging interval."""
+        if self._spike_detector is None:
+            window = SpikeDetector.window_readings_for(self.SPIKE_WINDOW_HOURS, self.interval_delta)
+            self._spike_detector = SpikeDetector(self.native_levels, window, self.SPIKE_THRESHOLD_MADS)
+        return self._spike_detector.flags
+
+    def _prefix_sums(self):
+        """(sums, counts) running totals of the native-unit readings (see
+        level_prefix_sums), honoring the "Exclude Spikes from Averages"
+        toggle: over only the unflagged readings while it's on. Both
+        versions are kept, so switching the exclusion on and off never
+        rescans the data."""
+        if self._exclude_spikes:
+            if self._clean_prefix is None:
+                self._clean_prefix = level_prefix_sums(self.native_levels, ~self._spike_flags())
+            return self._clean_prefix
+        if self._level_prefix is None:
+            self._level_prefix = level_prefix_sums(self.native_levels)
+        return self._level_prefix
+
+    def _period_averages(self):
+        """{days: average} over each AVERAGE_PERIODS trailing window (see
+        trailing_period_averages), in the display unit — None for one
+        with nothing to average. A binary search per cutoff plus two
+        prefix-sum lookups, instead of a full-length datetime comparison."""
+        def compute():
+            timeline = self.timeline
+            return trailing_period_averages(timeline, *self._prefix_sums(), len(timeline), timeline.num_at(-1))
+        return self._cached_in_unit(
+            'period_avgs', self._exclude_spikes, compute,
+            lambda v, f: {days: None if avg is None else avg * f for days, avg in v.items()},
+        )
+
+    def _selection_average(self):
+        """Display-unit average over the current selection (None if
+        there's nothing to average), cached for the latest selection
+        like _selection_info — two prefix-sum lookups on a miss."""
+        start, stop = self._selection
+        return self._cached_in_unit(
+            'selection_avg', (start, stop, self._exclude_spikes),
+            lambda: range_averages(*self._prefix_sums(), start, stop),
+            lambda v, f: None if v is None else v * f,
+            latest_only=True,
+        )
+
+    def _selection_info(self):
+        """{'count', 'first', 'last'} — the reading count and first/last
+        reading datetimes — for the current selection, or None if
+        there isn't one. Memoized for the latest selection, so the
+        selection card, the export panel and the profile window's
+        title all share one lookup."""
+        if self._selection is None:
+            return None
+        cached = self._stat_caches.get('selection_info')
+        if cached is None or cached[0] != self._selection:
+            start, stop = self._selection
+            info = {'count': stop - start, 'first': self.timeline.datetime_at(start),
+                    'last': self.timeline.datetime_at(stop - 1)}
+            cached = (self._selection, info)
+            self._stat_caches['selection_info'] = cached
+        return cached[1]
+
+    def set_show_spikes(self, enabled):
+        self._show_spikes = bool(enabled)
+        self.render_zones()
+        self.canvas.draw_idle()
+
+    def set_profile_actions(self, enabled):
+        """Turn per-action profiling on or off from the View menu — into
+        RADON_PLOT_PROFILE_DIR if that's set, or DEFAULT_PROFILE_DIR."""
+        if not enabled:
+            if self._action_profiler is not None:
+                self._action_profiler.end()
+            self._action_profiler = None
+            self.statusBar().showMessage("Action profiling off", 5000)
+            return
+        if self._action_profiler is None:
+            self._action_profiler = ActionProfiler(profile_dir_from_environment() or DEFAULT_PROFILE_DIR)
+        self.statusBar().showMessage(f"Profiling each action into {self._action_profiler.directory}", 15000)
+
+    def _begin_user_action(self, action):
+        """Mark the start of a user-level action — a load, unit or
+        standard change, pan, zoom step, selection or export — named
+        `action`. Returns True if this call started one, in which case
+        the caller must call _end_user_action once it's over (see
+        _user_action, which does both for a whole method); an action
+        starting inside another one (a scroll mid-pan) is just part of
+        the outer one.
+
+        Every action gets a line in the telemetry log (see
+        action_telemetry) when it ends; with profiling on, it also runs
+        under ActionProfiler, which writes its cProfile stats and
+        tracemalloc peak to a timestamped file."""
+        if self._user_action is not None:
+            return False
+        profiler = self._action_profiler
+        self._user_action = {
+            'action': action,
+            'started_at': time.time(),
+            'started': time.perf_counter(),
+            'draws': self._draw_count,
+            'profiled': profiler is not None and profiler.begin(action),
+        }
+        return True
+
+    def _rename_user_action(self, action):
+        """Relabel the action in progress once it's clear what it was."""
+        if self._user_action is not None:
+            self._user_action['action'] = action
+        if self._action_profiler is not None:
+            self._action_profiler.rename(action)
+
+    def _end_user_action(self):
+        current, self._user_action = self._user_action, None
+        if current is None:
+            return
+        seconds = time.perf_counter() - current['started']
+        if current['profiled'] and self._action_profiler is not None:
+            self._action_profiler.end()
+        lo, hi = self.timeline.index_range(*self.ax.get_xlim())
+        log_action(current['action'], current['started_at'], seconds, len(self.timeline), hi - lo, self._draw_count - current['draws'], current['profiled'])
+
+    def _count_draw(self, event):
+        self._draw_count += 1
+
+    def set_exclude_spikes(self, enabled):
+        self._exclude_spikes = bool(enabled)
+        self.update_stats_label()
+
+    def choose_resample_interval(self, interval, checked=False):
+        """View > Resample's interval choices (None = the file's own)."""
+        self.set_resampling(None if interval is None else (interval, self._resample_how))
+
+    def choose_resample_how(self, how, checked=False):
+        """View > Resample's aggregation choices — remembered for the
+        next interval picked, and applied now if already resampling."""
+        self._resample_how = how
+        if self.resampling is not None:
+            self.set_resampling((self.resampling[0], how))
+
+    @_user_action('resample')
+    def set_resampling(self, resampling):
+        """Show the readings resampled to `resampling`, an (interval,
+        how) pair for resample_readings — or the file's own readings for
+        None. The graph, hover, averages, spike marking, secondary views
+        and every export all follow whichever series is shown.
+
+        Each series keeps its own derived caches (unit conversions,
+        averages, zone segments, spike flags) for as long as the file
+        stays loaded, so flipping back and forth pays for each one once.
+        A selection carries over as the same stretch of time: the new
+        series' readings whose intervals overlap the old selection's."""
+        if resampling == self.resampling:
+            return
+        selected = None
+        if self._selection is not None:
+            start, stop = self._selection
+            old_step = self.interval_delta.total_seconds() / 86400
+            selected = (self.timeline.num_at(start), self.timeline.num_at(stop - 1) + old_step)
+
+        self._series_caches[self.resampling] = {name: getattr(self, name) for name in self._DERIVED_CACHE_ATTRS}
+        self.resampling = resampling
+        self._show_series(self._series_for(resampling))
+        caches = self._series_caches.pop(resampling, None)
+        if caches is None:
+            self._reset_derived_caches()
+        else:
+            self._data_version += 1
+            for name, value in caches.items():
+                setattr(self, name, value)
+        self.radon_levels = self.levels_in_unit(self.display_unit)
+        self._sync_resample_menu()
+
+        if selected is not None:
+            # Reading times are whole seconds, so half a second of slack
+            # keeps float rounding from pulling in a neighbor that only
+            # touches the selection's edge
+            step = self.interval_delta.total_seconds() / 86400
+            slack = 0.5 / 86400
+            first = self.timeline.searchsorted(selected[0] - step + slack, 'left')
+            stop = self.timeline.searchsorted(selected[1] - slack, 'left')
+            self._selection = (first, stop) if stop > first else None
+            if self._selection is None:
+                self._clear_selection()
+
+        self.render_zones()
+        self.update_stats_label()
+        self.canvas.draw_idle()
+        self._refresh_secondary_views()
+
+    def _sync_resample_menu(self):
+        """Check the View > Resample entries matching self.resampling,
+        and say in the status bar when the graph isn't the file's own
+        readings."""
+        interval = None if self.resampling is None else self.resampling[0]
+        action = self._resample_interval_actions.get(interval)
+        if action is None:
+            # An interval from the command line that the menu doesn't list
+            action = self._add_resample_interval_action(interval)
+        action.setChecked(True)
+        self._resample_how_actions[self._resample_how].setChecked(True)
+        if self.resampling is None:
+            self._resample_label.hide()
+        else:
+            self._resample_label.setText(
+                f"Showing the {self.RESAMPLE_AGGREGATION_NAMES[self.resampling[1]]} of every "
+                f"{self._interval_label(interval).lower()} ({len(self.timeline):,} points from "
+                f"{len(self._source['timeline']):,} readings)")
+            self._resample_label.show()
+
+    @staticmethod
+    def _interval_label(interval):
+        """'10 Minutes', '1 Hour', '2 Days' ... for a timedelta."""
+        minutes = interval.total_seconds() / 60
+        for name, size in (("Day", 1440), ("Hour", 60), ("Minute", 1)):
+            if minutes >= size and minutes % size == 0 or size == 1:
+                amount = minutes / size
+                return f"{amount:g} {name}{'' if amount == 1 else 's'}"
+
+    def _add_resample_interval_action(self, interval):
+        """Add `interval` to View > Resample's intervals (at the end of
+        them, before the aggregations)."""
+        if interval is None:
+            action = QAction("File's Own Interval", self)
+        else:
+            action = QAction(self._interval_label(interval), self)
+            action.setToolTip("Regular readings at this interval, aligned to the clock, for comparing "
+                              "files logged at different intervals")
+        action.setCheckable(True)
+        action.triggered.connect(functools.partial(self.choose_resample_interval, interval))
+        self._resample_interval_group.addAction(action)
+        self._resample_menu.insertAction(self._resample_how_separator, action)
+        self._resample_interval_actions[interval] = action
+        return action
+
+    def get_time_of_day_profile(self):
+        """Return (profile, scope_label) for the current selection — or
+        for all data if nothing is selected — in the current display
+        unit. The whole-data profile is cached until the data changes,
+        and the latest selection's until the selection does (see
+        _cached_in_unit for how the unit is handled), so reopening or
+        redrawing the profile window is free."""
+        selection = self._selection
+        if selection is not None:
+            info = self._selection_info()
+            scope_label = f"{info['first']:%b %d, %Y} – {info['last']:%b %d, %Y}, selection"
+        else:
+            scope_label = f"{self.timeline.datetime_at(0):%b %d, %Y} – {self.timeline.datetime_at(-1):%b %d, %Y}"
+
+        def compute():
+            if selection is not None:
+                start, stop = selection
+                return compute_time_of_day_profile(self.timestamp_nums[start:stop], self.native_levels[start:stop])
+            return compute_time_of_day_profile(self.timestamp_nums, self.native_levels)
+
+        def scale(profile, factor):
+            scaled = dict(profile)
+            scaled['hour_mean'] = profile['hour_mean'] * factor
+            scaled['week_mean'] = profile['week_mean'] * factor
+            scaled['hour_pcts'] = {p: v * factor for p, v in profile['hour_pcts'].items()}
+            return scaled
+
+        if selection is None:
+            profile = self._cached_in_unit('profile', None, compute, scale)
+        else:
+            profile = self._cached_in_unit('selection_profile', selection, compute, scale, latest_only=True)
+        return profile, scope_label
+
+    def get_daily_means(self):
+        """(first_day_num, daily_mean) for all data in the current
+        display unit, cached until the data changes."""
+        return self._cached_in_unit(
+            'daily_means', None,
+            lambda: compute_daily_means(self.timestamp_nums, self.native_levels),
+            lambda v, f: (v[0], v[1] * f),
+        )
+
+    def _zone_artist_data(self, thresholds, color_map):
+        """(segments, colors, point_colors) for render_zones, cached per
+        display unit and threshold pair. Not derivable by scaling like
+        the stats above — pCi/L thresholds are rounded, so the crossing
+        points genuinely differ between units."""
+        key = (self.unit, tuple(thresholds))
+        cached = self._zone_cache.get(key)
+        if cached is None:
+            segments, colors = segment_by_zones(self.timestamp_nums, self.radon_levels, thresholds, color_map,
+                                                self.timeline.gap_breaks())
+            cached = (segments, colors, zone_point_colors(self.radon_levels, color_map))
+            self._zone_cache[key] = cached
+        return cached
+
+    def show_profile_window(self):
+        if self._profile_window is None:
+            self._profile_window = ProfileWindow(self)
+        self._profile_window.refresh()
+        self._profile_window.show()
+        self._profile_window.raise_()
+
+    @_user_action('unit-change')
+    def on_unit_changed(self):
+        self.display_unit = self.unit_combo.currentData()
+        self.unit = self.display_unit
+        self.radon_levels = self.levels_in_unit(self.display_unit)
+        self.render_zones()
+        self.canvas.draw_idle()
+        self._refresh_secondary_views()
+
+    @staticmethod
+    def convert_levels(values, from_unit, to_unit):
+        """Convert an array of readings between units. A same-unit or
+        unrecognized combination returns `values` itself rather than a
+        copy — callers go through levels_in_unit, which keeps these
+        arrays read-only."""
+        factor = unit_scale(from_unit, to_unit)
+        if factor == 1.0:
+            return values
+        return values * factor
+
+    @_user_action('authority-change')
+    def on_authority_changed(self):
+        self.authority_key = self.authority_combo.currentData()
+        self.render_zones()
+        self.canvas.draw_idle()
+        self._refresh_secondary_views()
+
+    def show_view_range(self, start, end):
+        """Zoom the main graph to start..end (matplotlib date numbers) —
+        the command line's --from/--to, applied once the first render is
+        done, so Home still goes back to the full data. Either may be
+        None for the first/last reading."""
+        start = self.timeline.num_at(0) if start is None else start
+        end = self.timeline.num_at(-1) if end is None else end
+        self.ax.set_xlim(start, end)
+        self.canvas.draw_idle()
+
+    def _make_stat_card(self):
+        card = QLabel("")
+        card.setAlignment(Qt.AlignCenter)
+        card.setStyleSheet(
+            "background-color: white; border: 1px solid #999; border-radius: 6px; padding: 8px 12px;"
+        )
+        return card
+
+    def _measure_max_stat_card_height(self):
+        """Render the tallest content any stat card will ever show (the
+        post-selection card's 4-line layout — title, value, date-range
+        meta, and the "Hold Shift..." reminder) into a throwaway card
+        using the exact same stylesheet, and return its natural height.
+        Called once at startup so every card can be locked to this
+        height from the very first render, rather than sizing to
+        whatever's showing right now and growing later."""
+        probe = self._make_stat_card()
+        probe.setText(
+            "<div style='text-align:center;'>"
+            "<span style='font-size:12pt; font-weight:bold; color:#555;'>SELECTED RANGE AVERAGE</span>"
+            "<div style='height:6px;'></div>"
+            "<span style='font-size:23pt; font-weight:bold; color:#111;'>999.9 Bq/m<sup>3</sup></span>"
+            "<div style='height:2px;'></div>"
+            "<span style='font-size:10pt; color:#333;'>2026-01-01 12:00 PM &ndash; 2026-01-01 12:00 PM (999,999 readings)</span>"
+            "<div style='height:16px;'>&nbsp;</div>"
+            "<span style='font-size:11pt; color:#666;'>(Hold Shift and drag to select a different range)</span>"
+            "</div>"
+        )
+        probe.setWordWrap(False)
+        height = probe.sizeHint().height()
+        probe.deleteLater()
+        return height
+
+    def update_stats_label(self):
+        last_time = self.timeline.datetime_at(-1)
+        first_time = self.timeline.datetime_at(0)
+        total_days = (last_time - first_time).total_seconds() / 86400
+
+        averages = self._period_averages()
+
+        def card_html(title, avg, days_wanted):
+            if avg is None:
+                value_html = "n/a"
+            else:
+                covered = min(total_days, days_wanted)
+                note = "" if total_days >= days_wanted else f" <span style='font-size:9pt; color:#888;'>({covered:.0f}d avail.)</span>"
+                value_html = f"{avg:.1f} {format_unit_html(self.unit)}{note}"
+            return (
+                f"<div style='text-align:center;'>"
+                f"<span style='font-size:12pt; font-weight:bold; color:#555;'>{title}</span>"
+                f"<div style='height:6px;'></div>"
+                f"<span style='font-size:23pt; font-weight:bold; color:#111;'>{value_html}</span>"
+                f"</div>"
+            )
+
+        for card, (title, _, days) in zip(self.average_cards, AVERAGE_PERIODS):
+            card.setText(card_html(title, averages[days], days))
+
+        # Only reset the selection card's placeholder text the first time —
+        # once the user has made a selection, don't overwrite it just
+        # because the dropdowns changed (re-render it in the new unit instead)
+        if getattr(self, '_selection', None) is None:
+            self.selection_card.setText(self._selection_tip_html())
+        else:
+            self._render_selection_card()
+
+    def _compute_export_stat_values(self):
+        """Same numbers shown in the on-screen averages cards, computed
+        fresh here rather than parsed back out of their HTML — used by
+        export_report to build a matching panel drawn as matplotlib
+        artists instead of Qt widgets.
+
+        Each card is returned as a dict of its individual lines (title,
+        main value, and an optional smaller note/detail/hint) rather
+        than one pre-joined string, so _draw_export_stats_panel can give
+        each line its own size/weight/color — matching how the on-screen
+        HTML cards style the "(365d avail.)" note and the selection
+        card's date-range/hint lines distinctly smaller and lighter than
+        the main value, instead of everything coming out the same
+        bold/large style crammed into a single line."""
+        last_time = self.timeline.datetime_at(-1)
+        total_days = (last_time - self.timeline.datetime_at(0)).total_seconds() / 86400
+
+        averages = self._period_averages()
+        cards = [
+            export_average_card(title, averages[days], self.unit, total_days, days)
+            for title, _, days in AVERAGE_PERIODS
+        ]
+
+        info = self._selection_info()
+        if info is not None:
+            cards.append(selection_average_card(
+                self.unit, self._selection_average(), info['count'], info['first'], info['last'],
+            ))
+        else:
+            cards.append(selection_average_card(self.unit))
+        return cards
+
+    def _report_snapshot(self):
+        """Everything an export needs, captured on the GUI thread as plain
+        values: the plot inputs render_zones uses, the current view
+        limits and selection, the stats cards, and the on-screen
+        figure's size. The arrays are shared rather than copied — they
+        are never modified in place, only replaced — so a report renders
+        exactly what was on screen when it was requested even if the
+        user keeps panning or switches files while it's being written."""
+        thresholds, color_map = get_authority_zones(self.authority_key, self.unit)[:2]
+        width_in, height_in = self.figure.get_size_inches()
+        return {
+            'plot': {
+                'timestamp_nums': self.timestamp_nums,
+                'levels': self.radon_levels,
+                'unit': self.unit,
+                'authority_key': self.authority_key,
+                'serial_number': self.serial_number,
+                'zone_data': self._zone_artist_data(thresholds, color_map),
+                'flagged': self._spike_flags() if self._show_spikes else None,
+            },
+            'xlim': self.ax.get_xlim(),
+            'ylim': self.ax.get_ylim(),
+            'selection': self._current_selection_bounds(),
+            'cards': self._compute_export_stat_values(),
+            'size_inches': (float(width_in), float(height_in)),
+            'page_size': self.report_page_size,
+            'dpi': self.figure.dpi,
+        }
+
+    @_user_action('export-report')
+    def export_report(self, path, fmt, raster_dpi=None):
+        """Save the plot plus a stats panel as one file, without touching
+        the on-screen figure: the current state is snapshotted here
+        (_report_snapshot) and render_report draws it into a separate
+        offscreen figure in a background worker process, so the window
+        stays responsive and never visibly re-lays itself out
+        mid-export. A busy indicator shows in the status bar while any
+        export is running; failures get the same error dialog a
+        synchronous save would have. `raster_dpi` selects hybrid PDF/SVG
+        output (see render_report); its status message compares against
+        the fully vector export of the same view, if that's still in the
+        render cache."""
+        snapshot = self._report_snapshot()
+        snapshot['raster_dpi'] = raster_dpi
+        if self._dataset_digest is None:
+            self._dataset_digest = dataset_digest(self.timestamp_nums, self.native_levels)
+        key = report_cache_key(snapshot, self._dataset_digest, fmt)
+        cached = self._render_cache.get(key)
+        if cached is not None:
+            data = cached[0]
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except OSError as exc:
+                QMessageBox.critical(self, "Save Error", f"Could not save the file:\n{exc}")
+                return
+            self.statusBar().showMessage(
+                f"Saved {os.path.basename(path)} ({format_file_size(len(data))}, unchanged since the last export)", 15000
+            )
+            return
+
+        def save_rendered(rendered, seconds):
+            data, result = rendered
+            with open(path, 'wb') as f:
+                f.write(data)
+            result = dict(result, seconds=seconds)
+            self._render_cache.put(key, data, result)
+            if raster_dpi:
+                vector = self._render_cache.get(
+                    report_cache_key(dict(snapshot, raster_dpi=None), self._dataset_digest, fmt))
+                if vector is not None:
+                    result['vector_bytes'] = len(vector[0])
+                    result['vector_seconds'] = vector[1]['seconds']
+            return result
+
+        self._submit_export(path, render_report_bytes, snapshot, fmt, on_result=save_rendered)
+
+    def _submit_export(self, path, render, *args, on_result=None):
+        """Run render(*args) — which writes `path` and returns a result
+        dict of at least {'seconds', 'bytes'} — in the background export
+        worker process, and track it in the status bar until
+        _poll_exports sees it finish. If given, on_result(value, seconds)
+        runs back on the GUI thread with render's return value and the
+        seconds the export took from here, and returns the result dict
+        to report. Either way the time reported is that wall time —
+        what the user actually waited, worker start-up and all — rather
+        than the render's own."""
+        submitted = time.perf_counter()
+        if self._action_profiler is not None and self._action_profiler.active:
+            # Profiling this export (see _begin_user_action): render it
+            # right here instead, so the profile shows where the time
+            # goes (savefig and all) rather than a hand-off to a worker
+            # process. _poll_exports reports the finished future as usual.
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(render(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+        else:
+            if self._export_pool is None:
+                self._export_pool = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+            future = self._export_pool.submit(render, *args)
+        self._pending_exports.append((future, path, on_result, submitted))
+        self._export_progress.show()
+        self.statusBar().showMessage(f"Exporting {os.path.basename(path)}...")
+        self._export_poll_timer.start()
+
+    def _monthly_report_snapshot(self):
+        """What render_monthly_report needs, captured like
+        _report_snapshot: the full readings in the display unit, the
+        spike-exclusion mask if that's on, and a y-range shared by every
+        month's page (the full-data limits) so months compare at a
+        glance instead of each page rescaling to its own peak."""
+        snapshot = self._report_snapshot()
+        snapshot['plot']['zone_data'] = None  # each page segments its own month
+        snapshot['ylim'] = self._full_data_ylim
+        snapshot['include'] = ~self._spike_flags() if self._exclude_spikes else None
+        return snapshot
+
+    def choose_report_page_size(self, page_size, checked=False):
+        """Set the page size for report exports from the Export menu:
+        None, a REPORT_PAGE_SIZES key, or 'custom' to ask for the width
+        and height in inches (landscape by convention, but any shape
+        works). Cancelling a custom size keeps the previous choice."""
+        if page_size == 'custom':
+            width_in, height_in = REPORT_PAGE_SIZES['letter']
+            if isinstance(self.report_page_size, tuple):
+                width_in, height_in = self.report_page_size
+            width_in, ok = QInputDialog.getDouble(self, "Custom Page Size", "Page width (inches):", width_in, 6.0, 60.0, 2)
+            if ok:
+                height_in, ok = QInputDialog.getDouble(self, "Custom Page Size", "Page height (inches):", height_in, 5.0, 60.0, 2)
+            if not ok:
+                previous = 'custom' if isinstance(self.report_page_size, tuple) else self.report_page_size
+                self._page_size_actions[previous].setChecked(True)
+                return
+            page_size = (width_in, height_in)
+        self.report_page_size = page_size
+
+    @_user_action('export-monthly-report')
+    def export_monthly_report(self, path):
+        """Write the multi-page monthly PDF report (see
+        render_monthly_report) to `path` in the background."""
+        self._submit_export(path, render_monthly_report, self._monthly_report_snapshot(), path)
+
+    def prompt_monthly_report(self):
+        serial = self.serial_number or 'unit'
+        date_str = datetime.datetime.now().strftime('%Y-%m-%d')
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Monthly Report", f"RD200_{serial}_monthly_{date_str}.pdf", "PDF Document (*.pdf)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += '.pdf'
+        self.export_monthly_report(path)
+
+    def _data_export_snapshot(self, resolution, selection_only):
+        """What write_data_export needs: the readings in the display unit
+        and the index range to export — the Shift-drag selection's
+        readings, or everything."""
+        lo, hi = 0, len(self.radon_levels)
+        if selection_only and self._selection is not None:
+            lo, hi = self._selection
+        return {
+            'timestamp_nums': self.timestamp_nums,
+            'levels': self.radon_levels,
+            'unit': self.unit,
+            'resolution': resolution,
+            'range': (lo, hi),
+        }
+
+    @_user_action('export-data')
+    def export_data(self, path, fmt, resolution='raw', selection_only=False):
+        """Write the readings (resolution 'raw') or hourly/daily/monthly
+        aggregates to `path` as CSV or Parquet in the background — see
+        write_data_export."""
+        self._submit_export(path, write_data_export, self._data_export_snapshot(resolution, selection_only), path, fmt)
+
+    def prompt_data_export(self):
+        choices = {
+            "Raw readings": 'raw',
+            "Hourly averages": 'hourly',
+            "Daily averages": 'daily',
+            "Monthly averages": 'monthly',
+        }
+        choice, ok = QInputDialog.getItem(self, "Export Data", "Export:", list(choices), 0, False)
+        if not ok:
+            return
+        resolution = choices[choice]
+
+        selection_only = False
+        if self._selection is not None:
+            scope, ok = QInputDialog.getItem(
+                self, "Export Data", "Range:", ["Current selection", "All data"], 0, False
+            )
+            if not ok:
+                return
+            selection_only = scope == "Current selection"
+
+        serial = self.serial_number or 'unit'
+        filters = "CSV File (*.csv)"
+        if parquet_available():
+            filters += ";;Parquet File (*.parquet)"
+        path, chosen_filter = QFileDialog.getSaveFileName(
+            self, "Save Data", f"RD200_{serial}_{resolution}.csv", filters
+        )
+        if not path:
+            return
+        ext = os.path.splitext(path)[1].lower()
+        if not ext:
+            ext = '.parquet' if 'Parquet' in chosen_filter else '.csv'
+            path += ext
+        self.export_data(path, 'parquet' if ext == '.parquet' else 'csv', resolution, selection_only)
+
+    def prompt_fleet_report(self):
+        """Pick any number of exports (one or more per device) and write
+        a fleet summary PDF, plus a CSV of the same table beside it (see
+        render_fleet_report), in the current display unit and standard."""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select RadonEye Exports for the Fleet Report", "",
+            "RadonEye Data Files (*.txt *.csv);;All files (*.*)"
+        )
+        if not paths:
+            return
+        date_str = datetime.datetime.now().strftime('%Y-%m-%d')
+        pdf_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Fleet Report", f"RD200_fleet_{date_str}.pdf", "PDF Document (*.pdf)"
+        )
+        if not pdf_path:
+            return
+        if not os.path.splitext(pdf_path)[1]:
+            pdf_path += '.pdf'
+        csv_path = os.path.splitext(pdf_path)[0] + '.csv'
+        self.export_fleet_report(paths, pdf_path, csv_path)
+
+    @_user_action('export-fleet-report')
+    def export_fleet_report(self, paths, pdf_path, csv_path):
+        """Write the fleet summary PDF and CSV for the exports at `paths`
+        in the background."""
+        self._submit_export(pdf_path, render_fleet_report, paths, pdf_path, csv_path, self.unit, self.authority_key)
+
+    def _poll_exports(self):
+        """QTimer tick while exports are running: report any that have
+        finished, and stop polling once none are left."""
+        still_running = []
+        for pending in self._pending_exports:
+            future, path, on_result, submitted = pending
+            if not future.done():
+                still_running.append(pending)
+                continue
+            seconds = time.perf_counter() - submitted
+            try:
+                result = future.result()
+                if on_result is not None:
+                    result = on_result(result, seconds)
+                else:
+                    result = dict(result, seconds=seconds)
+            except Exception as exc:
+                self.statusBar().clearMessage()
+                QMessageBox.critical(self, "Save Error", f"Could not save the file:\n{exc}")
+            else:
+                message = f"Saved {os.path.basename(path)} ({format_file_size(result['bytes'])}, {result['seconds']:.1f} s)"
+                if 'vector_bytes' in result:
+                    message += (f" \u2014 fully vector was {format_file_size(result['vector_bytes'])}, "
+                                f"{result['vector_seconds']:.1f} s")
+                if result.get('note'):
+                    message += f" \u2014 {result['note']}"
+                self.statusBar().showMessage(message, 15000)
+        self._pending_exports = still_running
+        if not still_running:
+            self._export_poll_timer.stop()
+            self._export_progress.hide()
+
+    def closeEvent(self, event):
+        # Let any export that's still being written finish, rather than
+        # leaving a truncated file behind
+        if self._export_pool is not None:
+            self._export_pool.shutdown(wait=True)
+            self._export_pool = None
+        super().closeEvent(event)
+
+    def _selection_tip_html(self):
+        return (
+            "<div style='text-align:center;'>"
+            "<span style='font-size:12pt; font-weight:bold; color:#555;'>SELECTED RANGE AVERAGE</span>"
+            "<div style='height:16px;'>&nbsp;</div>"
+            "<span style='font-size:11pt; color:#888;'>(Hold Shift and drag on the graph to select a range)</span>"
+            "</div>"
+        )
+
+    def _render_selection_card(self):
+        avg = self._selection_average()
+        avg_html = "n/a" if avg is None else f"{avg:.1f} {format_unit_html(self.unit)}"
+        info = self._selection_info()
+        count = info['count']
+        start_dt = strip_leading_hour_zero(info['first'].strftime('%Y-%m-%d %I:%M %p'))
+        end_dt = strip_leading_hour_zero(info['last'].strftime('%Y-%m-%d %I:%M %p'))
+        self.selection_card.setText(
+            f"<div style='text-align:center;'>"
+            f"<span style='font-size:12pt; font-weight:bold; color:#555;'>SELECTED RANGE AVERAGE</span>"
+            f"<div style='height:6px;'></div>"
+            f"<span style='font-size:23pt; font-weight:bold; color:#111;'>{avg_html}</span>"
+            f"<div style='height:2px;'></div>"
+            f"<span style='font-size:10pt; color:#333;'>{start_dt} &ndash; {end_dt} ({count:,} readings)</span>"
+            # Once a selection exists, the card's real estate is doing
+            # double duty showing actual results — but it's easy to
+            # forget how the selection was made in the first place,
+            # especially coming back to the app later. Keeping a small
+            # reminder here (rather than only showing it before the
+            # first selection) means the user never has to hunt for how
+            # to make a new one.
+            f"<div style='height:16px;'>&nbsp;</div>"
+            f"<span style='font-size:11pt; color:#666;'>(Hold Shift and drag to select a different range)</span>"
+            f"</div>"
+        )
+
+    # Never let the visible x-range get narrower than this many
+    # readings' worth, or than the floor — 6 hours on hourly data, an
+    # hour on 10-minute data, 6 days resampled to daily
+    MIN_ZOOM_READINGS = 6
+    MIN_ZOOM_FLOOR_HOURS = 1
+    # View > Resample's intervals (see set_resampling), and how its
+    # aggregations read in the menu and status bar
+    RESAMPLE_INTERVALS = (datetime.timedelta(minutes=10), datetime.timedelta(hours=1), datetime.timedelta(days=1))
+    RESAMPLE_AGGREGATION_NAMES = {'mean': 'average', 'max': 'maximum', 'last': 'last reading'}
+    # Everything _reset_derived_caches clears, which set_resampling
+    # keeps per series instead
+    _DERIVED_CACHE_ATTRS = ('_unit_levels_cache', '_stat_caches', '_zone_cache', '_level_prefix',
+                            '_clean_prefix', '_spike_detector', '_dataset_digest')
+    # Spike/dropout detection (see SpikeDetector): rolling window length,
+    # converted to a reading count from the file's Interval: header, and
+    # how many robust standard deviations from the rolling median count
+    # as an anomaly
+    SPIKE_WINDOW_HOURS = SpikeDetector.DEFAULT_WINDOW_HOURS
+    SPIKE_THRESHOLD_MADS = SpikeDetector.DEFAULT_THRESHOLD_MADS
+    # Budget for the RenderCache of finished exports
+    RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    def _on_xlim_changed(self, ax):
+        # Re-entrancy guard: the clamp below calls set_xlim(), which would
+        # otherwise trigger this same callback again recursively
+        if getattr(self, '_clamping_xlim', False):
+            self._update_range_subtitle()
+            return
+
+        xlim = ax.get_xlim()
+        min_width_days = max(self.MIN_ZOOM_READINGS * self.interval_delta.total_seconds() / 86400,
+                             self.MIN_ZOOM_FLOOR_HOURS / 24.0)
+        width_days = xlim[1] - xlim[0]
+        if width_days < min_width_days - 1e-9:
+            center = (xlim[0] + xlim[1]) / 2
+            new_lo, new_hi = center - min_width_days / 2, center + min_width_days / 2
+            # Keep the clamped window within the actual data range
+            data_lo, data_hi = self.timeline.num_at(0), self.timeline.num_at(-1)
+            if new_lo < data_lo:
+                new_lo, new_hi = data_lo, data_lo + min_width_days
+            if new_hi > data_hi:
+                new_hi, new_lo = data_hi, data_hi - min_width_days
+            self._clamping_xlim = True
+            try:
+                ax.set_xlim(new_lo, new_hi)
+            finally:
+                self._clamping_xlim = False
+
+        # Fires on every zoom, pan, scroll, and Home — keeps the edge bars'
+        # date/time labels permanently in sync with whatever's actually visible
+        self._update_range_subtitle()
+        if self._autoscale_y:
+            self._autoscale_y_to_visible()
+
+    def _visible_minmax_table(self):
+        """Range min/max table over the native-unit readings, built once
+        per file. There's only ever the one: _autoscale_y_to_visible
+        scales its answers to the display unit instead."""
+        table = self._stat_caches.get('range_minmax')
+        if table is None:
+            table = self._stat_caches['range_minmax'] = _SparseRangeMinMax(self.native_levels)
+        return table
+
+    def _autoscale_y_to_visible(self):
+        """Fit the y-axis to the readings inside the current x-range,
+        with the same 5% margins matplotlib's autoscale uses plus the
+        usual legend headroom on top. The visible index range comes from
+        two binary searches and its min/max from one block-table query
+        (see _SparseRangeMinMax), so this is cheap enough to run on every
+        pan step."""
+        lo, stop = self.timeline.index_range(*sorted(self.ax.get_xlim()))
+        extent = self._visible_minmax_table().query(lo, stop - 1)
+        if extent is None or np.isnan(extent[0]):
+            return
+        # (a unit conversion is a positive factor, which min/max commute with)
+        factor = unit_scale(self.native_unit, self.unit)
+        vmin, vmax = extent[0] * factor, extent[1] * factor
+        span = vmax - vmin
+        if span <= 0:
+            span = max(abs(vmax), 1.0)
+        ymin = vmin - 0.05 * span
+        ymax = vmax + 0.05 * span
+        ymax = ymin + (ymax - ymin) / (1 - self.LEGEND_HEADROOM_FRACTION)
+        self.ax.set_ylim(ymin, ymax)
+
+    def set_autoscale_y(self, enabled):
+        """Toggled from the View menu. Turning it off goes back to the
+        full-data y-limits render_zones set up."""
+        self._autoscale_y = bool(enabled)
+        if self._autoscale_y:
+            self._autoscale_y_to_visible()
+        elif getattr(self, '_full_data_ylim', None) is not None:
+            self.ax.set_ylim(*self._full_data_ylim)
+        self.canvas.draw_idle()
+
+    def _update_range_subtitle(self):
+        self._update_edge_bar_dates(self.timeline.num_at(0), self.timeline.num_at(-1))
+        self.canvas.draw_idle()
+
+    def _on_resize(self, event):
+        self._apply_fixed_margins()
+        self._position_home_overlay_button()
+        self.canvas.draw_idle()
+
+    def _position_home_overlay_button(self):
+        """Place the floating Home button just inside the axes' own
+        top-left corner, rather than the canvas widget's — the canvas
+        includes a substantial left margin for the y-axis labels and
+        the dark rotated-date edge bar, so anchoring to the canvas's
+        raw top-left would land the button over those instead of over
+        the actual plot.
+
+        ax.get_position() gives the axes' bounding box as a figure
+        FRACTION (0-1), which is resolution/DPI-independent — no need
+        to reconcile matplotlib's display-coordinate space (device
+        pixels, origin bottom-left) against Qt's own widget coordinate
+        space (logical pixels, origin top-left); just multiply the
+        fraction directly by the canvas's own logical width/height,
+        flipping the y-fraction since figure-fraction increases upward
+        while Qt's widget coordinates increase downward.
+
+        Called once (from init_ui, after the toolbar/canvas exist) and
+        again on every resize: the axes' fixed inches-based margins
+        (see _apply_fixed_margins) work out to a constant pixel offset
+        most of the time, but the guard-rail clamps in there for very
+        small windows mean it isn't *always* perfectly constant, so
+        this stays correct rather than assuming so."""
+        toolbar = getattr(self, 'toolbar', None)
+        button = getattr(toolbar, 'home_overlay_button', None)
+        if button is None:
+            return
+        pos = self.ax.get_position()
+        w = self.canvas.width()
+        h = self.canvas.height()
+        margin = 8
+        x = pos.x0 * w + margin
+        y = (1 - pos.y1) * h + margin
+        button.move(int(x), int(y))
+
+    def _on_ylim_changed(self, ax):
+        # Fires whenever the visible y-range actually changes (drag-pan,
+        # the right-drag interactive zoom box, or programmatic set_ylim
+        # calls). Redraw the manual tick marks so they stay lined up with
+        # the tick number labels, which matplotlib repositions on its own.
+        self._draw_left_tick_marks()
+        self.canvas.draw_idle()
+
+    def _on_draw_style_ticks(self, event):
+        # Re-entrancy guard: forcing a redraw inside a draw_event handler
+        # would otherwise trigger this same handler again recursively
+        if getattr(self, '_styling_ticks', False):
+            return
+        self._styling_ticks = True
+        try:
+            if self._style_tick_labels():
+                self.canvas.draw()
+        finally:
+            self._styling_ticks = False
+
+    def _current_selection_bounds(self):
+        """Return (xmin, xmax) in data coords for the current selection, or
+        None if nothing is selected. Derived from the stored index bounds
+        rather than kept as separate state, so there's a single source of
+        truth."""
+        if self._selection is None:
+            return None
+        start, stop = self._selection
+        return self.timeline.num_at(start), self.timeline.num_at(stop - 1)
+
+    def _update_range_preview(self, ax, x0, x1):
+        """Draw (or redraw) the shaded selection region, plus a small
+        date/time bubble above each edge — used both for live feedback
+        while shift-dragging and to restore everything after
+        render_zones() rebuilds the axes (ax.cla() wipes prior artists)."""
+        if self._selection_patch is not None:
+            try:
+                self._selection_patch.remove()
+            except Exception:
+                pass  # already gone, e.g. after an ax.cla() rebuild
+            self._selection_patch = None
+        lo, hi = (x0, x1) if x0 <= x1 else (x1, x0)
+        self._selection_patch = ax.axvspan(lo, hi, color='steelblue', alpha=0.25, zorder=2)
+        self._update_range_edge_bubbles(ax, lo, hi)
+        self.canvas.draw_idle()
+
+    def _clear_range_edge_bubbles(self):
+        for attr in ('_selection_start_bubble', '_selection_end_bubble'):
+            bubble = getattr(self, attr, None)
+            if bubble is not None:
+                try:
+                    bubble.remove()
+                except Exception:
+                    pass
+                setattr(self, attr, None)
+
+    def _clear_selection(self):
+        self._selection = None
+        if self._selection_patch is not None:
+            try:
+                self._selection_patch.remove()
+            except Exception:
+                pass
+            self._selection_patch = None
+        self._clear_range_edge_bubbles()
+        self.selection_card.setText(self._selection_tip_html())
+        self.canvas.draw_idle()
+        self._refresh_secondary_views()
+
+    def _apply_selection_range(self, xmin, xmax):
+        # The readings with xmin <= time <= xmax
+        start, stop = self.timeline.index_range(xmin, xmax)
+        if stop <= start:
+            self.selection_card.setText(
+                "<div style='text-align:center;'>"
+                "<span style='font-size:12pt; font-weight:bold; color:#555;'>SELECTED RANGE AVERAGE</span>"
+                "<div style='height:6px;'></div>"
+                "<span style='font-size:11pt; color:#c00;'>No data points in that range</span>"
+                "</div>"
+            )
+            return
+        self._selection = (start, stop)
+        self._update_range_preview(self.ax, xmin, xmax)
+        self._render_selection_card()
+        self._refresh_secondary_views()
+
+    def _snap_range_x(self, ax, xdata, event_x):
+        """Snap a shift-drag range-selection endpoint to the nearest
+        actual data point, always -- there's no "in between" position,
+        so a selection's bounds are guaranteed to land exactly on real
+        readings rather than some arbitrary point along the line
+        between them.
+
+        This used to also have a stronger pull toward the nearest
+        gridline before falling back to a point, but that fought fine
+        adjustments near a gridline (the selection would rather lock
+        onto the gridline than let go for a nearby point), so it's
+        gone -- point-snapping alone is both simpler and easier to
+        control precisely."""
+        if xdata is None:
+            return xdata
+        if len(self.timeline) == 0:
+            return xdata
+        return self.timeline.num_at(self.timeline.nearest(xdata))
+
+    def begin_range_drag(self, event):
+        """Called by TrimmedNavigationToolbar when a Shift+left-click-drag
+        starts. If the click landed near an edge of an existing selection,
+        that edge is resized (the opposite edge stays put); otherwise a
+        brand-new selection starts at the click point."""
+        ax = event.inaxes
+        if ax is None or event.xdata is None or event.x is None or event.y is None:
+            self._active_drag = None
+            return
+
+        anchor = event.xdata
+        grabbed_edge = False
+        bounds = self._current_selection_bounds()
+        if bounds is not None:
+            xmin, xmax = bounds
+            x0_disp = ax.transData.transform((xmin, 0))[0]
+            x1_disp = ax.transData.transform((xmax, 0))[0]
+            edge_px = 8  # pixels — how close a click needs to be to grab an edge
+            if abs(event.x - x0_disp) <= edge_px:
+                anchor = xmax  # grabbing the left edge — right edge stays fixed
+                grabbed_edge = True
+            elif abs(event.x - x1_disp) <= edge_px:
+                anchor = xmin  # grabbing the right edge — left edge stays fixed
+                grabbed_edge = True
+        if not grabbed_edge:
+            # Brand-new selection (no existing one, or click landed away
+            # from both edges) — snap the starting edge too, not just the
+            # one being actively dragged, so both ends of a fresh
+            # selection get the same gridline/point affinity. An edge
+            # grab skips this since xmax/xmin there are already an
+            # established (and already-snapped) selection bound.
+            anchor = self._snap_range_x(ax, anchor, event.x)
+
+        cid = self.canvas.mpl_connect('motion_notify_event', self._on_range_drag_motion)
+        self._active_drag = {'ax': ax, 'anchor': anchor, 'press_x': event.x, 'press_y': event.y, 'cid': cid}
+        live_x = self._snap_range_x(ax, event.xdata, event.x)
+        self._update_range_preview(ax, anchor, live_x)
+
+    def _on_range_drag_motion(self, event):
+        drag = self._active_drag
+        if drag is None or event.inaxes != drag['ax'] or event.xdata is None:
+            return
+        live_x = self._snap_range_x(drag['ax'], event.xdata, event.x)
+        self._update_range_preview(drag['ax'], drag['anchor'], live_x)
+
+    def end_range_drag(self, event):
+        """Called by TrimmedNavigationToolbar when the Shift-drag mouse
+        button is released. A drag that barely moved (a near-stationary
+        Shift-click) clears the selection instead of committing a
+        near-zero-width range."""
+        drag = self._active_drag
+        self._active_drag = None
+        if drag is None:
+            return
+        self.canvas.mpl_disconnect(drag['cid'])
+
+        if event.inaxes == drag['ax'] and event.xdata is not None:
+            end_x = self._snap_range_x(drag['ax'], event.xdata, event.x)
+        else:
+            end_x = drag['anchor']
+        moved_px = 0.0
+        if event.x is not None and event.y is not None:
+            moved_px = ((event.x - drag['press_x']) ** 2 + (event.y - drag['press_y']) ** 2) ** 0.5
+
+        if moved_px < 5:
+            self._clear_selection()
+            return
+
+        xmin, xmax = sorted((drag['anchor'], end_x))
+        self._apply_selection_range(xmin, xmax)
+
+    def render_zones(self):
+        # Clear the axes completely and rebuild — needed since the risk
+        # standard (and therefore threshold lines, colors, and legend) can
+        # change at any time via the dropdown
+        self.ax.cla()
+
+        zone_data = self._zone_artist_data(*get_authority_zones(self.authority_key, self.unit)[:2])
+        self._draw_plot_contents({
+            'timestamp_nums': self.timestamp_nums,
+            'levels': self.radon_levels,
+            'unit': self.unit,
+            'authority_key': self.authority_key,
+            'serial_number': self.serial_number,
+            'zone_data': zone_data,
+            'flagged': self._spike_flags() if self._show_spikes else None,
+        })
+
+        # ax.cla() wipes annotations, so the hover tooltip needs to be
+        # recreated every time the zones (and therefore the axes) are rebuilt.
+        # Two separate pieces: the date/time in plain style, and the reading
+        # value in bold/larger text so it stands out at a glance.
+        self.annot = self.ax.annotate(
+            "", xy=(0, 0), xytext=(15, 15), textcoords="offset points",
+            bbox=dict(boxstyle="round,pad=0.4", fc="white", ec="gray", alpha=0.95),
+            arrowprops=dict(arrowstyle="->"), zorder=10
+        )
+        self.annot.set_visible(False)
+
+        self.annot_value = self.ax.annotate(
+            "", xy=(0, 0), xytext=(15, 29), textcoords="offset points",
+            fontsize=13, fontweight='bold',
+            bbox=dict(boxstyle="round,pad=0.4", fc="white", ec="gray", alpha=0.95),
+            zorder=11
+        )
+        self.annot_value.set_visible(False)
+
+        # Refresh the toolbar's navigation history so "Home" always resets
+        # to the current full-data view — without this, switching the Risk
+        # Standard or Display Unit dropdown could leave Home pointing at a
+        # stale view from before the change. update() only clears the
+        # stack; push_current() is what actually seeds it with a "home"
+        # entry to restore to (missing this was why Home stopped working).
+        self.toolbar.update()
+        self.toolbar.push_current()
+
+        # Update the period-average readouts (24hr / 30-day / 1-year)
+        self.update_stats_label()
+
+        # ax.cla() (just above, in this same rebuild) wiped any previous
+        # selection shading artist (and edge-date bubbles) — redraw them
+        # from the persisted bounds so an active shift-drag selection
+        # survives switching the Risk Standard or Display Unit dropdown
+        self._selection_patch = None
+        self._selection_start_bubble = None
+        self._selection_end_bubble = None
+        bounds = self._current_selection_bounds()
+        if bounds is not None:
+            self._update_range_preview(self.ax, bounds[0], bounds[1])
+
+        # ax.cla() also disconnects any previously-connected callbacks, so
+        # reconnect the one that keeps the edge bars' date/time labels in
+        # sync with the visible range on every zoom/pan/scroll/Home
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self._update_range_subtitle()
+
+        # The manual left-edge tick marks (_draw_left_tick_marks) are
+        # figure-level artists positioned from the current ylim — they
+        # don't automatically track it the way the built-in tick number
+        # labels do. Without this, dragging/zooming in a way that shifts
+        # the y-axis leaves the tick marks visually stuck at their old
+        # spots while the numbers beside them move, so they drift out of
+        # alignment. Reconnected here since ax.cla() drops callbacks.
+        self.ax.callbacks.connect('ylim_changed', self._on_ylim_changed)
+        if self._autoscale_y:
+            self._autoscale_y_to_visible()
+
+        # Event connections only need to be created once, the first time
+        # the plot is drawn — not on every dropdown change
+        if not hasattr(self, '_events_connected'):
+            self._events_connected = True
+
+            # Enable MOVE tool (pan) by default
+            self.toolbar.pan()
+
+            # Enable mouse scroll wheel zoom (zooms toward the cursor position)
+            self.canvas.mpl_connect('scroll_event', self.on_scroll)
+
+            # Hover tooltip: connected once; on_hover always reads the
+            # current self.annot, so this stays correct even after
+            # render_zones() recreates the annotation later
+            self.canvas.mpl_connect('motion_notify_event', self.on_hover)
+
+            # Bold the date-level x-axis ticks (day/month/year) so they
+            # stand out from the regular-weight, slightly smaller time
+            # ticks (hour). Tick label Text objects are only finalized
+            # during an actual draw, and get regenerated on every zoom/pan,
+            # so this re-applies on every draw via the event hook rather
+            # than being a one-time pass.
+            self.canvas.mpl_connect('draw_event', self._on_draw_style_ticks)
+            self.canvas.mpl_connect('draw_event', self._count_draw)
+
+            # Recompute the fixed-inch margins live as the window is
+            # dragged bigger/smaller, not just the next time render_zones()
+            # happens to run (e.g. from a dropdown change)
+            self.canvas.mpl_connect('resize_event', self._on_resize)
+
+        # Ensure the canvas is updated
+        self.canvas.draw()
+
+    def on_hover(self, event):
+        # Hide the tooltip if the cursor isn't over the plot at all
+        if event.inaxes != self.ax or event.xdata is None:
+            if self.annot.get_visible():
+                self.annot.set_visible(False)
+                self.canvas.draw_idle()
+            return
+
+        # Narrow down to a handful of nearby points first (data is sorted
+        # by time), then check pixel distance only for those — avoids
+        # transforming all ~8,000+ points on every mouse move
+        idx_guess = self.timeline.searchsorted(event.xdata)
+        lo = max(0, idx_guess - 3)
+        hi = min(len(self.timeline), idx_guess + 4)
+
+        best_idx = None
+        best_dist = None
+        for i in range(lo, hi):
+            xi, yi = self.ax.transData.transform((self.timestamp_nums[i], self.radon_levels[i]))
+            dist = np.hypot(xi - event.x, yi - event.y)
+            if best_dist is None or dist < best_dist:
+                best_dist = dist
+                best_idx = i
+
+        # Only show the tooltip if the cursor is genuinely close to a point
+        # (within ~12 pixels), not just anywhere on the graph
+        if best_idx is not None and best_dist <= 12:
+            x = self.timestamp_nums[best_idx]
+            y = self.radon_levels[best_idx]
+            timestamp_str = strip_leading_hour_zero(self.timeline.datetime_at(best_idx).strftime('%Y-%m-%d %I:%M %p'))
+
+            # Flip the tooltip left/right and up/down depending on which
+            # edge of the plot the cursor is near, so it never gets clipped
+            # by the window's borders
+            ax_bbox = self.ax.get_window_extent()
+            near_right = event.x > ax_bbox.x0 + 0.75 * ax_bbox.width
+            near_top = event.y > ax_bbox.y0 + 0.75 * ax_bbox.height  # display y grows upward
+
+            x_offset = -15 if near_right else 15
+            y_offset = -15 if near_top else 15
+            ha = 'right' if near_right else 'left'
+            va = 'top' if near_top else 'bottom'
+
+            # Stack the bold value box further out in the same direction
+            # the timestamp box is offset, so they read as one unit
+            stack_gap = 26
+            value_y_offset = y_offset - stack_gap if near_top else y_offset + stack_gap
+
+            self.annot.xy = (x, y)
+            self.annot.xyann = (x_offset, y_offset)
+            self.annot.set_horizontalalignment(ha)
+            self.annot.set_verticalalignment(va)
+            self.annot.set_text(timestamp_str)
+            self.annot.set_visible(True)
+
+            self.annot_value.xy = (x, y)
+            self.annot_value.xyann = (x_offset, value_y_offset)
+            self.annot_value.set_horizontalalignment(ha)
+            self.annot_value.set_verticalalignment(va)
+            self.annot_value.set_text(f"{y:g} {format_unit_mathtext(self.unit)}")
+            self.annot_value.set_visible(True)
+
+            self.canvas.draw_idle()
+        elif self.annot.get_visible():
+            self.annot.set_visible(False)
+            self.annot_value.set_visible(False)
+            self.canvas.draw_idle()
+
+    @_user_action('zoom-scroll')
+    def on_scroll(self, event):
+        # Only zoom when the cursor is over the plot area
+        if event.inaxes != self.ax or event.xdata is None:
+            return
+
+        ax = self.ax
+        xlim = ax.get_xlim()
+        xdata = event.xdata
+
+        # macOS "natural scrolling" (default for trackpads/Magic Mouse)
+        # reverses what 'up'/'down' feel like versus a traditional mouse
+        # wheel. Set to False if scrolling ever feels backwards again
+        # (e.g. after toggling natural scrolling off, or on a mouse that
+        # doesn't follow it).
+        NATURAL_SCROLLING = True
+
+        if event.button == 'up':
+            scale_factor = 1.1 if NATURAL_SCROLLING else 0.9
+        elif event.button == 'down':
+            scale_factor = 0.9 if NATURAL_SCROLLING else 1.1
+        else:
+            return
+
+        # Keep the point under the cursor fixed while zooming, same as most
+        # map/graphing apps, rather than always zooming on the center
+        old_width = xlim[1] - xlim[0]
+        new_width = old_width * scale_factor
+        rel = (xdata - xlim[0]) / old_width if old_width != 0 else 0.5
+        new_xlim = (xdata - new_width * rel, xdata + new_width * (1 - rel))
+        ax.set_xlim(new_xlim)
+        self.canvas.draw_idle()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Lock the minimum window size to whatever size it happens to be
+        # the first time it's actually shown (its natural/default opening
+        # size) — after that, the window can be made bigger but never
+        # smaller than this. Guarded so this only fires once; showEvent
+        # can fire more than once (e.g. minimize/restore).
+        if not getattr(self, '_min_size_locked', False):
+            self._min_size_locked = True
+            self.setMinimumSize(self.size())
@@ -0,0 +1,98 @@
+"""Cold-start timing for Radon Plot.
+
+Launches the app (radon_plot.py) in a fresh Python process several
+times over, in its startup timing mode (see RADON_PLOT_STARTUP_TIMING
+in radon_plot.py), and reports how long each run took — measured from
+just before the process was spawned, so interpreter startup counts too —
+to reach each milestone:
+
+    dialog      the startup file dialog is on screen
+    imports     the main window's modules have finished importing
+    window      the main window has been built and shown
+    first_plot  the first plot has been drawn
+
+then the median, min and max of each across all runs. By default the
+file is picked through the startup file dialog, and must carry its end
+timestamp in its name (e.g. a "SERIAL_20250731 164749.csv" export), so
+there's no end-time prompt to answer along the way. With --cli it's
+passed on the app's command line instead (no dialog milestone then),
+along with any app options given after "--". Examples:
+
+    python3 startup_timing.py "IE08RE000863_20250731 164749.csv" --runs 10
+    python3 startup_timing.py EXPORT.csv --cli -- --authority epa --from 2025-07-01
+
+Only the first run is truly "cold" as far as the OS file cache goes;
+the rest show the repeatable Python-side cost, which is what changes
+from one version of the app to the next. Pass --offscreen to run
+without a display (Qt's offscreen platform), e.g. over SSH.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MILESTONES = ('dialog', 'imports', 'window', 'first_plot')
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'radon_plot.py')
+
+
+def time_one_launch(data_file, offscreen=False, cli=False, app_args=(), timeout=120):
+    """Launch the app once and return {milestone: seconds after launch}."""
+    env = dict(os.environ, RADON_PLOT_STARTUP_TIMING='1')
+    command = [sys.executable, APP_SCRIPT]
+    if cli:
+        command += [data_file] + list(app_args)
+    else:
+        env['RADON_PLOT_STARTUP_FILE'] = os.path.abspath(data_file)
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    launched = time.time()
+    proc = subprocess.run(command, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, universal_newlines=True, timeout=timeout)
+    marks = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[0] == 'startup-timing':
+            marks[parts[1]] = float(parts[2]) - launched
+    if proc.returncode != 0 or 'first_plot' not in marks:
+        raise RuntimeError(f"Launch failed (exit code {proc.returncode}); output was:\n{proc.stdout}")
+    return marks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Radon Plot's cold-start time.")
+    parser.add_argument('data_file', help="RD200 export to open (with its end timestamp in the name)")
+    parser.add_argument('--runs', type=int, default=5, help="number of launches (default 5)")
+    parser.add_argument('--offscreen', action='store_true', help="use Qt's offscreen platform (no display needed)")
+    parser.add_argument('--cli', action='store_true', help="open the file from the command line, skipping the dialog")
+    # Everything after "--" goes to the app untouched
+    argv = sys.argv[1:] if argv is None else list(argv)
+    app_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, app_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    runs = []
+    print("run  " + "".join(f"{name:>12}" for name in MILESTONES))
+    for k in range(args.runs):
+        marks = time_one_launch(args.data_file, offscreen=args.offscreen, cli=args.cli, app_args=app_args)
+        runs.append(marks)
+        print(f"{k + 1:>3}  " + "".join(_format_seconds(marks.get(name)) for name in MILESTONES))
+
+    print()
+    for label, stat in (('median', statistics.median), ('min', min), ('max', max)):
+        cells = []
+        for name in MILESTONES:
+            samples = [marks[name] for marks in runs if name in marks]
+            cells.append(_format_seconds(stat(samples) if samples else None))
+        print(f"{label:<6}" + "".join(cells))
+
+
+def _format_seconds(seconds):
+    return f"{'-':>12}" if seconds is None else f"{seconds:>11.3f}s"
+
+
+if __name__ == '__main__':
+    main()